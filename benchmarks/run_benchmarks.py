@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Detection benchmark suite.
+
+Generates the synthetic ROM corpus, times text detection, extraction and CHR
+analysis, scores detection against the planted strings and compares the
+results with a stored baseline.
+
+Usage:
+    python benchmarks/run_benchmarks.py                 # Compare to baseline
+    python benchmarks/run_benchmarks.py --quick         # Small ROMs only
+    python benchmarks/run_benchmarks.py --save-baseline # Record a new baseline
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from bisect import bisect_right
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+benchmark_dir = Path(__file__).parent
+sys.path.insert(0, str(benchmark_dir.parent))
+
+from benchmarks.synthetic import PROFILES, PlantedString, SyntheticRom, generate_corpus
+from src.chr_analyzer import CHRAnalyzer
+from src.detector import TextCandidate, TextDetector
+from src.encoding import EncodingTable
+from src.extractor import TextExtractor
+
+DEFAULT_BASELINE = benchmark_dir / "baseline.json"
+
+# A throughput drop larger than this fraction counts as a regression
+THROUGHPUT_TOLERANCE = 0.25
+# An accuracy drop larger than this counts as a regression
+ACCURACY_TOLERANCE = 0.02
+
+
+def _best_time(func: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    """Run ``func`` ``repeat`` times; return the fastest time and a result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def score_candidates(
+    candidates: List[TextCandidate], strings: List[PlantedString]
+) -> Dict[str, float]:
+    """Precision and recall of detected regions against planted strings.
+
+    A candidate is correct when at least half of it lies inside a planted
+    string. A planted string is found when correct candidates cover at least
+    half of it.
+
+    Args:
+        candidates: Detected text regions
+        strings: Ground truth, sorted by address
+
+    Returns:
+        Dict with precision and recall
+    """
+    starts = [s.address for s in strings]
+    covered = [0] * len(strings)
+    correct = 0
+
+    for candidate in candidates:
+        begin = candidate.address
+        end = begin + candidate.length
+        index = bisect_right(starts, begin) - 1
+        overlap = 0
+        # Strings are far apart, so a candidate can only touch its neighbours
+        for i in (index, index + 1):
+            if 0 <= i < len(strings):
+                string_end = strings[i].address + strings[i].length
+                shared = min(end, string_end) - max(begin, strings[i].address)
+                if shared > 0:
+                    covered[i] += shared
+                    overlap += shared
+
+        if candidate.length and overlap * 2 >= candidate.length:
+            correct += 1
+
+    found = sum(
+        1 for s, bytes_covered in zip(strings, covered) if bytes_covered * 2 >= s.length
+    )
+    return {
+        "precision": correct / len(candidates) if candidates else 0.0,
+        "recall": found / len(strings) if strings else 0.0,
+    }
+
+
+def _write_config(rom: SyntheticRom, directory: Path, engine: str) -> Path:
+    """Auto-detect extraction config for a synthetic ROM."""
+    config = {
+        "game": {"name": rom.profile.name},
+        "text_detection": {
+            "method": "auto_detect",
+            "encoding_table": rom.table_path,
+            "auto_detect": {"engine": engine},
+        },
+    }
+    config_path = directory / f"{rom.profile.name}.yaml"
+    with open(config_path, "w") as f:
+        yaml.dump(config, f, default_flow_style=False)
+    return config_path
+
+
+def benchmark_rom(
+    rom: SyntheticRom, directory: Path, repeat: int, engine: str
+) -> Dict[str, Dict[str, float]]:
+    """Time and score every benchmarked operation on one ROM."""
+    rom_path = directory / f"{rom.profile.name}.nes"
+    rom_path.write_bytes(rom.data)
+    config_path = _write_config(rom, directory, engine)
+    megabytes = len(rom.data) / (1024 * 1024)
+
+    detector = TextDetector(EncodingTable(rom.table_path), engine=engine)
+    seconds, candidates = _best_time(
+        lambda: detector.detect_text_regions(rom.data), repeat
+    )
+    detect = {"seconds": seconds, "mb_per_s": megabytes / seconds}
+    detect.update(score_candidates(candidates, rom.strings))
+    detect["candidates"] = len(candidates)
+
+    seconds, _ = _best_time(
+        lambda: TextExtractor(str(config_path)).extract_from_rom(str(rom_path)), repeat
+    )
+    extraction = {"seconds": seconds, "mb_per_s": megabytes / seconds}
+
+    seconds, _ = _best_time(lambda: CHRAnalyzer().analyze_rom(str(rom_path)), repeat)
+    chr_analysis = {"seconds": seconds, "mb_per_s": megabytes / seconds}
+
+    return {
+        "detect_text_regions": detect,
+        "extract_from_rom": extraction,
+        "chr_analyze_rom": chr_analysis,
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict]) -> List[str]:
+    """List regressions of ``results`` against ``baseline``."""
+    regressions = []
+    for rom_name, operations in results.items():
+        for operation, metrics in operations.items():
+            previous = baseline.get(rom_name, {}).get(operation)
+            if not previous:
+                continue
+
+            if metrics["mb_per_s"] < previous["mb_per_s"] * (1 - THROUGHPUT_TOLERANCE):
+                regressions.append(
+                    f"{rom_name} {operation}: {metrics['mb_per_s']:.2f} MB/s "
+                    f"(baseline {previous['mb_per_s']:.2f} MB/s)"
+                )
+            for metric in ("precision", "recall"):
+                if metric in previous and (
+                    metrics[metric] < previous[metric] - ACCURACY_TOLERANCE
+                ):
+                    regressions.append(
+                        f"{rom_name} {operation}: {metric} {metrics[metric]:.3f} "
+                        f"(baseline {previous[metric]:.3f})"
+                    )
+    return regressions
+
+
+def print_report(
+    results: Dict[str, Dict], baseline: Optional[Dict[str, Dict]] = None
+) -> None:
+    """Print a table of throughput and accuracy, with baseline ratios."""
+    print(
+        f"{'ROM':<12} {'operation':<22} {'MB/s':>9} {'vs base':>8} "
+        f"{'precision':>9} {'recall':>7}"
+    )
+    for rom_name, operations in results.items():
+        for operation, metrics in operations.items():
+            previous = (baseline or {}).get(rom_name, {}).get(operation)
+            ratio = (
+                f"{metrics['mb_per_s'] / previous['mb_per_s']:.2f}x"
+                if previous
+                else "-"
+            )
+            precision = f"{metrics['precision']:.3f}" if "precision" in metrics else ""
+            recall = f"{metrics['recall']:.3f}" if "recall" in metrics else ""
+            print(
+                f"{rom_name:<12} {operation:<22} {metrics['mb_per_s']:>9.2f} "
+                f"{ratio:>8} {precision:>9} {recall:>7}"
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description="FamiLator detection benchmarks")
+    parser.add_argument(
+        "--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON path"
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Write results as the baseline"
+    )
+    parser.add_argument("--output", help="Also write results to this JSON file")
+    parser.add_argument("--quick", action="store_true", help="Only the small ROMs")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per timing")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus random seed")
+    parser.add_argument(
+        "--engine",
+        default="auto",
+        choices=["auto", "python", "numpy"],
+        help="Text detection engine",
+    )
+    args = parser.parse_args(argv)
+
+    profiles = PROFILES[:2] if args.quick else PROFILES
+    print(f"Generating {len(profiles)} synthetic ROMs...")
+    corpus = generate_corpus(profiles, seed=args.seed)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="familator_bench_") as tmpdir:
+        for rom in corpus:
+            print(f"  {rom.profile.name} ({len(rom.data) // 1024}KB)...")
+            results[rom.profile.name] = benchmark_rom(
+                rom, Path(tmpdir), args.repeat, args.engine
+            )
+
+    baseline_path = Path(args.baseline)
+    baseline = None
+    if baseline_path.exists() and not args.save_baseline:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+
+    print()
+    print_report(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {baseline_path}")
+        return 0
+
+    if baseline is None:
+        print(f"\nNo baseline at {baseline_path} (use --save-baseline)")
+        return 0
+
+    regressions = compare(results, baseline)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Synthetic iNES ROM corpus for detection benchmarks.
+
+Each ROM is built from 6502-like code noise in PRG ROM and tile-like noise
+in CHR ROM, with text strings planted using one of the tables in tables/.
+The planted strings are the ground truth for precision and recall.
+"""
+
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+import sys
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.encoding import EncodingTable
+
+INES_MAGIC = b"NES\x1a"
+PRG_UNIT = 0x4000
+CHR_UNIT = 0x2000
+
+
+@dataclass
+class RomProfile:
+    """Shape of a synthetic ROM."""
+
+    name: str
+    mapper: int
+    prg_units: int  # 16KB units
+    chr_units: int  # 8KB units (0 = CHR RAM)
+    strings: int  # Number of strings to plant
+
+    @property
+    def size(self) -> int:
+        return 16 + self.prg_units * PRG_UNIT + self.chr_units * CHR_UNIT
+
+
+# From 32KB NROM up to a 1MB MMC5 cartridge
+PROFILES = [
+    RomProfile("nrom_32k", mapper=0, prg_units=2, chr_units=1, strings=24),
+    RomProfile("mmc1_128k", mapper=1, prg_units=8, chr_units=0, strings=80),
+    RomProfile("mmc3_512k", mapper=4, prg_units=16, chr_units=32, strings=160),
+    RomProfile("mmc5_1m", mapper=5, prg_units=32, chr_units=64, strings=320),
+]
+
+
+@dataclass
+class PlantedString:
+    """A text string written into a synthetic ROM."""
+
+    address: int
+    length: int  # Encoded length, excluding the terminator
+    text: str
+
+
+@dataclass
+class SyntheticRom:
+    """A generated ROM image and its ground truth."""
+
+    profile: RomProfile
+    table_path: str
+    data: bytes
+    strings: List[PlantedString] = field(default_factory=list)
+
+
+WORDS = (
+    "THE SWORD OF LIGHT IS HIDDEN IN THE NORTH TOWER. TAKE IT AND GO! "
+    "WELCOME TO THE VILLAGE, TRAVELER. THE KING AWAITS YOU IN THE CASTLE. "
+    "YOU GOT 100 GOLD. YOUR PARTY IS FULLY HEALED. SAVE YOUR GAME? "
+    "IT IS DANGEROUS TO GO ALONE. THE BRIDGE TO THE EAST WAS DESTROYED. "
+    "GAME OVER. CONTINUE? PRESS START TO BEGIN. LEVEL 3 COMPLETE!"
+).split()
+
+# Common 6502 opcodes with their operand sizes (implied, immediate, absolute)
+OPCODES = [
+    (0xA9, 1), (0xA5, 1), (0xAD, 2), (0x85, 1), (0x8D, 2), (0xA2, 1),
+    (0xA0, 1), (0xE8, 0), (0xC8, 0), (0xCA, 0), (0x88, 0), (0x20, 2),
+    (0x4C, 2), (0x60, 0), (0xD0, 1), (0xF0, 1), (0x10, 1), (0x30, 1),
+    (0x18, 0), (0x38, 0), (0x69, 1), (0xE9, 1), (0x29, 1), (0x09, 1),
+    (0xC9, 1), (0xE0, 1), (0xC0, 1), (0x48, 0), (0x68, 0), (0xBD, 2),
+    (0x9D, 2), (0xB9, 2), (0x99, 2), (0xE6, 1), (0xC6, 1), (0x0A, 0),
+    (0x4A, 0), (0x2A, 0), (0x6A, 0), (0xEA, 0), (0x40, 0),
+]
+
+
+def _code_noise(rng: random.Random, size: int) -> bytearray:
+    """6502-like instruction stream with occasional data tables."""
+    data = bytearray()
+    while len(data) < size:
+        if rng.random() < 0.05:
+            # Small lookup table (pointers or increasing values)
+            start = rng.randrange(256)
+            step = rng.choice([1, 2, 4, 8, 16])
+            count = rng.randrange(8, 32)
+            data.extend((start + i * step) & 0xFF for i in range(count))
+            continue
+
+        opcode, operands = rng.choice(OPCODES)
+        data.append(opcode)
+        if operands == 2:
+            # Absolute addresses mostly point at RAM, PPU registers or PRG
+            page = rng.choice([0x00, 0x02, 0x03, 0x20, 0x80, 0xC0])
+            data.extend([rng.randrange(256), page])
+        elif operands == 1:
+            data.append(rng.randrange(256))
+    return data[:size]
+
+
+def _tile_noise(rng: random.Random, size: int) -> bytearray:
+    """CHR data: blank tiles, solid rows and sparse glyph-like shapes."""
+    data = bytearray()
+    while len(data) < size:
+        kind = rng.random()
+        if kind < 0.3:
+            data.extend(bytes(16))
+        elif kind < 0.4:
+            data.extend(bytes([0xFF]) * 8 + bytes(8))
+        else:
+            rows = [
+                rng.choice([0x00, 0x18, 0x3C, 0x66, 0x7E, 0xC3, 0x81, 0x24])
+                for _ in range(8)
+            ]
+            plane = [row if rng.random() < 0.3 else 0 for row in rows]
+            data.extend(rows + plane)
+    return data[:size]
+
+
+def _sentence(rng: random.Random, table: EncodingTable) -> str:
+    """Random run of words that the table can encode."""
+    words = [rng.choice(WORDS) for _ in range(rng.randrange(2, 9))]
+    text = " ".join(words)
+    return "".join(char for char in text if table.encode_char(char) is not None)
+
+
+def _terminator(table: EncodingTable) -> int:
+    for byte_val, code in table.control_codes.items():
+        if code == "<END>":
+            return byte_val
+    return 0xFF
+
+
+def generate_rom(profile: RomProfile, table_path: str, seed: int = 0) -> SyntheticRom:
+    """Generate one synthetic ROM.
+
+    Args:
+        profile: ROM shape
+        table_path: Encoding table used to plant the text
+        seed: Random seed (the same seed gives the same ROM)
+
+    Returns:
+        The ROM image with its planted strings
+    """
+    rng = random.Random(f"{profile.name}:{Path(table_path).name}:{seed}")
+    table = EncodingTable(table_path)
+    terminator = _terminator(table)
+
+    prg = _code_noise(rng, profile.prg_units * PRG_UNIT)
+    chr_rom = _tile_noise(rng, profile.chr_units * CHR_UNIT)
+
+    # At most one string per 256-byte block of PRG ROM
+    strings = []
+    slots = sorted(rng.sample(range(0, len(prg) // 256), profile.strings))
+    for slot in slots:
+        encoded = table.encode_string(_sentence(rng, table))[:96]
+        address = slot * 256 + rng.randrange(0, 256 - len(encoded) - 1)
+        prg[address : address + len(encoded)] = encoded
+        prg[address + len(encoded)] = terminator
+        strings.append(
+            PlantedString(
+                address=16 + address,
+                length=len(encoded),
+                text=table.decode_bytes(encoded),
+            )
+        )
+
+    flags6 = (profile.mapper & 0x0F) << 4
+    flags7 = profile.mapper & 0xF0
+    header = INES_MAGIC + bytes([profile.prg_units, profile.chr_units, flags6, flags7])
+    header += bytes(8)
+
+    return SyntheticRom(
+        profile=profile,
+        table_path=table_path,
+        data=bytes(header + prg + chr_rom),
+        strings=strings,
+    )
+
+
+def generate_corpus(
+    profiles: Optional[List[RomProfile]] = None,
+    table_dir: Optional[str] = None,
+    seed: int = 0,
+) -> List[SyntheticRom]:
+    """Generate a ROM for every profile, cycling through the tables.
+
+    Args:
+        profiles: ROM shapes (default: PROFILES)
+        table_dir: Directory of .tbl files (default: the project's tables/)
+        seed: Random seed
+
+    Returns:
+        Generated ROMs in profile order
+    """
+    profiles = profiles if profiles is not None else PROFILES
+    table_dir = Path(table_dir) if table_dir else project_root / "tables"
+    tables = sorted(str(path) for path in table_dir.glob("*.tbl"))
+    if not tables:
+        raise FileNotFoundError(f"No .tbl files found in {table_dir}")
+
+    return [
+        generate_rom(profile, tables[i % len(tables)], seed)
+        for i, profile in enumerate(profiles)
+    ]
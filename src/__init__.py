@@ -8,15 +8,20 @@ __version__ = "0.1.0"
 __author__ = "Matt-Retrogamer"
 
 from .detector import TextDetector
-from .encoding import EncodingTable
+from .encoding import EncodingTable, load_cached_table
 from .extractor import TextExtractor
 from .reinjector import TextReinjector
+from .rom_image import RomImage
+from .string_bank import StringBank
 from .validator import ROMValidator
 
 __all__ = [
     "TextExtractor",
     "TextReinjector",
     "EncodingTable",
+    "load_cached_table",
     "TextDetector",
     "ROMValidator",
+    "RomImage",
+    "StringBank",
 ]
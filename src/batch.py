@@ -0,0 +1,377 @@
+"""
+Batch extraction across a directory of ROMs.
+
+Every ROM in a library is run through TextExtractor, in a process pool when
+more than one worker is allowed. Each ROM gets the config whose
+``game.crc32`` matches it (or a default config), its own output folder, and
+an entry in a manifest that is saved as soon as the ROM finishes. A ROM
+that fails is recorded and the batch moves on; running the batch again
+skips the ROMs already done and retries the rest.
+"""
+
+import csv
+import json
+import os
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import yaml
+
+try:
+    from .extractor import EXPORT_FORMATS, TextExtractor
+    from .rom_image import RomImage
+except ImportError:
+    from extractor import EXPORT_FORMATS, TextExtractor
+    from rom_image import RomImage
+
+ROM_EXTENSIONS = (".nes", ".fds")
+MANIFEST_FILENAME = "batch_manifest.json"
+INDEX_FILENAME = "batch_index.csv"
+
+# Columns of the summary index
+INDEX_FIELDS = [
+    "rom",
+    "status",
+    "strings",
+    "crc32",
+    "config",
+    "method",
+    "outputs",
+    "seconds",
+    "error",
+]
+
+
+@dataclass
+class RomResult:
+    """Outcome of extracting one ROM of a batch."""
+
+    rom: str  # File name in the ROM directory
+    crc32: str
+    config: Optional[str] = None
+    status: str = "pending"  # done, failed
+    method: str = ""
+    strings: int = 0
+    outputs: List[str] = field(default_factory=list)  # Relative to output dir
+    error: str = ""
+    seconds: float = 0.0
+    size: int = 0  # File size and mtime when extracted, to spot changes
+    mtime_ns: int = 0
+
+
+def find_roms(rom_dir: Union[str, Path]) -> List[Path]:
+    """ROM files directly inside a directory, sorted by name.
+
+    Raises:
+        FileNotFoundError: If the directory doesn't exist
+    """
+    directory = Path(rom_dir)
+    if not directory.is_dir():
+        raise FileNotFoundError(f"ROM directory not found: {rom_dir}")
+
+    return sorted(
+        path
+        for path in directory.iterdir()
+        if path.is_file() and path.suffix.lower() in ROM_EXTENSIONS
+    )
+
+
+def rom_crc32(rom_path: Union[str, Path]) -> int:
+    """CRC32 of a whole ROM file, as checked by the extractor."""
+    with RomImage.open(rom_path) as rom:
+        return zlib.crc32(rom.data) & 0xFFFFFFFF
+
+
+def output_folders(roms: Sequence[Path]) -> Dict[str, str]:
+    """Output folder name for each ROM, by file name.
+
+    A ROM's folder is its file stem, unless another ROM has the same stem
+    (``game.nes`` and ``game.fds``): those get the extension appended
+    (``game_nes``, ``game_fds``) so neither overwrites the other's exports.
+    """
+    stems = Counter(rom.stem.lower() for rom in roms)
+    return {
+        rom.name: (
+            rom.stem
+            if stems[rom.stem.lower()] == 1
+            else f"{rom.stem}_{rom.suffix[1:].lower()}"
+        )
+        for rom in roms
+    }
+
+
+def load_config_index(config_dir: Union[str, Path]) -> Dict[int, Path]:
+    """Map the ``game.crc32`` of each config in a directory to its file.
+
+    Configs without a CRC32 are left out. When two configs give the same
+    CRC32, the first by file name wins.
+
+    Args:
+        config_dir: Directory of YAML game configs
+
+    Returns:
+        Config path by CRC32
+    """
+    index: Dict[int, Path] = {}
+    for config_file in sorted(Path(config_dir).glob("*.yaml")):
+        try:
+            with open(config_file, "r", encoding="utf-8") as f:
+                config = yaml.safe_load(f) or {}
+            crc32 = (config.get("game") or {}).get("crc32")
+            if crc32 is None:
+                continue
+            crc = int(crc32, 16) if isinstance(crc32, str) else int(crc32)
+        except (OSError, yaml.YAMLError, AttributeError, ValueError) as e:
+            print(f"Warning: Skipping config {config_file}: {e}")
+            continue
+
+        if crc in index:
+            print(
+                f"Warning: {config_file} has the same CRC32 as {index[crc]} "
+                f"(0x{crc:08X}), using {index[crc]}"
+            )
+            continue
+        index[crc] = config_file
+    return index
+
+
+class BatchExtractor:
+    """
+    Extract text from every ROM in a directory.
+
+    Example:
+        batch = BatchExtractor("output/library", workers=0)
+        results = batch.run("roms_input")
+    """
+
+    def __init__(
+        self,
+        output_dir: Union[str, Path],
+        config_dir: Union[str, Path] = "configs",
+        default_config: Optional[Union[str, Path]] = "configs/default.yaml",
+        formats: Sequence[str] = ("bank", "csv"),
+        workers: int = 1,
+    ):
+        """Initialize a batch.
+
+        Args:
+            output_dir: Folder for the per-ROM outputs, manifest and index
+            config_dir: Directory of game configs matched by CRC32
+            default_config: Config for ROMs no config matches (None to
+                fail them instead)
+            formats: Export formats written for each ROM
+            workers: Processes extracting ROMs in parallel (0 = all CPUs)
+
+        Raises:
+            ValueError: If a format is unknown or ``workers`` is negative
+        """
+        for format_name in formats:
+            if f".{format_name}" not in EXPORT_FORMATS:
+                raise ValueError(f"Unsupported export format: {format_name}")
+        if workers < 0:
+            raise ValueError(f"workers must be 0 or more, got {workers}")
+
+        self.output_dir = Path(output_dir)
+        self.config_dir = Path(config_dir)
+        self.default_config = default_config
+        if default_config is not None and not Path(default_config).exists():
+            print(f"Warning: Default config not found: {default_config}")
+            self.default_config = None
+        self.formats = tuple(formats)
+        self.workers = workers
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.output_dir / MANIFEST_FILENAME
+
+    @property
+    def index_path(self) -> Path:
+        return self.output_dir / INDEX_FILENAME
+
+    def run(
+        self,
+        rom_dir: Union[str, Path],
+        resume: bool = True,
+        progress: Optional[Callable[[RomResult, int, int], None]] = None,
+    ) -> List[RomResult]:
+        """Extract every ROM in a directory.
+
+        Args:
+            rom_dir: Directory of ROM files
+            resume: Skip ROMs the manifest lists as done (unless the file
+                changed since); False starts the batch over
+            progress: Called with each result, the number of ROMs finished
+                and the number to process in this run
+
+        Returns:
+            Results for every ROM in the directory, in file name order
+
+        Raises:
+            FileNotFoundError: If the ROM directory doesn't exist
+        """
+        roms = find_roms(rom_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = self.load_manifest() if resume else {}
+        configs = load_config_index(self.config_dir)
+        folders = output_folders(roms)
+
+        jobs = []
+        stats = {}
+        refreshed = False
+        for rom in roms:
+            stat = rom.stat()
+            stats[rom.name] = (stat.st_size, stat.st_mtime_ns)
+            previous = manifest.get(rom.name)
+            done = previous is not None and previous.status == "done"
+            if done and (previous.size, previous.mtime_ns) == stats[rom.name]:
+                continue  # Unchanged since it was extracted, no need to CRC it
+
+            crc = rom_crc32(rom)
+            if done and previous.crc32 == f"0x{crc:08X}":
+                # Touched but not changed: remember the new mtime
+                previous.size, previous.mtime_ns = stats[rom.name]
+                refreshed = True
+                continue
+
+            config = configs.get(crc, self.default_config)
+            jobs.append(
+                (
+                    str(rom),
+                    crc,
+                    None if config is None else str(config),
+                    str(self.output_dir),
+                    folders[rom.name],
+                    self.formats,
+                )
+            )
+
+        if refreshed and not jobs:
+            self._save_manifest(manifest)
+
+        for finished, result in enumerate(self._map(jobs), start=1):
+            result.size, result.mtime_ns = stats[result.rom]
+            manifest[result.rom] = result
+            self._save_manifest(manifest)
+            if progress is not None:
+                progress(result, finished, len(jobs))
+
+        results = [manifest[rom.name] for rom in roms if rom.name in manifest]
+        self.write_index(results)
+        return results
+
+    def load_manifest(self) -> Dict[str, RomResult]:
+        """Results saved by earlier runs, by ROM file name."""
+        if not self.manifest_path.exists():
+            return {}
+
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return {
+            name: RomResult(**entry) for name, entry in data.get("roms", {}).items()
+        }
+
+    def write_index(self, results: List[RomResult]) -> Path:
+        """Write the summary index of a batch.
+
+        Args:
+            results: Results to list
+
+        Returns:
+            Path to the index CSV
+        """
+        with open(self.index_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=INDEX_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for result in results:
+                row = asdict(result)
+                row["outputs"] = " ".join(result.outputs)
+                writer.writerow(row)
+        return self.index_path
+
+    def _save_manifest(self, manifest: Dict[str, RomResult]) -> None:
+        """Replace the manifest file, so an interrupted run leaves a whole one."""
+        data = {
+            "version": 1,
+            "roms": {name: asdict(manifest[name]) for name in sorted(manifest)},
+        }
+        temp_path = self.manifest_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.manifest_path)
+
+    def _map(self, jobs: List[Tuple]) -> Iterator[RomResult]:
+        """Run the jobs, in a process pool unless ``workers`` is 1.
+
+        Results come back as ROMs finish. A worker process that dies fails
+        its ROM without stopping the rest of the batch.
+        """
+        if self.workers == 1 or len(jobs) < 2:
+            for job in jobs:
+                yield _extract_rom(*job)
+            return
+
+        workers = min(self.workers or os.cpu_count() or 1, len(jobs))
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = {executor.submit(_extract_rom, *job): job for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    rom_path, crc, config_path = futures[future][:3]
+                    yield RomResult(
+                        rom=Path(rom_path).name,
+                        crc32=f"0x{crc:08X}",
+                        config=config_path,
+                        status="failed",
+                        error=f"{type(e).__name__}: {e}",
+                    )
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
+def _extract_rom(
+    rom_path: str,
+    crc: int,
+    config_path: Optional[str],
+    output_dir: str,
+    folder: str,
+    formats: Sequence[str],
+) -> RomResult:
+    """Extract one ROM into ``output_dir/<folder>/`` (run in the workers).
+
+    Errors are caught and recorded in the result, so one bad ROM or config
+    never stops a batch.
+    """
+    rom_file = Path(rom_path)
+    result = RomResult(rom=rom_file.name, crc32=f"0x{crc:08X}", config=config_path)
+    started = time.perf_counter()
+
+    try:
+        if config_path is None:
+            raise ValueError(f"No config matches CRC32 0x{crc:08X}")
+
+        extractor = TextExtractor(config_path)
+        result.method = extractor.config["text_detection"]["method"]
+        strings = extractor.extract_from_rom(rom_path)
+
+        rom_output_dir = Path(output_dir) / folder
+        for format_name in formats:
+            output_path = rom_output_dir / f"{folder}_extracted.{format_name}"
+            extractor.export(str(output_path), strings)
+            result.outputs.append(output_path.relative_to(output_dir).as_posix())
+
+        result.strings = len(strings)
+        result.status = "done"
+    except Exception as e:
+        result.status = "failed"
+        result.error = f"{type(e).__name__}: {e}"
+
+    result.seconds = round(time.perf_counter() - started, 3)
+    return result
@@ -13,10 +13,15 @@ NES CHR ROM Format:
 
 from dataclasses import dataclass, field
 from enum import Enum
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+import mmap
 import struct
 
+try:
+    from .rom_image import RomImage, parse_ines_header
+except ImportError:
+    from rom_image import RomImage, parse_ines_header
+
 
 class CHRType(Enum):
     """Type of CHR storage."""
@@ -115,77 +120,74 @@ class CHRAnalyzer:
     
     def __init__(self):
         """Initialize the CHR analyzer."""
-        self.rom_data: bytes = b""
-        self.chr_data: bytes = b""
+        self.rom_data: Union[bytes, bytearray, mmap.mmap] = b""
+        # A view of the mapped ROM while analyze_rom runs, a copy afterwards
+        self.chr_data: Union[bytes, memoryview] = b""
         self.prg_size: int = 0
         self.chr_size: int = 0
+        self.chr_start: int = self.INES_HEADER_SIZE
         self.mapper: int = 0
     
-    def analyze_rom(self, rom_path: str) -> CHRAnalysis:
+    def analyze_rom(self, rom_path: Union[str, RomImage]) -> CHRAnalysis:
         """
         Analyze CHR ROM from a NES ROM file.
         
         Args:
-            rom_path: Path to NES ROM file
+            rom_path: Path to NES ROM file, or an already mapped RomImage
             
         Returns:
             CHRAnalysis with detected tiles and font regions
         """
-        rom_file = Path(rom_path)
-        if not rom_file.exists():
-            raise FileNotFoundError(f"ROM not found: {rom_path}")
-        
-        with open(rom_file, "rb") as f:
-            self.rom_data = f.read()
-        
-        # Parse iNES header
-        if not self._parse_ines_header():
-            return CHRAnalysis(
-                chr_type=CHRType.UNKNOWN,
-                chr_size=0,
-                total_tiles=0,
-                blank_tiles=0,
-                unique_tiles=0,
-                warnings=["Failed to parse iNES header"]
-            )
-        
-        # Extract CHR ROM data
-        self._extract_chr_data()
-        
-        # Analyze the CHR data
-        return self._analyze_chr()
+        rom = RomImage.load(rom_path)
+        self.rom_data = rom.data
+        
+        try:
+            # Parse iNES header
+            if not self._parse_ines_header():
+                return CHRAnalysis(
+                    chr_type=CHRType.UNKNOWN,
+                    chr_size=0,
+                    total_tiles=0,
+                    blank_tiles=0,
+                    unique_tiles=0,
+                    warnings=["Failed to parse iNES header"]
+                )
+            
+            # Extract CHR ROM data
+            self._extract_chr_data()
+            
+            # Analyze the CHR data
+            return self._analyze_chr()
+        finally:
+            # Keep a copy of the CHR (256KB at most) for get_tile_bitmap(),
+            # so no view outlives the mapped ROM
+            if isinstance(self.chr_data, memoryview):
+                chr_view = self.chr_data
+                self.chr_data = chr_view.tobytes()
+                chr_view.release()
+            self.rom_data = b""
+            if rom is not rom_path:
+                rom.close()
     
     def _parse_ines_header(self) -> bool:
         """Parse iNES header and extract ROM info."""
-        if len(self.rom_data) < self.INES_HEADER_SIZE:
+        header = parse_ines_header(self.rom_data)
+        if header is None:
             return False
         
-        header = self.rom_data[:self.INES_HEADER_SIZE]
-        
-        # Check magic number
-        if header[:4] != self.INES_MAGIC:
-            return False
-        
-        # Parse header fields
-        prg_units = header[4]  # PRG ROM size in 16KB units
-        chr_units = header[5]  # CHR ROM size in 8KB units
-        flags6 = header[6]
-        flags7 = header[7]
-        
-        self.prg_size = prg_units * self.PRG_ROM_UNIT
-        self.chr_size = chr_units * self.CHR_ROM_UNIT
-        self.mapper = (flags7 & 0xF0) | (flags6 >> 4)
+        self.prg_size = header.prg_size
+        self.chr_size = header.chr_size
+        self.chr_start = header.chr_start  # After the trainer, if any
+        self.mapper = header.mapper
         
         return True
     
     def _extract_chr_data(self) -> None:
-        """Extract CHR ROM data from the ROM."""
-        # Skip header and PRG ROM to get to CHR ROM
-        chr_start = self.INES_HEADER_SIZE + self.prg_size
-        chr_end = chr_start + self.chr_size
+        """Extract CHR ROM data from the ROM (a view, not a copy)."""
+        chr_end = self.chr_start + self.chr_size
         
         if chr_end <= len(self.rom_data):
-            self.chr_data = self.rom_data[chr_start:chr_end]
+            self.chr_data = memoryview(self.rom_data)[self.chr_start:chr_end]
         else:
             self.chr_data = b""
     
@@ -246,7 +248,7 @@ class CHRAnalyzer:
             warnings=warnings
         )
     
-    def _get_tile_data(self, tile_index: int) -> bytes:
+    def _get_tile_data(self, tile_index: int) -> Union[bytes, memoryview]:
         """Get raw tile data for a specific tile index."""
         start = tile_index * self.TILE_SIZE
         end = start + self.TILE_SIZE
@@ -49,6 +49,9 @@ Examples:
   # Extract text only (for manual review)
   familator extract --rom game.nes --source japanese
 
+  # Extract every ROM in a directory with 4 processes
+  familator extract --dir roms_input/ --workers 4
+
   # Apply translations from edited CSV
   familator apply --project output/game_en/
 
@@ -130,11 +133,15 @@ Examples:
         help="Extract text from ROM only",
         description="Extract translatable text without translating.",
     )
-    extract_parser.add_argument(
+    extract_source = extract_parser.add_mutually_exclusive_group(required=True)
+    extract_source.add_argument(
         "--rom", "-r",
-        required=True,
         help="Path to input ROM file",
     )
+    extract_source.add_argument(
+        "--dir", "-d",
+        help="Extract every ROM in this directory (batch mode)",
+    )
     extract_parser.add_argument(
         "--source", "-s",
         default="Japanese",
@@ -146,7 +153,29 @@ Examples:
     )
     extract_parser.add_argument(
         "--config", "-c",
-        help="Path to game-specific config file",
+        help="Path to game-specific config file (batch mode: config for ROMs "
+             "no config matches by CRC32)",
+    )
+    extract_parser.add_argument(
+        "--configs",
+        default="configs",
+        help="Batch mode: directory of configs matched by CRC32 (default: configs)",
+    )
+    extract_parser.add_argument(
+        "--workers", "-j",
+        type=int,
+        default=1,
+        help="Batch mode: ROMs extracted in parallel (0 = all CPUs, default: 1)",
+    )
+    extract_parser.add_argument(
+        "--formats",
+        default="bank,csv",
+        help="Batch mode: comma-separated export formats (default: bank,csv)",
+    )
+    extract_parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Batch mode: ignore the manifest and extract every ROM again",
     )
     extract_parser.add_argument(
         "--auto",
@@ -297,6 +326,9 @@ def cmd_translate(args) -> int:
 
 def cmd_extract(args) -> int:
     """Execute the extract command."""
+    if args.dir:
+        return cmd_extract_batch(args)
+    
     from pipeline import TranslationPipeline
     
     print_banner()
@@ -334,6 +366,60 @@ def cmd_extract(args) -> int:
         return 1
 
 
+def print_progress(result, done: int, total: int) -> None:
+    """Print a one-line progress bar for a batch."""
+    width = 30
+    filled = width * done // total
+    bar = "█" * filled + "░" * (width - filled)
+    mark = "✓" if result.status == "done" else "✗"
+    line = f"   [{bar}] {done}/{total} {mark} {result.rom}"
+    print(f"\r{line:<79}", end="\n" if done == total else "", flush=True)
+
+
+def cmd_extract_batch(args) -> int:
+    """Execute the extract command over a ROM directory."""
+    from batch import MANIFEST_FILENAME, BatchExtractor, find_roms
+    
+    print_banner()
+    output_dir = Path(args.output or "output/batch")
+    print(f"📤 Batch extracting ROMs in {args.dir}")
+    print(f"   Output: {output_dir}")
+    print()
+    
+    try:
+        batch = BatchExtractor(
+            output_dir,
+            config_dir=args.configs,
+            default_config=args.config or "configs/default.yaml",
+            formats=[f.strip() for f in args.formats.split(",") if f.strip()],
+            workers=args.workers,
+        )
+        
+        roms = find_roms(args.dir)
+        if not roms:
+            print(f"   (no ROMs found in {args.dir})")
+            return 0
+        if not args.restart and batch.manifest_path.exists():
+            print(f"   ⏩ Resuming from {MANIFEST_FILENAME}")
+        
+        results = batch.run(args.dir, resume=not args.restart, progress=print_progress)
+        
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+    
+    done = [r for r in results if r.status == "done"]
+    failed = [r for r in results if r.status == "failed"]
+    print()
+    print(f"✅ Extracted {len(done)}/{len(roms)} ROMs "
+          f"({sum(r.strings for r in done)} strings)")
+    for result in failed:
+        print(f"   ✗ {result.rom}: {result.error}")
+    print(f"📋 Index: {batch.index_path}")
+    
+    return 1 if failed else 0
+
+
 def cmd_apply(args) -> int:
     """Execute the apply command."""
     from pipeline import TranslationPipeline
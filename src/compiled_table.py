@@ -0,0 +1,506 @@
+"""
+Compiled binary encoding tables.
+
+Parsing a large kanji table line by line takes longer the bigger the table
+gets. The first time a .tbl file is loaded its parsed form is written next to
+it (``game.tbl`` -> ``game.tblc``) and later loads memory-map that file.
+Lookups read the mapped arrays directly, so loading takes roughly the same
+time whatever the table size.
+
+Layout (little-endian, every section 4-byte aligned):
+
+    header      magic, version, source mtime/size, counts, section offsets
+    slots       256 uint32 decode slots for single-byte codes
+    wide slots  65536 uint32 decode slots for two-byte codes (optional)
+    leads       256-byte bitmap of two-byte lead bytes
+    codes       sorted code values, with their character and control code
+                string ids (three uint32 arrays)
+    chars       char_to_byte in table order (string id and code, uint32)
+    patterns    multi-byte patterns (hex and template string ids, uint32)
+    strings     string offsets and lengths into the pool (uint32 pairs)
+    pool        UTF-8 text of every string
+    trie        encode trie in breadth-first order: value (int32, -1 when no
+                entry ends there), first child, child count and edge label
+                (uint32 code point) per node
+    order       byte_to_char and control_codes keys in table order (uint32)
+
+A decode slot is 0 when the code is unmapped, otherwise the id + 1 of the
+decoded string (the control code when a code is both).
+"""
+
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b"FLTB"
+FORMAT_VERSION = 1
+COMPILED_SUFFIX = ".tblc"
+
+HEADER = struct.Struct("<4sHHqq" + "I" * 23)  # 7 counts, 16 section offsets
+UINT32 = struct.Struct("<I")
+
+# The arrays are read through native memoryview casts
+SUPPORTED = sys.byteorder == "little"
+
+
+def compiled_path(table_path: Path) -> Path:
+    """Location of the compiled form of a .tbl file."""
+    return table_path.with_name(table_path.name + "c")
+
+
+class _StringPool:
+    """Collects unique strings while a table is being compiled."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.index = bytearray()
+        self.pool = bytearray()
+
+    def add(self, text: str) -> int:
+        if text not in self.ids:
+            data = text.encode("utf-8")
+            self.ids[text] = len(self.ids)
+            self.index += struct.pack("<II", len(self.pool), len(data))
+            self.pool += data
+        return self.ids[text]
+
+
+def _pad(buffer: bytearray) -> None:
+    buffer.extend(bytes(-len(buffer) % 4))
+
+
+def compile_table(table: Any, source_mtime_ns: int, source_size: int) -> bytes:
+    """Serialize a parsed table.
+
+    Args:
+        table: EncodingTable with plain dict mappings
+        source_mtime_ns: Modification time of the .tbl file
+        source_size: Size of the .tbl file
+
+    Returns:
+        The compiled file contents
+    """
+    strings = _StringPool()
+    codes = sorted(set(table.byte_to_char) | set(table.control_codes))
+    wide = any(code > 0xFF for code in codes)
+
+    slots = [0] * 256
+    wide_slots = [0] * 0x10000 if wide else []
+    leads = bytearray(256)
+    code_chars = []
+    code_controls = []
+    for code in codes:
+        char = table.byte_to_char.get(code)
+        control = table.control_codes.get(code)
+        char_id = strings.add(char) + 1 if char is not None else 0
+        control_id = strings.add(control) + 1 if control is not None else 0
+        code_chars.append(char_id)
+        code_controls.append(control_id)
+
+        decoded = control_id or char_id
+        if code > 0xFF:
+            wide_slots[code] = decoded
+            leads[code >> 8] = 1
+        else:
+            slots[code] = decoded
+
+    chars = []
+    for char, code in table.char_to_byte.items():
+        chars += [strings.add(char), code]
+
+    patterns = []
+    for hex_part, template in table.multi_byte_patterns.items():
+        patterns += [strings.add(hex_part), strings.add(template)]
+
+    values, firsts, counts, labels = _flatten_trie(table)
+
+    sections = [
+        struct.pack(f"<{len(slots)}I", *slots),
+        struct.pack(f"<{len(wide_slots)}I", *wide_slots),
+        bytes(leads),
+        struct.pack(f"<{len(codes)}I", *codes),
+        struct.pack(f"<{len(codes)}I", *code_chars),
+        struct.pack(f"<{len(codes)}I", *code_controls),
+        struct.pack(f"<{len(chars)}I", *chars),
+        struct.pack(f"<{len(patterns)}I", *patterns),
+        bytes(strings.index),
+        bytes(strings.pool),
+        struct.pack(f"<{len(values)}i", *values),
+        struct.pack(f"<{len(firsts)}I", *firsts),
+        struct.pack(f"<{len(counts)}I", *counts),
+        struct.pack(f"<{len(labels)}I", *labels),
+        struct.pack(f"<{len(table.byte_to_char)}I", *table.byte_to_char),
+        struct.pack(f"<{len(table.control_codes)}I", *table.control_codes),
+    ]
+
+    body = bytearray()
+    offsets = []
+    for section in sections:
+        offsets.append(HEADER.size + len(body))
+        body += section
+        _pad(body)
+
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        0,
+        source_mtime_ns,
+        source_size,
+        len(codes),
+        len(table.char_to_byte),
+        len(table.byte_to_char),
+        len(table.control_codes),
+        len(table.multi_byte_patterns),
+        len(strings.ids),
+        len(values),
+        *offsets,
+    )
+    return header + bytes(body)
+
+
+def _flatten_trie(table: Any) -> Tuple[List[int], List[int], List[int], List[int]]:
+    """Lay the encode trie out breadth-first, children sorted by code point."""
+    root: Dict[Optional[str], Any] = {}
+    control_bytes: Dict[str, int] = {}
+    for code, control in table.control_codes.items():
+        control_bytes.setdefault(control, code)
+    for entries in (table.char_to_byte, control_bytes):
+        for token, code in entries.items():
+            node = root
+            for char in token:
+                node = node.setdefault(char, {})
+            if token:
+                node[None] = code
+
+    values, firsts, counts, labels = [], [], [], []
+    queue = deque([(0, root)])
+    next_index = 1
+    while queue:
+        label, node = queue.popleft()
+        children = sorted((ord(char), child) for char, child in node.items() if char)
+        values.append(node.get(None, -1))
+        firsts.append(next_index)
+        counts.append(len(children))
+        labels.append(label)
+        next_index += len(children)
+        queue.extend(children)
+    return values, firsts, counts, labels
+
+
+def write_compiled(table_path: Path, table: Any, stat: os.stat_result) -> bool:
+    """Write the compiled form of a freshly parsed table next to it.
+
+    Failures (e.g. a read-only directory) are not errors: the table simply
+    keeps being parsed from text.
+
+    Returns:
+        True if the compiled file was written
+    """
+    if not SUPPORTED:
+        return False
+
+    target = compiled_path(table_path)
+    temp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        temp.write_bytes(compile_table(table, stat.st_mtime_ns, stat.st_size))
+        os.replace(temp, target)
+        return True
+    except (OSError, ValueError, struct.error):
+        try:
+            temp.unlink()
+        except OSError:
+            pass
+        return False
+
+
+class CompiledTable:
+    """A memory-mapped compiled table."""
+
+    def __init__(self, data: "mmap.mmap"):
+        fields = HEADER.unpack_from(data)
+        (
+            _magic,
+            _version,
+            _flags,
+            _mtime,
+            _size,
+            self.code_count,
+            self.char_count,
+            self.byte_to_char_count,
+            self.control_count,
+            self.pattern_count,
+            self.string_count,
+            self.node_count,
+        ) = fields[:12]
+        offsets = fields[12:]
+
+        self._data = data
+        view = memoryview(data)
+
+        def section(index: int, count: int, fmt: str = "I") -> memoryview:
+            size = struct.calcsize(fmt)
+            return view[offsets[index] : offsets[index] + count * size].cast(fmt)
+
+        self.slots = section(0, 256)
+        self.wide_slots = section(1, 0x10000 if offsets[2] > offsets[1] else 0)
+        self.leads = bytes(view[offsets[2] : offsets[2] + 256])
+        self.codes = section(3, self.code_count)
+        self.code_chars = section(4, self.code_count)
+        self.code_controls = section(5, self.code_count)
+        self.chars = section(6, self.char_count * 2)
+        self.patterns = section(7, self.pattern_count * 2)
+        self.string_index = section(8, self.string_count * 2)
+        pool_start = offsets[9]
+        self.pool = view[pool_start:]
+        self.trie = BlobTrie(
+            section(10, self.node_count, "i"),
+            section(11, self.node_count),
+            section(12, self.node_count),
+            section(13, self.node_count),
+        )
+        self.char_order = section(14, self.byte_to_char_count)
+        self.control_order = section(15, self.control_count)
+        self._strings: Dict[int, str] = {}
+
+    @classmethod
+    def open(cls, table_path: Path) -> Optional["CompiledTable"]:
+        """Map the compiled form of a table if it is current.
+
+        Args:
+            table_path: Path to the .tbl file
+
+        Returns:
+            The compiled table, or None if it is missing, stale or unreadable
+        """
+        if not SUPPORTED:
+            return None
+
+        try:
+            stat = table_path.stat()
+            with open(compiled_path(table_path), "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        if len(data) < HEADER.size:
+            return None
+        magic, version, _flags, mtime_ns, size = HEADER.unpack_from(data)[:5]
+        if (magic, version, mtime_ns, size) != (
+            MAGIC,
+            FORMAT_VERSION,
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            return None
+
+        try:
+            return cls(data)
+        except (struct.error, TypeError, ValueError):
+            return None
+
+    def string(self, string_id: int) -> str:
+        """Text of a pooled string."""
+        text = self._strings.get(string_id)
+        if text is None:
+            offset = self.string_index[string_id * 2]
+            length = self.string_index[string_id * 2 + 1]
+            text = str(self.pool[offset : offset + length], "utf-8")
+            self._strings[string_id] = text
+        return text
+
+    def decoded_chars(self, unknown: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Decoded text for every single-byte code."""
+        return tuple(
+            self.string(slot - 1) if slot else unknown[code]
+            for code, slot in enumerate(self.slots)
+        )
+
+    def multi_byte_patterns(self) -> Dict[str, str]:
+        return {
+            self.string(self.patterns[i]): self.string(self.patterns[i + 1])
+            for i in range(0, len(self.patterns), 2)
+        }
+
+    def control_bytes(self) -> Dict[str, int]:
+        """Control code -> code value, the first listed code winning."""
+        result: Dict[str, int] = {}
+        for code in self.control_order:
+            result.setdefault(self.lookup_code(code, controls=True), code)
+        return result
+
+    def lookup_code(self, code: int, controls: bool) -> Optional[str]:
+        """Character (or control code) mapped to a code value."""
+        index = bisect_left(self.codes, code)
+        if index == len(self.codes) or self.codes[index] != code:
+            return None
+        string_id = (self.code_controls if controls else self.code_chars)[index]
+        return self.string(string_id - 1) if string_id else None
+
+
+class BlobTrie:
+    """Longest-match lookups over the memory-mapped encode trie.
+
+    Characters found to be leaf entries are remembered in ``singles``, which
+    the encoder checks before walking the trie.
+    """
+
+    def __init__(
+        self,
+        values: memoryview,
+        firsts: memoryview,
+        counts: memoryview,
+        labels: memoryview,
+    ):
+        self.values = values
+        self.firsts = firsts
+        self.counts = counts
+        self.labels = labels
+        self.singles: Dict[str, bytes] = {}
+
+    def child(self, node: int, char: str) -> Optional[int]:
+        """Index of the child reached by ``char``, if any."""
+        first = self.firsts[node]
+        last = first + self.counts[node]
+        label = ord(char)
+        index = bisect_left(self.labels, label, first, last)
+        if index < last and self.labels[index] == label:
+            return index
+        return None
+
+    def longest_match(self, text: str, pos: int) -> Optional[Tuple[bytes, int]]:
+        """Longest entry matching ``text`` at ``pos``.
+
+        Returns:
+            The entry's encoded bytes and the position after it, or None
+        """
+        match = None
+        node: Optional[int] = 0
+        j = pos
+        while j < len(text):
+            node = self.child(node, text[j])
+            if node is None:
+                break
+            j += 1
+            value = self.values[node]
+            if value >= 0:
+                match = (code_bytes(value), j)
+
+        if match and match[1] == pos + 1 and text[pos] != "<":
+            leaf = self.child(0, text[pos])
+            if not self.counts[leaf]:
+                self.singles[text[pos]] = match[0]
+        return match
+
+    def matches(self, text: str, pos: int) -> List[Tuple[bytes, int]]:
+        """Every entry matching ``text`` at ``pos``, shortest first."""
+        found = []
+        node: Optional[int] = 0
+        j = pos
+        while j < len(text):
+            node = self.child(node, text[j])
+            if node is None:
+                break
+            j += 1
+            value = self.values[node]
+            if value >= 0:
+                found.append((code_bytes(value), j))
+        return found
+
+    def lookup(self, token: str) -> Optional[int]:
+        """Value of an exact entry."""
+        node: Optional[int] = 0
+        for char in token:
+            node = self.child(node, char)
+            if node is None:
+                return None
+        value = self.values[node]
+        return value if value >= 0 and token else None
+
+
+def code_bytes(code: int) -> bytes:
+    """Bytes for a code value (two-byte codes are stored big-endian)."""
+    return code.to_bytes(2 if code > 0xFF else 1, "big")
+
+
+class CodeView(Mapping):
+    """Read-only byte_to_char or control_codes view of a compiled table."""
+
+    def __init__(self, compiled: CompiledTable, controls: bool):
+        self._compiled = compiled
+        self._controls = controls
+
+    def __getitem__(self, code: int) -> str:
+        text = self._compiled.lookup_code(code, self._controls)
+        if text is None:
+            raise KeyError(code)
+        return text
+
+    def __iter__(self) -> Iterator[int]:
+        if self._controls:
+            return iter(self._compiled.control_order)
+        return iter(self._compiled.char_order)
+
+    def __len__(self) -> int:
+        if self._controls:
+            return self._compiled.control_count
+        return self._compiled.byte_to_char_count
+
+
+class CharView(Mapping):
+    """Read-only char_to_byte view of a compiled table."""
+
+    def __init__(self, compiled: CompiledTable):
+        self._compiled = compiled
+
+    def __getitem__(self, char: str) -> int:
+        # Control codes share the trie; they are the only "<...>" entries
+        if isinstance(char, str) and char and not (
+            char.startswith("<") and char.endswith(">") and len(char) > 1
+        ):
+            value = self._compiled.trie.lookup(char)
+            if value is not None:
+                return value
+        elif char == "":
+            # Empty entries aren't in the trie
+            for key, value in self._items():
+                if key == "":
+                    return value
+        raise KeyError(char)
+
+    def _items(self) -> Iterator[Tuple[str, int]]:
+        chars = self._compiled.chars
+        for i in range(0, len(chars), 2):
+            yield self._compiled.string(chars[i]), chars[i + 1]
+
+    def __iter__(self) -> Iterator[str]:
+        return (char for char, _ in self._items())
+
+    def __len__(self) -> int:
+        return self._compiled.char_count
+
+
+class WideView(Mapping):
+    """Two-byte code -> decoded text, read from the wide decode slots."""
+
+    def __init__(self, compiled: CompiledTable):
+        self._compiled = compiled
+
+    def __getitem__(self, code: int) -> str:
+        slots = self._compiled.wide_slots
+        slot = slots[code] if 0x100 <= code < len(slots) else 0
+        if not slot:
+            raise KeyError(code)
+        return self._compiled.string(slot - 1)
+
+    def __iter__(self) -> Iterator[int]:
+        slots = self._compiled.wide_slots
+        return (code for code in self._compiled.codes if code > 0xFF and slots[code])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
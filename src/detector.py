@@ -4,15 +4,59 @@ Automatic text pattern detection in ROM files.
 Uses various heuristics to identify potential text regions.
 """
 
+import heapq
 import math
+import os
+import re
+from bisect import bisect_left
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate, repeat
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 try:
-    from .encoding import EncodingTable
+    from .encoding import EncodingTable, load_cached_table
+    from .rom_image import CHR_ROM_UNIT, RomImage, parse_ines_header, rom_buffer
 except ImportError:
-    from encoding import EncodingTable
+    from encoding import EncodingTable, load_cached_table
+    from rom_image import CHR_ROM_UNIT, RomImage, parse_ines_header, rom_buffer
+
+try:
+    import numpy as np
+except ImportError:  # numpy ships with the optional "enhanced" extra
+    np = None
+
+# Entropy terms (c * log2(c)) are stored as fixed-point integers so that the
+# per-window sum is exact and independent of summation order. This keeps the
+# pure-Python and NumPy engines bit-for-bit identical.
+ENTROPY_SCALE = 1 << 32
+
+# Windows processed per NumPy batch when computing entropy (bounds memory use)
+NUMPY_CHUNK_WINDOWS = 1 << 16
+
+DETECTION_ENGINES = ("auto", "python", "numpy")
+
+# Bytes of a mapped ROM copied per translate() call
+TRANSLATE_CHUNK = 1 << 16
+
+# Character frequency windows
+FREQUENCY_WINDOW_SIZE = 20
+FREQUENCY_STEP_SIZE = 4
+
+# Mappers that switch PRG ROM in 8KB banks (MMC3, MMC5, Namco 163, VRC2/4,
+# FME-7, ...). Everything else is split into 16KB banks.
+PRG_8K_MAPPERS = {4, 5, 19, 21, 22, 23, 25, 69, 118, 119}
+
+
+@lru_cache(maxsize=None)
+def _entropy_terms(max_count: int) -> Tuple[int, ...]:
+    """Fixed-point c*log2(c) for every count 0..max_count."""
+    return (0,) + tuple(
+        round(c * math.log2(c) * ENTROPY_SCALE) for c in range(1, max_count + 1)
+    )
 
 
 @dataclass
@@ -25,41 +69,233 @@ class TextCandidate:
     sample_text: str
     encoding_used: str
     description: str = ""
+    absorbed: int = 0  # Overlapping candidates merged into this one by dedup
+
+
+@dataclass
+class TableScore:
+    """How much of a ROM reads as text under one encoding table."""
+
+    name: str
+    coverage: float  # Fraction of entropy windows scored as text
+    text_windows: int
+    mean_confidence: float  # Average confidence of the text windows
+
+
+@dataclass(frozen=True)
+class ByteClassTables:
+    """Per-byte lookup tables compiled from an encoding table.
+
+    Each field is a 256-entry ``bytes.translate`` table indexed by byte value.
+    A score unit is worth 0.05 confidence: letters and spaces score 2 units,
+    punctuation and control codes 1 unit.
+    """
+
+    score_units: bytes
+    recognized: bytes  # 1 for mapped characters
+    control: bytes  # 1 for control codes
+    common: bytes  # 1 for space and uppercase letters
+    terminators: bytes  # 1 for <END>/<NULL> codes, 0x00 and 0xFF
+
+
+def load_table_dir(table_dir: str = "tables") -> Dict[str, EncodingTable]:
+    """Load every .tbl file in a directory for :meth:`TextDetector.rank_tables`.
+
+    Args:
+        table_dir: Directory containing .tbl files
+
+    Returns:
+        Mapping of table file names to encoding tables, in name order.
+        Tables that fail to parse are skipped with a warning.
+    """
+    tables = {}
+    for table_file in sorted(Path(table_dir).glob("*.tbl")):
+        try:
+            tables[table_file.name] = load_cached_table(str(table_file))
+        except ValueError as e:
+            print(f"Warning: Skipping table {table_file.name}: {e}")
+    return tables
+
+
+def _select_top(candidates: Iterable[TextCandidate], k: int) -> List[TextCandidate]:
+    """Keep the ``k`` most confident candidates in a bounded min-heap.
+
+    Ties keep the earlier candidate, so the result equals sorting all
+    candidates by confidence (stable) and taking the first ``k``.
+    """
+    heap: List[Tuple[float, int, TextCandidate]] = []
+    if k <= 0:
+        return []
+
+    for index, candidate in enumerate(candidates):
+        entry = (candidate.confidence, -index, candidate)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    return [entry[2] for entry in sorted(heap, key=lambda e: (-e[0], -e[1]))]
+
+
+def _translate(data, table: bytes) -> bytes:
+    """``data.translate(table)`` for any bytes-like ROM data.
+
+    Mapped ROMs have no ``translate``; they are translated in chunks
+    so only the result is held in memory.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return data.translate(table)
+    view = memoryview(data)
+    return b"".join(
+        bytes(view[i : i + TRANSLATE_CHUNK]).translate(table)
+        for i in range(0, len(view), TRANSLATE_CHUNK)
+    )
+
+
+def _scan_bank(
+    detector: "TextDetector", data: bytes, offset: int, start: int, end: int
+) -> Tuple[List[TextCandidate], ...]:
+    """Process pool task: detect candidates owned by bank [start, end).
+
+    Args:
+        detector: Configured detector
+        data: ROM bytes from ``offset``, including the bytes around the bank
+        offset: ROM address of ``data[0]``
+        start: First ROM address of the bank
+        end: ROM address after the bank
+
+    Returns:
+        Tuple of (entropy, frequency, terminator) candidate lists with ROM
+        addresses
+    """
+    entropy, frequency, terminators = detector._detect_all(data)
+
+    for candidate in entropy + frequency + terminators:
+        candidate.address += offset
+
+    return (
+        [c for c in entropy if start <= c.address < end],
+        [c for c in frequency if start <= c.address < end],
+        # Terminator candidates belong to the bank holding the terminator
+        [c for c in terminators if start <= c.address + c.length < end],
+    )
 
 
 class TextDetector:
     """Automatic detection of text patterns in ROM data."""
 
-    def __init__(self, encoding_table: EncodingTable):
+    def __init__(self, encoding_table: EncodingTable, engine: str = "auto"):
         """Initialize text detector.
 
         Args:
             encoding_table: Encoding table to use for detection
+            engine: Detection engine ('auto', 'python' or 'numpy').
+                'auto' uses NumPy when it is installed.
+
+        Raises:
+            ValueError: If the engine name is unknown
+            ImportError: If 'numpy' is requested but NumPy is not installed
         """
         self.encoding_table = encoding_table
         self.min_string_length = 3
         self.max_string_length = 100
         self.confidence_threshold = 0.6
+        self.entropy_window_size = 32
+        self.entropy_step_size = 16
+        self.entropy_min = 2.0
+        self.entropy_max = 6.0
+        self.common_char_threshold = 0.4
+        self.workers = 1  # Processes for bank-parallel detection (0 = all CPUs)
+        self.bank_size = 0  # Bytes per bank (0 = from the iNES mapper)
+        self.engine = self._resolve_engine(engine)
+        self._classes: Optional[ByteClassTables] = None
+        self._classes_key: Optional[Tuple] = None
+
+    def configure(self, settings: Dict) -> None:
+        """Apply detection parameters from a config's ``auto_detect`` block.
+
+        Args:
+            settings: Mapping of parameter names to values. Unknown keys
+                are ignored; missing keys keep their current value.
+
+        Raises:
+            ValueError: If a window size or step is smaller than 1
+        """
+        for key in (
+            "min_string_length",
+            "max_string_length",
+            "entropy_window_size",
+            "entropy_step_size",
+            "workers",
+            "bank_size",
+        ):
+            if key in settings:
+                setattr(self, key, int(settings[key]))
+
+        for key in (
+            "confidence_threshold",
+            "entropy_min",
+            "entropy_max",
+            "common_char_threshold",
+        ):
+            if key in settings:
+                setattr(self, key, float(settings[key]))
+
+        if "engine" in settings:
+            self.engine = self._resolve_engine(settings["engine"])
+
+        if self.entropy_window_size < 1 or self.entropy_step_size < 1:
+            raise ValueError("Entropy window size and step must be at least 1")
+
+        if self.workers < 0 or self.bank_size < 0:
+            raise ValueError("Workers and bank size must not be negative")
 
-    def detect_text_regions(self, rom_data: bytes) -> List[TextCandidate]:
+    @staticmethod
+    def _resolve_engine(engine: str) -> str:
+        """Resolve the requested detection engine to 'python' or 'numpy'."""
+        if engine not in DETECTION_ENGINES:
+            raise ValueError(f"Unknown detection engine: {engine}")
+
+        if engine == "auto":
+            return "numpy" if np is not None else "python"
+
+        if engine == "numpy" and np is None:
+            raise ImportError(
+                "The numpy detection engine requires NumPy "
+                "(install with: pip install familator[enhanced])"
+            )
+
+        return engine
+
+    def detect_text_regions(
+        self, rom_data: Union[bytes, RomImage], top_k: Optional[int] = None
+    ) -> List[TextCandidate]:
         """Detect potential text regions in ROM data.
 
+        With ``workers`` other than 1 the ROM is split into banks that are
+        scanned in a process pool; the result is identical to a
+        single-process scan.
+
         Args:
-            rom_data: ROM file data
+            rom_data: ROM file data or a mapped RomImage
+            top_k: If set, only the ``top_k`` most confident candidates are
+                kept, in a bounded heap fed by :meth:`iter_text_regions`
 
         Returns:
             List of text candidates sorted by confidence
         """
-        candidates = []
+        rom_data = rom_buffer(rom_data)
+        if top_k is not None:
+            return _select_top(self.iter_text_regions(rom_data), top_k)
 
-        # Method 1: Entropy-based detection
-        candidates.extend(self._detect_by_entropy(rom_data))
+        banks = self._bank_ranges(rom_data) if self.workers != 1 else []
 
-        # Method 2: Character frequency analysis
-        candidates.extend(self._detect_by_frequency(rom_data))
+        if len(banks) > 1:
+            by_method = self._detect_banks_parallel(rom_data, banks)
+        else:
+            by_method = self._detect_all(rom_data)
 
-        # Method 3: String terminator patterns
-        candidates.extend(self._detect_by_terminators(rom_data))
+        candidates = [c for method in by_method for c in method]
 
         # Remove duplicates and sort by confidence
         candidates = self._deduplicate_candidates(candidates)
@@ -67,60 +303,338 @@ class TextDetector:
 
         return [c for c in candidates if c.confidence >= self.confidence_threshold]
 
+    def iter_text_regions(
+        self, rom_data: Union[bytes, RomImage]
+    ) -> Iterator[TextCandidate]:
+        """Yield text candidates in address order as they are confirmed.
+
+        The ROM is scanned bank by bank (in a process pool when ``workers``
+        is not 1). A candidate is yielded as soon as no later bank can
+        overlap it, so the first results arrive after the first bank rather
+        than after the whole ROM. The candidates are the same as those of
+        :meth:`detect_text_regions`.
+
+        Args:
+            rom_data: ROM file data or a mapped RomImage
+
+        Yields:
+            Text candidates above the confidence threshold, by address
+        """
+        rom_data = rom_buffer(rom_data)
+        for candidate in self._sweep_candidates(self._iter_raw_candidates(rom_data)):
+            if candidate.confidence >= self.confidence_threshold:
+                yield candidate
+
+    def _iter_raw_candidates(self, rom_data: bytes) -> Iterator[TextCandidate]:
+        """Undeduplicated candidates in the order deduplication sorts them.
+
+        Candidates are ordered by address, then by detection method, then by
+        detection order. A terminator span can start up to
+        ``max_string_length`` bytes before the bank that owns it, so
+        candidates are only released once the scan is that far past them.
+        """
+        banks = self._bank_ranges(rom_data)
+        pending: List[Tuple[int, int, int, TextCandidate]] = []
+        sequence = 0
+
+        for (_, bank_end), by_method in zip(banks, self._map_banks(rom_data, banks)):
+            for method, found in enumerate(by_method):
+                for candidate in found:
+                    pending.append((candidate.address, method, sequence, candidate))
+                    sequence += 1
+
+            pending.sort()
+            if bank_end == len(rom_data):
+                ready = len(pending)
+            else:
+                ready = bisect_left(pending, (bank_end - self.max_string_length,))
+            for entry in pending[:ready]:
+                yield entry[3]
+            del pending[:ready]
+
+    def rank_tables(
+        self, rom_data: Union[bytes, RomImage], tables: Dict[str, EncodingTable]
+    ) -> List[TableScore]:
+        """Rank encoding tables by how much of the ROM they decode as text.
+
+        Every table is compiled into byte-class lookups and all of them are
+        scored in one pass over the entropy windows. Windows whose entropy
+        is in the text range count as text for a table when their confidence
+        under that table reaches ``confidence_threshold``. With NumPy the
+        window byte histograms are multiplied by a matrix of all the tables'
+        lookups.
+
+        Args:
+            rom_data: ROM file data or a mapped RomImage
+            tables: Mapping of table names to encoding tables
+
+        Returns:
+            Table scores, best coverage first
+        """
+        rom_data = rom_buffer(rom_data)
+        names = list(tables)
+        classes = [self._compile_byte_classes(tables[name]) for name in names]
+        if not classes:
+            return []
+
+        if self.engine == "numpy":
+            windows, hits, sums = self._table_coverage_np(rom_data, classes)
+        else:
+            windows, hits, sums = self._table_coverage(rom_data, classes)
+
+        scores = []
+        for name, text_windows, confidence_sum in zip(names, hits, sums):
+            text_windows = int(text_windows)
+            scores.append(
+                TableScore(
+                    name=name,
+                    coverage=text_windows / windows if windows else 0.0,
+                    text_windows=text_windows,
+                    mean_confidence=(
+                        float(confidence_sum) / text_windows if text_windows else 0.0
+                    ),
+                )
+            )
+        scores.sort(key=lambda x: (x.coverage, x.mean_confidence), reverse=True)
+        return scores
+
+    def _table_coverage(
+        self, rom_data: bytes, classes: List[ByteClassTables]
+    ) -> Tuple[int, List[int], List[float]]:
+        """Count text windows per table.
+
+        Returns:
+            Tuple of (window count, text windows per table, confidence sums)
+        """
+        window_size = self.entropy_window_size
+        hits = [0] * len(classes)
+        sums = [0.0] * len(classes)
+        windows = 0
+
+        for address, entropy, _ in self._scan_windows(rom_data):
+            windows += 1
+            if not self.entropy_min < entropy < self.entropy_max:
+                continue
+
+            window = rom_data[address : address + window_size]
+            for i, table in enumerate(classes):
+                confidence = self._score_from_counts(
+                    sum(window.translate(table.score_units)),
+                    sum(window.translate(table.recognized)),
+                    sum(window.translate(table.control)),
+                    window_size,
+                )
+                if confidence >= self.confidence_threshold:
+                    hits[i] += 1
+                    sums[i] += confidence
+
+        return windows, hits, sums
+
+    def _detect_all(self, rom_data: bytes) -> Tuple[List[TextCandidate], ...]:
+        """Run every detection method with the configured engine.
+
+        Returns:
+            Tuple of (entropy, frequency, terminator) candidate lists
+        """
+        if self.engine == "numpy":
+            data = np.frombuffer(rom_data, dtype=np.uint8)
+            return (
+                self._detect_by_entropy_np(rom_data, data),
+                self._detect_by_frequency_np(rom_data, data),
+                self._detect_by_terminators_np(rom_data, data),
+            )
+
+        return (
+            # Method 1: Entropy-based detection
+            self._detect_by_entropy(rom_data),
+            # Method 2: Character frequency analysis
+            self._detect_by_frequency(rom_data),
+            # Method 3: String terminator patterns
+            self._detect_by_terminators(rom_data),
+        )
+
+    def _bank_ranges(self, rom_data: bytes) -> List[Tuple[int, int]]:
+        """Split the ROM into bank-aligned (start, end) ranges.
+
+        PRG ROM is split into 8KB or 16KB banks depending on the mapper in
+        the iNES header, CHR ROM into 8KB banks. The header is scanned with
+        the first PRG bank. Headerless data is split into 16KB banks.
+        """
+        header = parse_ines_header(rom_data)
+
+        boundaries = []
+        if header is not None:
+            bank_size = self.bank_size or (
+                0x2000 if header.mapper in PRG_8K_MAPPERS else 0x4000
+            )
+            chr_start = header.chr_start
+            boundaries.extend(
+                range(header.prg_start + bank_size, chr_start, bank_size)
+            )
+            boundaries.extend(
+                range(
+                    chr_start,
+                    chr_start + header.chr_size,
+                    self.bank_size or CHR_ROM_UNIT,
+                )
+            )
+            boundaries.append(chr_start + header.chr_size)
+        else:
+            bank_size = self.bank_size or 0x4000
+            boundaries.extend(range(bank_size, len(rom_data), bank_size))
+
+        edges = [0]
+        edges += [b for b in boundaries if 0 < b < len(rom_data)]
+        edges.append(len(rom_data))
+        return [(start, end) for start, end in zip(edges, edges[1:]) if end > start]
+
+    def _detect_banks_parallel(
+        self, rom_data: bytes, banks: List[Tuple[int, int]]
+    ) -> Tuple[List[TextCandidate], ...]:
+        """Scan banks in a process pool and stitch the results together."""
+        results = list(self._map_banks(rom_data, banks))
+        return tuple(
+            [c for bank in results for c in bank[method]] for method in range(3)
+        )
+
+    def _map_banks(
+        self, rom_data: bytes, banks: List[Tuple[int, int]]
+    ) -> Iterator[Tuple[List[TextCandidate], ...]]:
+        """Detect the candidates owned by each bank, in bank order.
+
+        Each bank is scanned with enough surrounding bytes that windows and
+        terminator spans crossing a seam are scored exactly as in a full
+        scan. A candidate belongs to the bank holding its window start (or
+        its terminator), so every candidate is reported once and the
+        per-method lists come back in single-process order. Banks run in a
+        process pool unless ``workers`` is 1.
+        """
+        # Start slices on the window grids so window addresses line up
+        align = math.lcm(self.entropy_step_size, FREQUENCY_STEP_SIZE)
+        lead = self.max_string_length
+        tail = max(self.entropy_window_size, FREQUENCY_WINDOW_SIZE)
+
+        def bank_slices():
+            for start, end in banks:
+                slice_start = max(0, (start - lead) // align * align)
+                slice_end = min(len(rom_data), end + tail)
+                yield rom_data[slice_start:slice_end], slice_start, start, end
+
+        if self.workers == 1 or len(banks) < 2:
+            for args in bank_slices():
+                yield _scan_bank(self, *args)
+            return
+
+        workers = min(self.workers or os.cpu_count() or 1, len(banks))
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            yield from executor.map(_scan_bank, repeat(self), *zip(*bank_slices()))
+        finally:
+            executor.shutdown(cancel_futures=True)
+
     def _detect_by_entropy(self, rom_data: bytes) -> List[TextCandidate]:
         """Detect text using entropy analysis.
 
         Text typically has different entropy than graphics or code.
         """
         candidates = []
-        window_size = 32
-        step_size = 16
-
-        for i in range(0, len(rom_data) - window_size, step_size):
-            window = rom_data[i : i + window_size]
-            entropy = self._calculate_entropy(window)
+        window_size = self.entropy_window_size
 
+        for i, entropy, confidence in self._scan_windows(rom_data):
             # Text entropy is typically in a specific range
-            if 2.0 < entropy < 6.0:  # Heuristic values
-                confidence = self._calculate_text_confidence(window)
-                if confidence > 0.3:
-                    sample_text = self.encoding_table.decode_bytes(window, length=16)
-                    candidates.append(
-                        TextCandidate(
-                            address=i,
-                            length=window_size,
-                            confidence=confidence,
-                            sample_text=sample_text,
-                            encoding_used="entropy_detection",
-                            description=f"Entropy: {entropy:.2f}",
-                        )
+            if self.entropy_min < entropy < self.entropy_max and confidence > 0.3:
+                window = rom_data[i : i + window_size]
+                sample_text = self.encoding_table.decode_bytes(window, length=16)
+                candidates.append(
+                    TextCandidate(
+                        address=i,
+                        length=window_size,
+                        confidence=confidence,
+                        sample_text=sample_text,
+                        encoding_used="entropy_detection",
+                        description=f"Entropy: {entropy:.2f}",
                     )
+                )
 
         return candidates
 
+    def _scan_windows(self, rom_data: bytes) -> Iterator[Tuple[int, float, float]]:
+        """Slide the entropy window over the ROM with O(1) work per byte.
+
+        A 256-bin histogram, the fixed-point sum of c*log2(c) over it and the
+        byte-class counts used for text confidence are updated as bytes enter
+        and leave the window instead of being rebuilt for every window.
+
+        Yields:
+            Tuples of (window_address, entropy, text_confidence)
+        """
+        window_size = self.entropy_window_size
+        step_size = self.entropy_step_size
+        if len(rom_data) - window_size <= 0:
+            return
+
+        terms = _entropy_terms(window_size)
+        grow = [terms[c + 1] - terms[c] for c in range(window_size)]
+        max_entropy = math.log2(window_size)
+        divisor = window_size * ENTROPY_SCALE
+        classes = self._byte_classes()
+        score_units = classes.score_units
+        recognized = classes.recognized
+        control = classes.control
+
+        counts = [0] * 256
+        total = units = known = codes = 0
+        end = 0  # Bytes [start, end) are currently in the window
+
+        for start in range(0, len(rom_data) - window_size, step_size):
+            if start >= end:
+                # Window jumped past the previous one: start a fresh histogram
+                counts = [0] * 256
+                total = units = known = codes = 0
+                end = start
+            else:
+                for byte in rom_data[start - step_size : start]:
+                    count = counts[byte] - 1
+                    counts[byte] = count
+                    total -= grow[count]
+                    units -= score_units[byte]
+                    known -= recognized[byte]
+                    codes -= control[byte]
+
+            for byte in rom_data[end : start + window_size]:
+                count = counts[byte]
+                counts[byte] = count + 1
+                total += grow[count]
+                units += score_units[byte]
+                known += recognized[byte]
+                codes += control[byte]
+            end = start + window_size
+
+            yield (
+                start,
+                max_entropy - total / divisor,
+                self._score_from_counts(units, known, codes, window_size),
+            )
+
     def _detect_by_frequency(self, rom_data: bytes) -> List[TextCandidate]:
         """Detect text using character frequency analysis."""
         candidates = []
 
-        # Common text characters (space, common letters)
-        common_chars = set()
-        for char in " ABCDEFGHIJKLMNOPQRSTUVWXYZ":
-            byte_val = self.encoding_table.encode_char(char)
-            if byte_val is not None:
-                common_chars.add(byte_val)
-
-        if not common_chars:
+        is_common = self._byte_classes().common
+        if 1 not in is_common:
             return candidates
 
-        window_size = 20
-        for i in range(0, len(rom_data) - window_size, 4):
-            window = rom_data[i : i + window_size]
+        # Count common characters from a prefix sum over the whole ROM
+        common = list(accumulate(_translate(rom_data, is_common), initial=0))
 
-            # Count common characters
-            common_count = sum(1 for byte in window if byte in common_chars)
+        window_size = FREQUENCY_WINDOW_SIZE
+        for i in range(0, len(rom_data) - window_size, FREQUENCY_STEP_SIZE):
+            window = rom_data[i : i + window_size]
+            common_count = common[i + window_size] - common[i]
             frequency_ratio = common_count / window_size
 
-            if frequency_ratio > 0.4:  # At least 40% common characters
+            # By default at least 40% common characters
+            if frequency_ratio > self.common_char_threshold:
                 confidence = min(frequency_ratio * 1.5, 1.0)
                 sample_text = self.encoding_table.decode_bytes(window, length=16)
                 candidates.append(
@@ -137,94 +651,158 @@ class TextDetector:
         return candidates
 
     def _detect_by_terminators(self, rom_data: bytes) -> List[TextCandidate]:
-        """Detect text by looking for string terminators."""
+        """Detect text by looking for string terminators.
+
+        All terminator values are found in a single pass through a 256-entry
+        mask. Each string runs back from its terminator to the byte after the
+        previous terminator (at most ``max_string_length`` bytes), so padding
+        runs and back-to-back terminators no longer produce overlapping
+        candidates. Spans are scored in O(1) from byte-class prefix sums.
+        """
         candidates = []
 
-        # Common string terminators
-        terminators = []
-        for code_name in ["<END>", "<NULL>"]:
-            for byte_val, code in self.encoding_table.control_codes.items():
-                if code == code_name:
-                    terminators.append(byte_val)
-
-        # Also check for null bytes (0x00) and 0xFF
-        terminators.extend([0x00, 0xFF])
-
-        for terminator in terminators:
-            for i, byte_val in enumerate(rom_data):
-                if byte_val == terminator:
-                    # Look backwards for potential string start
-                    start = max(0, i - self.max_string_length)
-                    potential_string = rom_data[start:i]
-
-                    if len(potential_string) >= self.min_string_length:
-                        confidence = self._calculate_text_confidence(potential_string)
-                        if confidence > 0.4:
-                            sample_text = self.encoding_table.decode_bytes(
-                                potential_string
-                            )
-                            candidates.append(
-                                TextCandidate(
-                                    address=start,
-                                    length=len(potential_string),
-                                    confidence=confidence,
-                                    sample_text=sample_text,
-                                    encoding_used="terminator_detection",
-                                    description=f"Terminator: 0x{terminator:02X}",
-                                )
-                            )
+        units, recognized, control = self._class_prefix_sums(rom_data)
+        marked = _translate(rom_data, self._byte_classes().terminators)
+
+        previous = -1
+        for match in re.finditer(b"\x01", marked):
+            end = match.start()
+            # Look backwards for potential string start
+            start = max(previous + 1, end - self.max_string_length)
+            previous = end
+
+            length = end - start
+            if length < self.min_string_length:
+                continue
+
+            confidence = self._score_from_counts(
+                units[end] - units[start],
+                recognized[end] - recognized[start],
+                control[end] - control[start],
+                length,
+            )
+            if confidence > 0.4:
+                candidates.append(
+                    self._terminator_candidate(rom_data, start, end, confidence)
+                )
 
         return candidates
 
+    def _terminator_candidate(
+        self, rom_data: bytes, start: int, end: int, confidence: float
+    ) -> TextCandidate:
+        """Build the candidate for a string ending at terminator ``end``."""
+        return TextCandidate(
+            address=start,
+            length=end - start,
+            confidence=confidence,
+            sample_text=self.encoding_table.decode_bytes(rom_data[start:end]),
+            encoding_used="terminator_detection",
+            description=f"Terminator: 0x{rom_data[end]:02X}",
+        )
+
+    def _class_prefix_sums(self, rom_data: bytes) -> Tuple[List[int], ...]:
+        """Prefix sums of score units, recognized and control flags."""
+        classes = self._byte_classes()
+        return tuple(
+            list(accumulate(_translate(rom_data, table), initial=0))
+            for table in (classes.score_units, classes.recognized, classes.control)
+        )
+
     def _calculate_entropy(self, data: bytes) -> float:
         """Calculate Shannon entropy of byte sequence."""
         if len(data) == 0:
             return 0.0
 
-        # Count byte frequencies
-        frequencies = {}
-        for byte in data:
-            frequencies[byte] = frequencies.get(byte, 0) + 1
-
-        # Calculate entropy
-        entropy = 0.0
+        # H = log2(n) - sum(c * log2(c)) / n, with exact fixed-point terms
         data_len = len(data)
-        for count in frequencies.values():
-            probability = count / data_len
-            if probability > 0:
-                entropy -= probability * math.log2(probability)
+        terms = _entropy_terms(data_len)
+        total = sum(terms[count] for count in Counter(data).values())
 
-        return entropy
+        return math.log2(data_len) - total / (data_len * ENTROPY_SCALE)
 
-    def _calculate_text_confidence(self, data: bytes) -> float:
-        """Calculate confidence that data represents text."""
-        if len(data) == 0:
-            return 0.0
+    def _byte_classes(self) -> ByteClassTables:
+        """Lookup tables for the current encoding table.
 
-        score = 0.0
-        total_chars = len(data)
+        Compiled on first use and rebuilt whenever the encoding table is
+        replaced, reloaded or gains or loses mappings.
+        """
+        table = self.encoding_table
+        key = (
+            table,
+            table.revision,
+            len(table.byte_to_char),
+            len(table.control_codes),
+        )
+        if self._classes_key != key:
+            self._classes = self._compile_byte_classes(table)
+            self._classes_key = key
+        return self._classes
 
-        # Check for recognizable characters
-        recognized_chars = 0
-        control_codes = 0
+    @staticmethod
+    def _compile_byte_classes(encoding_table: EncodingTable) -> ByteClassTables:
+        """Classify every byte value of an encoding table."""
+        score_units = bytearray(256)
+        recognized = bytearray(256)
+        control = bytearray(256)
+        common = bytearray(256)
+        # Common string terminators, plus null bytes (0x00) and 0xFF
+        terminators = bytearray(256)
+        terminators[0x00] = terminators[0xFF] = 1
 
-        for byte in data:
-            if byte in self.encoding_table.byte_to_char:
-                recognized_chars += 1
-                char = self.encoding_table.byte_to_char[byte]
+        for byte in range(256):
+            if byte in encoding_table.byte_to_char:
+                recognized[byte] = 1
+                char = encoding_table.byte_to_char[byte]
 
                 # Bonus for common text characters
                 if char.isalpha() or char.isspace():
-                    score += 0.1
+                    score_units[byte] = 2
                 elif char in ".,!?":
-                    score += 0.05
+                    score_units[byte] = 1
+
+            elif byte in encoding_table.control_codes:
+                control[byte] = 1
+                score_units[byte] = 1
+
+            if encoding_table.control_codes.get(byte) in ("<END>", "<NULL>"):
+                terminators[byte] = 1
+
+        for char in " ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+            byte_val = encoding_table.encode_char(char)
+            # Two-byte codes can't be classified per byte
+            if byte_val is not None and byte_val <= 0xFF:
+                common[byte_val] = 1
 
-            elif byte in self.encoding_table.control_codes:
-                control_codes += 1
-                score += 0.05
+        return ByteClassTables(
+            score_units=bytes(score_units),
+            recognized=bytes(recognized),
+            control=bytes(control),
+            common=bytes(common),
+            terminators=bytes(terminators),
+        )
+
+    def _calculate_text_confidence(self, data: bytes) -> float:
+        """Calculate confidence that data represents text."""
+        if len(data) == 0:
+            return 0.0
+
+        classes = self._byte_classes()
+        return self._score_from_counts(
+            sum(data.translate(classes.score_units)),
+            sum(data.translate(classes.recognized)),
+            sum(data.translate(classes.control)),
+            len(data),
+        )
+
+    def _score_from_counts(
+        self, score_units: int, recognized_chars: int, control_codes: int, total: int
+    ) -> float:
+        """Turn per-window byte class counts into a text confidence score."""
+        score = score_units * 0.05
 
         # Base score from recognition rate
-        recognition_rate = (recognized_chars + control_codes) / total_chars
+        recognition_rate = (recognized_chars + control_codes) / total
         score += recognition_rate * 0.8
 
         # Penalty for too many unrecognized bytes
@@ -232,11 +810,252 @@ class TextDetector:
             score *= 0.5
 
         # Bonus for reasonable length
-        if self.min_string_length <= total_chars <= 50:
+        if self.min_string_length <= total <= 50:
             score += 0.1
 
         return min(score, 1.0)
 
+    # ------------------------------------------------------------------
+    # NumPy engine: same heuristics, computed for all offsets in bulk
+    # ------------------------------------------------------------------
+
+    def _class_prefix_sums_np(self, data: "np.ndarray") -> Tuple["np.ndarray", ...]:
+        """Prefix sums of score units, recognized and control flags."""
+        classes = self._byte_classes()
+        prefix_sums = []
+        for table in (classes.score_units, classes.recognized, classes.control):
+            lookup = np.frombuffer(table, dtype=np.uint8).astype(np.int64)
+            prefix = np.zeros(len(data) + 1, dtype=np.int64)
+            np.cumsum(lookup[data], out=prefix[1:])
+            prefix_sums.append(prefix)
+        return tuple(prefix_sums)
+
+    def _score_from_counts_np(
+        self,
+        score_units: "np.ndarray",
+        recognized_chars: "np.ndarray",
+        control_codes: "np.ndarray",
+        total: "np.ndarray",
+    ) -> "np.ndarray":
+        """Vectorized :meth:`_score_from_counts` (same operation order)."""
+        score = score_units * 0.05
+        recognition_rate = (recognized_chars + control_codes) / total
+        score = score + recognition_rate * 0.8
+        score = np.where(recognition_rate < 0.5, score * 0.5, score)
+        in_range = (total >= self.min_string_length) & (total <= 50)
+        score = np.where(in_range, score + 0.1, score)
+        return np.minimum(score, 1.0)
+
+    def _window_entropies_np(
+        self, data: "np.ndarray", starts: "np.ndarray", window_size: int
+    ) -> "np.ndarray":
+        """Entropy of every window starting at ``starts``.
+
+        Each window is sorted so equal bytes form runs; summing the
+        increments term[r] - term[r-1] over run positions telescopes to
+        term[count] per distinct byte, giving the exact fixed-point sum.
+        """
+        terms = np.asarray(_entropy_terms(window_size), dtype=np.int64)
+        increments = np.diff(terms)
+        positions = np.arange(window_size)
+        windows = np.lib.stride_tricks.sliding_window_view(data, window_size)
+        entropies = np.empty(len(starts), dtype=np.float64)
+
+        for chunk_start in range(0, len(starts), NUMPY_CHUNK_WINDOWS):
+            chunk = starts[chunk_start : chunk_start + NUMPY_CHUNK_WINDOWS]
+            sorted_windows = np.sort(windows[chunk], axis=1)
+            run_starts = np.zeros(sorted_windows.shape, dtype=np.int64)
+            run_starts[:, 1:] = np.where(
+                sorted_windows[:, 1:] != sorted_windows[:, :-1], positions[1:], 0
+            )
+            np.maximum.accumulate(run_starts, axis=1, out=run_starts)
+            totals = increments[positions - run_starts].sum(axis=1)
+            entropies[chunk_start : chunk_start + len(chunk)] = math.log2(
+                window_size
+            ) - totals / (window_size * ENTROPY_SCALE)
+
+        return entropies
+
+    def _table_coverage_np(
+        self, rom_data: bytes, classes: List[ByteClassTables]
+    ) -> Tuple[int, "np.ndarray", "np.ndarray"]:
+        """NumPy implementation of :meth:`_table_coverage`.
+
+        Byte histograms of a batch of windows (windows x 256) times the
+        stacked lookups of every table (256 x 3*tables) give the class
+        counts of every window under every table in one product.
+        """
+        window_size = self.entropy_window_size
+        count = len(classes)
+        data = np.frombuffer(rom_data, dtype=np.uint8)
+        starts = np.arange(0, len(rom_data) - window_size, self.entropy_step_size)
+        hits = np.zeros(count, dtype=np.int64)
+        sums = np.zeros(count, dtype=np.float64)
+        if len(starts) == 0:
+            return 0, hits, sums
+
+        lookups = np.empty((256, 3 * count), dtype=np.float64)
+        for i, table in enumerate(classes):
+            for j, field in enumerate(
+                (table.score_units, table.recognized, table.control)
+            ):
+                lookups[:, j * count + i] = np.frombuffer(field, dtype=np.uint8)
+
+        windows = np.lib.stride_tricks.sliding_window_view(data, window_size)
+        batch = max(1, NUMPY_CHUNK_WINDOWS // 16)  # Histograms are 2KB per window
+        for chunk_start in range(0, len(starts), batch):
+            chunk = starts[chunk_start : chunk_start + batch]
+            entropies = self._window_entropies_np(data, chunk, window_size)
+            in_range = (entropies > self.entropy_min) & (entropies < self.entropy_max)
+            chunk = chunk[in_range]
+            if len(chunk) == 0:
+                continue
+
+            cells = np.arange(len(chunk))[:, None] * 256 + windows[chunk]
+            histograms = np.bincount(cells.ravel(), minlength=len(chunk) * 256)
+            counts = histograms.reshape(len(chunk), 256).astype(np.float64) @ lookups
+
+            confidences = self._score_from_counts_np(
+                counts[:, :count],
+                counts[:, count : 2 * count],
+                counts[:, 2 * count :],
+                window_size,
+            )
+            text = confidences >= self.confidence_threshold
+            hits += text.sum(axis=0)
+            sums += np.where(text, confidences, 0.0).sum(axis=0)
+
+        return len(starts), hits, sums
+
+    def _detect_by_entropy_np(
+        self, rom_data: bytes, data: "np.ndarray"
+    ) -> List[TextCandidate]:
+        """NumPy implementation of :meth:`_detect_by_entropy`."""
+        candidates = []
+        window_size = self.entropy_window_size
+        step_size = self.entropy_step_size
+
+        starts = np.arange(0, len(rom_data) - window_size, step_size)
+        if len(starts) == 0:
+            return candidates
+
+        entropies = self._window_entropies_np(data, starts, window_size)
+        units, recognized, control = self._class_prefix_sums_np(data)
+        ends = starts + window_size
+        confidences = self._score_from_counts_np(
+            units[ends] - units[starts],
+            recognized[ends] - recognized[starts],
+            control[ends] - control[starts],
+            np.full(len(starts), window_size),
+        )
+
+        # Text entropy is typically in a specific range
+        hits = (
+            (entropies > self.entropy_min)
+            & (entropies < self.entropy_max)
+            & (confidences > 0.3)
+        )
+        indices = np.flatnonzero(hits)
+        addresses = starts[indices].tolist()
+        sample_size = min(window_size, 16)
+        samples = self.encoding_table.decode_many(
+            rom_data[address : address + sample_size] for address in addresses
+        )
+        for index, address, sample_text in zip(indices, addresses, samples):
+            candidates.append(
+                TextCandidate(
+                    address=address,
+                    length=window_size,
+                    confidence=float(confidences[index]),
+                    sample_text=sample_text,
+                    encoding_used="entropy_detection",
+                    description=f"Entropy: {entropies[index]:.2f}",
+                )
+            )
+
+        return candidates
+
+    def _detect_by_frequency_np(
+        self, rom_data: bytes, data: "np.ndarray"
+    ) -> List[TextCandidate]:
+        """NumPy implementation of :meth:`_detect_by_frequency`."""
+        candidates = []
+
+        classes = self._byte_classes()
+        if 1 not in classes.common:
+            return candidates
+
+        window_size = FREQUENCY_WINDOW_SIZE
+        starts = np.arange(0, len(rom_data) - window_size, FREQUENCY_STEP_SIZE)
+        if len(starts) == 0:
+            return candidates
+
+        is_common = np.frombuffer(classes.common, dtype=np.uint8).astype(np.int64)
+        prefix = np.zeros(len(data) + 1, dtype=np.int64)
+        np.cumsum(is_common[data], out=prefix[1:])
+
+        ratios = (prefix[starts + window_size] - prefix[starts]) / window_size
+        indices = np.flatnonzero(ratios > self.common_char_threshold)
+        addresses = starts[indices].tolist()
+        sample_size = min(window_size, 16)
+        samples = self.encoding_table.decode_many(
+            rom_data[address : address + sample_size] for address in addresses
+        )
+        for index, address, sample_text in zip(indices, addresses, samples):
+            frequency_ratio = float(ratios[index])
+            candidates.append(
+                TextCandidate(
+                    address=address,
+                    length=window_size,
+                    confidence=min(frequency_ratio * 1.5, 1.0),
+                    sample_text=sample_text,
+                    encoding_used="frequency_analysis",
+                    description=f"Common chars: {frequency_ratio:.1%}",
+                )
+            )
+
+        return candidates
+
+    def _detect_by_terminators_np(
+        self, rom_data: bytes, data: "np.ndarray"
+    ) -> List[TextCandidate]:
+        """NumPy implementation of :meth:`_detect_by_terminators`."""
+        candidates = []
+        units, recognized, control = self._class_prefix_sums_np(data)
+
+        is_terminator = np.frombuffer(
+            self._byte_classes().terminators, dtype=np.uint8
+        )
+        ends = np.flatnonzero(is_terminator[data])
+        previous = np.empty_like(ends)
+        previous[:1] = -1
+        previous[1:] = ends[:-1]
+
+        starts = np.maximum(previous + 1, ends - self.max_string_length)
+        lengths = ends - starts
+        keep = lengths >= self.min_string_length
+        ends, starts, lengths = ends[keep], starts[keep], lengths[keep]
+        if len(ends) == 0:
+            return candidates
+
+        confidences = self._score_from_counts_np(
+            units[ends] - units[starts],
+            recognized[ends] - recognized[starts],
+            control[ends] - control[starts],
+            lengths,
+        )
+        for index in np.flatnonzero(confidences > 0.4):
+            candidates.append(
+                self._terminator_candidate(
+                    rom_data,
+                    int(starts[index]),
+                    int(ends[index]),
+                    float(confidences[index]),
+                )
+            )
+
+        return candidates
+
     def _deduplicate_candidates(
         self, candidates: List[TextCandidate]
     ) -> List[TextCandidate]:
@@ -244,59 +1063,112 @@ class TextDetector:
         if not candidates:
             return candidates
 
-        # Sort by address
-        candidates.sort(key=lambda x: x.address)
+        # Sort by address (stable, so equal addresses keep detection order)
+        return list(
+            self._sweep_candidates(sorted(candidates, key=lambda x: x.address))
+        )
+
+    def _sweep_candidates(
+        self, ordered: Iterable[TextCandidate]
+    ) -> Iterator[TextCandidate]:
+        """Deduplicate address-ordered candidates, yielding survivors early.
+
+        Each candidate is compared with the accepted candidates that are
+        still "open" (end after its address). If it overlaps the first open
+        one by more than 50% of the shorter length, it replaces that one if
+        it has higher confidence and is dropped otherwise. Each survivor's
+        ``absorbed`` count records how many candidates were merged into it.
+
+        A survivor is final once the sweep passes its end. Survivors are
+        yielded in address order as soon as they and every earlier survivor
+        are final.
+        """
+        # [candidate, absorbed] entries; a replaced entry's candidate is None
+        pending: deque = deque()  # Accepted entries not yet yielded
+        active: List[list] = []  # Entries that may still overlap
+
+        for candidate in ordered:
+            start = candidate.address
+            end = start + candidate.length
+
+            # Retire accepted candidates that end before this one starts
+            active = [
+                entry
+                for entry in active
+                if entry[0] is not None
+                and entry[0].address + entry[0].length > start
+            ]
+            while pending and (not active or pending[0] is not active[0]):
+                entry = pending.popleft()
+                if entry[0] is not None:
+                    entry[0].absorbed = entry[1]
+                    yield entry[0]
 
-        result = []
-        for candidate in candidates:
-            # Check if this candidate overlaps significantly with existing ones
             overlaps = False
-            for existing in result:
-                overlap_start = max(candidate.address, existing.address)
-                overlap_end = min(
-                    candidate.address + candidate.length,
-                    existing.address + existing.length,
-                )
-                overlap_length = max(0, overlap_end - overlap_start)
+            carried = candidate.absorbed
+            for entry in active:
+                existing = entry[0]
+                overlap_length = min(end, existing.address + existing.length) - start
 
                 # If more than 50% overlap, keep the higher confidence one
                 if overlap_length > min(candidate.length, existing.length) * 0.5:
                     if candidate.confidence > existing.confidence:
-                        result.remove(existing)
+                        entry[0] = None
+                        carried += entry[1] + 1
                     else:
+                        entry[1] += carried + 1
                         overlaps = True
                     break
 
             if not overlaps:
-                result.append(candidate)
+                entry = [candidate, carried]
+                active.append(entry)
+                pending.append(entry)
 
-        return result
+        for candidate, count in pending:
+            if candidate is not None:
+                candidate.absorbed = count
+                yield candidate
 
-    def analyze_rom(self, rom_path: str) -> Dict:
+    def analyze_rom(self, rom_path: Union[str, RomImage]) -> Dict:
         """Analyze a ROM file and return text detection results.
 
         Args:
-            rom_path: Path to ROM file
+            rom_path: Path to ROM file, or an already mapped RomImage
 
         Returns:
             Analysis results dictionary
         """
-        rom_file = Path(rom_path)
-        if not rom_file.exists():
+        if not isinstance(rom_path, RomImage) and not Path(rom_path).exists():
             raise FileNotFoundError(f"ROM file not found: {rom_path}")
 
-        with open(rom_file, "rb") as f:
-            rom_data = f.read()
+        rom = RomImage.load(rom_path)
+        rom_data = rom.data
+        counts = Counter()
+        result_path = str(rom.path) if rom.path else rom_path
+
+        def tally(candidates: Iterable[TextCandidate]) -> Iterator[TextCandidate]:
+            for candidate in candidates:
+                counts["found"] += 1
+                if candidate.confidence > 0.8:
+                    counts["high"] += 1
+                elif candidate.confidence >= 0.6:
+                    counts["medium"] += 1
+                yield candidate
 
-        candidates = self.detect_text_regions(rom_data)
+        try:
+            top_candidates = _select_top(tally(self.iter_text_regions(rom_data)), 20)
+            rom_size = len(rom_data)
+        finally:
+            # Unmap only what this call mapped; a caller's image stays open
+            if rom is not rom_path:
+                rom.close()
 
         return {
-            "rom_path": rom_path,
-            "rom_size": len(rom_data),
-            "candidates_found": len(candidates),
-            "high_confidence": len([c for c in candidates if c.confidence > 0.8]),
-            "medium_confidence": len(
-                [c for c in candidates if 0.6 <= c.confidence <= 0.8]
-            ),
-            "candidates": candidates[:20],  # Top 20 candidates
+            "rom_path": result_path,
+            "rom_size": rom_size,
+            "candidates_found": counts["found"],
+            "high_confidence": counts["high"],
+            "medium_confidence": counts["medium"],
+            "candidates": top_candidates,  # Top 20 candidates
         }
@@ -0,0 +1,356 @@
+"""
+DTE/MTE dictionary compression planner.
+
+Translations into English or Spanish are usually 30-80% longer than the
+Japanese originals. Many NES games (and most translation hacks) fit the extra
+text with dual-tile encoding (DTE) or multi-tile encoding (MTE): byte values
+the font doesn't use are assigned to frequent letter pairs or longer strings,
+so one byte prints several characters.
+
+The planner works on the full translated script. It repeatedly merges the
+most frequent adjacent pair of tokens (starting from single characters), so
+frequent pairs become DTE entries and merged pairs grow into MTE entries,
+until it runs out of unused byte values or profitable pairs.
+"""
+
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from .encoding import EncodingTable
+    from .table_builder import TableBuilder, TableBuilderResult
+except ImportError:
+    from encoding import EncodingTable
+    from table_builder import TableBuilder, TableBuilderResult
+
+logger = logging.getLogger(__name__)
+
+# Control codes are never compressed; entries are built from the text between
+CONTROL_CODE_PATTERN = re.compile(r"<[^<>]*>")
+
+# Characters that can't appear in a .tbl entry (comment marker, and
+# brackets that would turn the entry into a control code)
+RESERVED_ENTRY_CHARS = frozenset("#<>\n\r")
+
+
+@dataclass
+class DictionaryEntry:
+    """A byte value assigned to a multi-character string."""
+
+    byte_value: int
+    text: str
+    uses: int = 0  # Occurrences in the encoded script
+
+
+@dataclass
+class BankSavings:
+    """Script size in one ROM bank before and after compression."""
+
+    bank: int
+    original_bytes: int = 0
+    compressed_bytes: int = 0
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.compressed_bytes
+
+
+@dataclass
+class CompressionPlan:
+    """Dictionary entries chosen for a script and the space they save."""
+
+    entries: List[DictionaryEntry] = field(default_factory=list)
+    original_bytes: int = 0
+    compressed_bytes: int = 0
+    banks: Dict[int, BankSavings] = field(default_factory=dict)
+    skipped: List[int] = field(default_factory=list)  # Unencodable text indexes
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.compressed_bytes
+
+    @property
+    def mappings(self) -> Dict[int, str]:
+        """Dictionary entries as byte_value -> text."""
+        return {entry.byte_value: entry.text for entry in self.entries}
+
+
+class DTEPlanner:
+    """
+    Chooses DTE/MTE dictionary entries that shrink a translated script.
+
+    Example:
+        planner = DTEPlanner(EncodingTable("tables/game.tbl"))
+        plan = planner.plan(texts, addresses)
+        planner.write_table(plan, "game_dte")
+    """
+
+    def __init__(
+        self,
+        encoding_table: EncodingTable,
+        max_entry_length: int = 2,
+        min_uses: int = 2,
+        bank_size: int = 0x4000,
+        header_size: int = 16,
+    ):
+        """Initialize planner.
+
+        Args:
+            encoding_table: Table the script is encoded with
+            max_entry_length: Longest entry text (2 for DTE, more for MTE)
+            min_uses: Minimum occurrences for a pair to get a byte value
+            bank_size: ROM bank size used for the per-bank report
+            header_size: Bytes before the first bank (16 for iNES ROMs)
+
+        Raises:
+            ValueError: If max_entry_length is below 2 or bank_size is not
+                positive
+        """
+        if max_entry_length < 2:
+            raise ValueError("max_entry_length must be at least 2")
+        if bank_size <= 0:
+            raise ValueError("bank_size must be positive")
+
+        self.encoding_table = encoding_table
+        self.max_entry_length = max_entry_length
+        self.min_uses = max(min_uses, 2)
+        self.bank_size = bank_size
+        self.header_size = header_size
+
+    def unused_bytes(self, reserved: Iterable[int] = ()) -> List[int]:
+        """Byte values the table leaves free for dictionary entries.
+
+        Args:
+            reserved: Extra byte values that must not be used (e.g. values
+                the game's text engine treats specially)
+
+        Returns:
+            Free byte values in ascending order
+        """
+        used = set(self.encoding_table.byte_to_char)
+        used.update(self.encoding_table.control_codes)
+        used.update(reserved)
+        # The leading byte of F0XX-style patterns is taken
+        used.update(p.units[0] for p in self.encoding_table.byte_patterns.values())
+        # So is the leading byte of two-byte codes
+        used.update(code >> 8 for code in list(used) if code > 0xFF)
+
+        return [byte_value for byte_value in range(0x100) if byte_value not in used]
+
+    def plan(
+        self,
+        texts: List[str],
+        addresses: Optional[List[Optional[int]]] = None,
+        max_entries: Optional[int] = None,
+        reserved: Iterable[int] = (),
+    ) -> CompressionPlan:
+        """Choose dictionary entries for a script.
+
+        Args:
+            texts: Translated strings (control codes in <...> form)
+            addresses: ROM address of each string, for the per-bank report
+            max_entries: Maximum number of entries (default: every free byte)
+            reserved: Byte values that must not be assigned
+
+        Returns:
+            CompressionPlan with the entries and the bytes saved per bank
+        """
+        plan = CompressionPlan()
+        free = self.unused_bytes(reserved)
+        if max_entries is not None:
+            free = free[:max_entries]
+
+        # One batch encode gives both encodability and the original sizes
+        original_lengths = {}
+        for index, result in enumerate(self.encoding_table.encode_batch(texts)):
+            if result.ok:
+                original_lengths[index] = result.length
+            else:
+                plan.skipped.append(index)
+        encodable = list(original_lengths)
+        if plan.skipped:
+            logger.warning(f"{len(plan.skipped)} strings can't be encoded; skipped")
+
+        segments = [
+            list(run)
+            for index in encodable
+            for run in CONTROL_CODE_PATTERN.split(texts[index])
+            if len(run) > 1
+        ]
+        chosen = self._choose_entries(segments, len(free))
+
+        compressed_table = self._extend_table(
+            {byte_value: text for byte_value, text in zip(free, chosen)}
+        )
+        uses: Counter = Counter()
+        for index in encodable:
+            original = original_lengths[index]
+            encoded = compressed_table.encode_string(texts[index])
+            uses.update(encoded)
+
+            address = addresses[index] if addresses else None
+            bank_number = self._bank_of(address)
+            bank = plan.banks.setdefault(bank_number, BankSavings(bank_number))
+            bank.original_bytes += original
+            bank.compressed_bytes += len(encoded)
+            plan.original_bytes += original
+            plan.compressed_bytes += len(encoded)
+
+        # Entries later merges made redundant are dropped so their bytes
+        # stay free
+        plan.entries = [
+            DictionaryEntry(byte_value, text, uses[byte_value])
+            for byte_value, text in zip(free, chosen)
+            if uses[byte_value]
+        ]
+
+        logger.info(
+            f"DTE plan: {len(plan.entries)} entries save {plan.saved_bytes} of "
+            f"{plan.original_bytes} bytes"
+        )
+        return plan
+
+    def write_table(
+        self,
+        plan: CompressionPlan,
+        game_name: str,
+        builder: Optional[TableBuilder] = None,
+    ) -> TableBuilderResult:
+        """Write the table extended with the plan's entries.
+
+        Args:
+            plan: Plan from :meth:`plan`
+            game_name: Name for the table file
+            builder: TableBuilder to write with (default: tables/)
+
+        Returns:
+            TableBuilderResult for the written table
+        """
+        builder = builder or TableBuilder()
+        mappings = dict(self.encoding_table.byte_to_char)
+        mappings.update(plan.mappings)
+
+        return builder.create_table(
+            game_name,
+            mappings,
+            dict(self.encoding_table.control_codes),
+            description=(
+                f"DTE/MTE dictionary: {len(plan.entries)} entries, "
+                f"{plan.saved_bytes} bytes saved"
+            ),
+            multi_byte_patterns=dict(self.encoding_table.multi_byte_patterns),
+        )
+
+    def _choose_entries(self, segments: List[List[str]], slots: int) -> List[str]:
+        """Merge the most frequent token pairs until the slots run out.
+
+        Pair counts are updated incrementally: each merge only adjusts the
+        counts of the pairs around the merged occurrences.
+
+        Args:
+            segments: Text runs, each a list of tokens (initially characters)
+            slots: Number of free byte values
+
+        Returns:
+            Entry texts in the order they were chosen
+        """
+        counts: Counter = Counter()
+        locations: Dict[Tuple[str, str], Set[int]] = {}
+
+        def adjust(pair: Tuple[str, str], delta: int, index: int) -> None:
+            if not self._is_candidate(pair):
+                return
+            counts[pair] += delta
+            if delta > 0:
+                locations.setdefault(pair, set()).add(index)
+            elif not counts[pair]:
+                del counts[pair]
+
+        for index, tokens in enumerate(segments):
+            for pair in zip(tokens, tokens[1:]):
+                adjust(pair, 1, index)
+
+        chosen: List[str] = []
+        known = set(self.encoding_table.char_to_byte)
+        while len(chosen) < slots and counts:
+            # Most frequent pair; ties go to the alphabetically first one
+            pair, uses = min(counts.items(), key=lambda item: (-item[1], item[0]))
+            if uses < self.min_uses:
+                break
+
+            merged = pair[0] + pair[1]
+            if merged not in known:
+                known.add(merged)
+                chosen.append(merged)
+
+            for index in locations.pop(pair, ()):
+                segments[index] = self._merge(
+                    segments[index], pair, merged, adjust, index
+                )
+            counts.pop(pair, None)
+
+        return chosen
+
+    def _is_candidate(self, pair: Tuple[str, str]) -> bool:
+        """Whether a token pair could become a dictionary entry."""
+        # Reserved characters are never merged, so they only occur as
+        # single-character tokens
+        return (
+            len(pair[0]) + len(pair[1]) <= self.max_entry_length
+            and pair[0] not in RESERVED_ENTRY_CHARS
+            and pair[1] not in RESERVED_ENTRY_CHARS
+        )
+
+    @staticmethod
+    def _merge(
+        tokens: List[str],
+        pair: Tuple[str, str],
+        merged: str,
+        adjust: Callable[[Tuple[str, str], int, int], None],
+        index: int,
+    ) -> List[str]:
+        """Replace non-overlapping occurrences of ``pair``, left to right.
+
+        ``adjust`` is called for every neighbouring pair that disappears or
+        appears, keeping the caller's pair counts current.
+        """
+        first, second = pair
+        result: List[str] = []
+        i = 0
+        length = len(tokens)
+        while i < length:
+            if i + 1 < length and tokens[i] == first and tokens[i + 1] == second:
+                if result:
+                    adjust((result[-1], first), -1, index)
+                    adjust((result[-1], merged), 1, index)
+                if i + 2 < length:
+                    adjust((second, tokens[i + 2]), -1, index)
+                    adjust((merged, tokens[i + 2]), 1, index)
+                result.append(merged)
+                i += 2
+            else:
+                result.append(tokens[i])
+                i += 1
+        return result
+
+    def _extend_table(self, entries: Dict[int, str]) -> EncodingTable:
+        """Copy of the encoding table with dictionary entries added."""
+        table = EncodingTable()
+        table.byte_to_char = dict(self.encoding_table.byte_to_char)
+        table.char_to_byte = dict(self.encoding_table.char_to_byte)
+        table.control_codes = dict(self.encoding_table.control_codes)
+        table.multi_byte_patterns = dict(self.encoding_table.multi_byte_patterns)
+        table.byte_patterns = dict(self.encoding_table.byte_patterns)
+        for byte_value, text in entries.items():
+            table.byte_to_char[byte_value] = text
+            table.char_to_byte[text] = byte_value
+        return table
+
+    def _bank_of(self, address: Optional[int]) -> int:
+        """ROM bank number of an address (bank 0 when unknown)."""
+        if address is None:
+            return 0
+        return max(address - self.header_size, 0) // self.bank_size
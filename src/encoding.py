@@ -5,74 +5,400 @@ Handles both basic character mappings and advanced control codes.
 """
 
 import re
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+try:
+    from .compiled_table import (
+        CharView,
+        CodeView,
+        CompiledTable,
+        WideView,
+        code_bytes,
+        write_compiled,
+    )
+except ImportError:
+    from compiled_table import (
+        CharView,
+        CodeView,
+        CompiledTable,
+        WideView,
+        code_bytes,
+        write_compiled,
+    )
+
+# Decoded text for bytes the table does not map, built once for all tables
+UNKNOWN_PLACEHOLDERS: Tuple[str, ...] = tuple(f"<UNK:{b:02X}>" for b in range(256))
+
+# Control codes that end a string when decoding
+TERMINATOR_CODES = ("<END>", "<NULL>")
+
+# Number of parsed tables kept by load_cached_table
+TABLE_CACHE_SIZE = 32
+
+# Mapping attributes made read-only by EncodingTable.freeze
+TABLE_MAPPINGS = (
+    "byte_to_char",
+    "char_to_byte",
+    "control_codes",
+    "multi_byte_patterns",
+    "byte_patterns",
+)
+
+# Parameter placeholders in multi-byte patterns (e.g. F0XX=<DELAY:XX>)
+PATTERN_PLACEHOLDERS = ("XX", "YY")
+
+# Largest code value: entries are one or two bytes (e.g. 8140=亜)
+MAX_CODE = 0xFFFF
+
+
+def split_table_line(line: str) -> Optional[Tuple[str, str]]:
+    """Split a .tbl line into its hex and text parts.
+
+    Only line endings are stripped from the text, since spaces can be mapped
+    characters; inline "#" comments are removed.
+
+    Args:
+        line: Line from a .tbl file
+
+    Returns:
+        (hex_part, text) or None for blank lines, comments and lines without
+        a mapping
+    """
+    line = line.rstrip("\n\r")
+    if not line or line.lstrip().startswith("#") or "=" not in line:
+        return None
+
+    hex_part, char_part = line.split("=", 1)
+    if "#" in char_part:
+        char_part = char_part.split("#")[0].rstrip()
+    return hex_part.strip(), char_part
+
+
+@dataclass(frozen=True)
+class BytePattern:
+    """A parameterized control code such as ``F0XX=<DELAY:XX>``.
+
+    ``units`` holds one entry per byte: a fixed byte value, or the name of
+    the placeholder whose value the byte carries. The first unit is always
+    fixed, so patterns can be dispatched on their leading byte.
+    """
+
+    units: Tuple[Union[int, str], ...]
+    template: str
+    regex: "re.Pattern"  # Matches the decoded text, one group per placeholder
+
+    @classmethod
+    def parse(cls, hex_part: str, template: str) -> "BytePattern":
+        """Compile a pattern from its .tbl hex and text parts.
+
+        Raises:
+            ValueError: If the hex part isn't whole bytes, doesn't start with
+                a fixed byte, or uses an unknown placeholder
+        """
+        if len(hex_part) % 2 or len(hex_part) < 4:
+            raise ValueError(f"Invalid multi-byte pattern: {hex_part}")
+
+        units: List[Union[int, str]] = []
+        for i in range(0, len(hex_part), 2):
+            unit = hex_part[i : i + 2]
+            if unit in PATTERN_PLACEHOLDERS:
+                units.append(unit)
+                continue
+            try:
+                units.append(int(unit, 16))
+            except ValueError:
+                raise ValueError(f"Invalid multi-byte pattern: {hex_part}")
+        if not isinstance(units[0], int):
+            raise ValueError(f"Pattern must start with a fixed byte: {hex_part}")
+
+        # Each placeholder in the text becomes a two-digit hex group; a
+        # repeated placeholder must repeat the same value
+        regex = ""
+        for piece in re.split("(XX|YY)", template):
+            if piece not in PATTERN_PLACEHOLDERS:
+                regex += re.escape(piece)
+            elif f"(?P<{piece}>" in regex:
+                regex += f"(?P={piece})"
+            else:
+                regex += f"(?P<{piece}>[0-9A-Fa-f]{{2}})"
+
+        return cls(tuple(units), template, re.compile(regex))
+
+    @property
+    def size(self) -> int:
+        return len(self.units)
+
+    @property
+    def encodable(self) -> bool:
+        """Whether the text carries every parameter byte."""
+        names = [unit for unit in self.units if isinstance(unit, str)]
+        return all(name in self.regex.groupindex for name in names)
+
+    def decode_at(self, data: bytes, pos: int) -> Optional[str]:
+        """Decoded text if the pattern matches ``data`` at ``pos``."""
+        if pos + len(self.units) > len(data):
+            return None
+
+        values = {}
+        for offset, unit in enumerate(self.units):
+            byte_value = data[pos + offset]
+            if isinstance(unit, int):
+                if byte_value != unit:
+                    return None
+            else:
+                values[unit] = f"{byte_value:02X}"
+
+        text = self.template
+        for name, value in values.items():
+            text = text.replace(name, value)
+        return text
+
+    def encode_match(self, match: "re.Match") -> bytes:
+        """Bytes for text matched by :attr:`regex`."""
+        return bytes(
+            unit if isinstance(unit, int) else int(match.group(unit), 16)
+            for unit in self.units
+        )
+
+
+@dataclass(frozen=True)
+class DecodeTables:
+    """Compiled 256-entry lookups used for decoding.
+
+    ``terminators`` is a bytes.translate table mapping terminator bytes to 1
+    and every other byte to 0, so ``span.translate(terminators).find(1)``
+    locates the end of a string in a single C-level pass. Bytes that start a
+    multi-byte pattern or a two-byte code map to 2 (unless they are
+    terminators); ``patterns`` lists the candidate patterns for each leading
+    byte and ``wide`` the two-byte codes.
+    """
+
+    chars: Tuple[str, ...]  # Decoded text for every byte value
+    terminators: bytes
+    patterns: Tuple[Tuple[BytePattern, ...], ...] = ()  # Empty: no patterns
+    wide: Mapping[int, str] = field(default_factory=dict)  # Two-byte code -> text
+    multi_byte: bool = False  # Whether any byte is marked 2
+
+
+class CharTrie:
+    """Character trie over table entries, for longest-match encoding.
+
+    Each node is a dict of next character -> child node; a node that
+    completes an entry stores the entry's bytes under the ``None`` key.
+    """
+
+    def __init__(self):
+        self.root: Dict[Optional[str], Any] = {}
+
+    def add(self, token: str, code: int) -> None:
+        """Add an entry unless one with the same text exists."""
+        node = self.root
+        for char in token:
+            node = node.setdefault(char, {})
+        node.setdefault(None, code_bytes(code))
+
+    def longest_match(self, text: str, pos: int) -> Optional[Tuple[bytes, int]]:
+        """Longest entry matching ``text`` at ``pos``.
+
+        Returns:
+            The entry's encoded bytes and the position after it, or None
+        """
+        # Walk the trie as far as the text allows, remembering the longest
+        # complete entry seen on the way
+        node = self.root.get(text[pos])
+        match = None
+        j = pos
+        while node is not None:
+            j += 1
+            if None in node:
+                match = (node[None], j)
+            if j == len(text):
+                break
+            node = node.get(text[j])
+        return match
+
+    def matches(self, text: str, pos: int) -> List[Tuple[bytes, int]]:
+        """Every entry matching ``text`` at ``pos``, shortest first."""
+        node = self.root.get(text[pos])
+        found = []
+        j = pos
+        while node is not None:
+            j += 1
+            if None in node:
+                found.append((node[None], j))
+            if j == len(text):
+                break
+            node = node.get(text[j])
+        return found
+
+    def singles(self) -> Dict[str, bytes]:
+        """Characters that complete an entry and start no longer one."""
+        return {
+            char: node[None]
+            for char, node in self.root.items()
+            if len(node) == 1 and None in node and char != "<"
+        }
+
+
+@dataclass(frozen=True)
+class EncodeTrie:
+    """Compiled longest-match lookup used for encoding.
+
+    ``trie`` covers every table entry (single characters, multi-character
+    entries such as "the", and control codes): a :class:`CharTrie` for
+    parsed tables, or the memory-mapped trie of a compiled table.
+    """
+
+    trie: Any  # Provides longest_match(text, pos)
+    control_bytes: Mapping[str, int]  # Control code -> code value
+    # Characters that complete an entry and start no longer one (except
+    # "<"), so the encoder can skip the trie walk for them
+    singles: Dict[str, bytes]
+    patterns: Tuple[BytePattern, ...] = ()  # Encodable multi-byte patterns
+
+
+@dataclass(frozen=True)
+class EncodeResult:
+    """Outcome of encoding one string with :meth:`EncodingTable.encode_batch`."""
+
+    data: bytes  # Encoded bytes, up to the error if there is one
+    error_offset: Optional[int] = None  # Character offset of the error
+    error: Optional[str] = None  # Message encode_string would raise
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def length(self) -> int:
+        return len(self.data)
 
 
 class EncodingTable:
     """Parser and handler for .tbl encoding files."""
 
-    def __init__(self, table_path: Optional[str] = None):
+    def __init__(self, table_path: Optional[str] = None, compile: bool = True):
         """Initialize encoding table.
 
         Args:
             table_path: Path to .tbl file. If None, creates empty table.
+            compile: Write the compiled form next to the file (see
+                :meth:`load_table`)
         """
         self.byte_to_char: Dict[int, str] = {}
         self.char_to_byte: Dict[str, int] = {}
         self.control_codes: Dict[int, str] = {}
         self.multi_byte_patterns: Dict[str, str] = {}
+        self.byte_patterns: Dict[str, BytePattern] = {}  # Compiled, by hex part
+        # Bumped on every parsed mapping so compiled lookups can be rebuilt
+        self.revision = 0
+        self.frozen = False
+        # Memory-mapped compiled form backing the mappings, if loaded from one
+        self._compiled: Optional[CompiledTable] = None
+        self._decode_cache: Optional[Tuple[Tuple[int, ...], DecodeTables]] = None
+        self._encode_cache: Optional[Tuple[Tuple[int, ...], EncodeTrie]] = None
 
         if table_path:
-            self.load_table(table_path)
+            self.load_table(table_path, compile=compile)
 
-    def load_table(self, table_path: str) -> None:
+    def load_table(self, table_path: str, compile: bool = True) -> None:
         """Load encoding table from .tbl file.
 
+        The first load of a file writes its compiled form next to it (see
+        :mod:`compiled_table`); later loads into an empty table map that
+        file instead of parsing the text.
+
         Args:
             table_path: Path to .tbl file
+            compile: Write the compiled form if it is missing or stale. Pass
+                False for paths that come from outside the project (e.g. web
+                requests), so loading never creates files next to them.
 
         Raises:
             FileNotFoundError: If table file doesn't exist
             ValueError: If table format is invalid
+            TypeError: If the table is frozen
         """
+        self._check_mutable()
         table_file = Path(table_path)
         if not table_file.exists():
             raise FileNotFoundError(f"Table file not found: {table_path}")
 
+        fresh = self.revision == 0
+        if fresh:
+            compiled = CompiledTable.open(table_file)
+            if compiled is not None:
+                self._attach_compiled(compiled)
+                return
+
+        stat = table_file.stat()
         with open(table_file, "r", encoding="utf-8") as f:
             for line_num, line in enumerate(f, 1):
-                line = line.rstrip("\n\r")  # Only remove line endings, preserve spaces
-
-                # Skip empty lines and comments
-                if not line or line.lstrip().startswith("#"):
-                    continue
-
                 try:
                     self._parse_table_line(line)
                 except Exception as e:
                     raise ValueError(f"Invalid table format at line {line_num}: {e}")
 
+        if fresh and compile:
+            write_compiled(table_file, self, stat)
+
+    def _attach_compiled(self, compiled: CompiledTable) -> None:
+        """Serve the mappings from a compiled table."""
+        self._compiled = compiled
+        self.byte_to_char = CodeView(compiled, controls=False)
+        self.char_to_byte = CharView(compiled)
+        self.control_codes = CodeView(compiled, controls=True)
+        self.multi_byte_patterns = compiled.multi_byte_patterns()
+        self.byte_patterns = {
+            hex_part: BytePattern.parse(hex_part, template)
+            for hex_part, template in self.multi_byte_patterns.items()
+        }
+        self.revision += 1
+
+    def _detach_compiled(self) -> None:
+        """Copy compiled mappings into dicts so they can be changed."""
+        if self._compiled is not None:
+            self.byte_to_char = dict(self.byte_to_char)
+            self.char_to_byte = dict(self.char_to_byte)
+            self.control_codes = dict(self.control_codes)
+            self._compiled = None
+
     def _parse_table_line(self, line: str) -> None:
         """Parse a single line from table file.
 
         Args:
             line: Line from .tbl file
+
+        Raises:
+            ValueError: If the line's code is invalid or longer than two
+                bytes
         """
-        if "=" not in line:
+        parts = split_table_line(line)
+        if parts is None:
             return
 
-        hex_part, char_part = line.split("=", 1)
-        hex_part = hex_part.strip()
-        # Handle inline comments after character mapping
-        char_part = char_part.rstrip("\n\r")  # Only remove line endings
-
-        # Remove inline comments but preserve the character mapping
-        if "#" in char_part:
-            char_part = char_part.split("#")[0].rstrip()
+        self._check_mutable()
+        self._detach_compiled()
+        self.revision += 1
+        hex_part, char_part = parts
 
         # Handle multi-byte patterns (e.g., F0XX=<DELAY:XX>)
         if "XX" in hex_part or "YY" in hex_part:
+            self.byte_patterns[hex_part] = BytePattern.parse(hex_part, char_part)
             self.multi_byte_patterns[hex_part] = char_part
             return
 
@@ -81,6 +407,8 @@ class EncodingTable:
             byte_value = int(hex_part, 16)
         except ValueError:
             raise ValueError(f"Invalid hex value: {hex_part}")
+        if byte_value > MAX_CODE:
+            raise ValueError(f"Code longer than two bytes: {hex_part}")
 
         # Handle control codes (e.g., <NEWLINE>, <END>)
         if char_part.startswith("<") and char_part.endswith(">"):
@@ -100,12 +428,126 @@ class EncodingTable:
         Returns:
             Decoded character or control code
         """
-        if byte_value in self.control_codes:
-            return self.control_codes[byte_value]
-        elif byte_value in self.byte_to_char:
-            return self.byte_to_char[byte_value]
+        tables = self.decode_tables()
+        if byte_value > 0xFF:
+            return tables.wide.get(byte_value, f"<UNK:{byte_value:04X}>")
+        return tables.chars[byte_value]
+
+    def decode_tables(self) -> DecodeTables:
+        """Compiled decode lookups, rebuilt whenever the table changes.
+
+        Returns:
+            DecodeTables for the current mappings
+        """
+        key = self._mapping_key()
+        if self._decode_cache is None or self._decode_cache[0] != key:
+            self._decode_cache = (key, self._compile_decode_tables())
+        return self._decode_cache[1]
+
+    def encode_trie(self) -> EncodeTrie:
+        """Compiled encode trie, rebuilt whenever the table changes.
+
+        Returns:
+            EncodeTrie for the current mappings
+        """
+        key = self._mapping_key()
+        if self._encode_cache is None or self._encode_cache[0] != key:
+            self._encode_cache = (key, self._compile_encode_trie())
+        return self._encode_cache[1]
+
+    def _mapping_key(self) -> Tuple[int, ...]:
+        """Cache key that changes whenever mappings are added."""
+        return (
+            self.revision,
+            len(self.char_to_byte),
+            len(self.control_codes),
+            len(self.byte_patterns),
+        )
+
+    def _compile_decode_tables(self) -> DecodeTables:
+        """Build the decode array and terminator bitmap."""
+        if self._compiled is not None:
+            chars = list(self._compiled.decoded_chars(UNKNOWN_PLACEHOLDERS))
+            wide: Mapping[int, str] = WideView(self._compiled)
+            leads = [b for b in range(256) if self._compiled.leads[b]]
         else:
-            return f"<UNK:{byte_value:02X}>"
+            chars = list(UNKNOWN_PLACEHOLDERS)
+            wide = {}
+            # Control codes take precedence over characters on the same code
+            for mapping in (self.byte_to_char, self.control_codes):
+                for code, text in mapping.items():
+                    if code > 0xFF:
+                        wide[code] = text
+                    else:
+                        chars[code] = text
+            leads = sorted({code >> 8 for code in wide})
+
+        marks = [1 if decoded in TERMINATOR_CODES else 0 for decoded in chars]
+        for lead in leads:
+            if not marks[lead]:
+                marks[lead] = 2
+
+        dispatch: List[List[BytePattern]] = [[] for _ in range(256)]
+        # Longer patterns are tried first so specific prefixes win
+        for pattern in sorted(self.byte_patterns.values(), key=lambda p: -p.size):
+            dispatch[pattern.units[0]].append(pattern)
+            if not marks[pattern.units[0]]:
+                marks[pattern.units[0]] = 2
+
+        return DecodeTables(
+            chars=tuple(chars),
+            terminators=bytes(marks),
+            patterns=tuple(map(tuple, dispatch)) if self.byte_patterns else (),
+            wide=wide,
+            multi_byte=bool(leads or self.byte_patterns),
+        )
+
+    def _compile_encode_trie(self) -> EncodeTrie:
+        """Build the encode trie and the control code reverse index."""
+        patterns = tuple(p for p in self.byte_patterns.values() if p.encodable)
+        if self._compiled is not None:
+            # The mapped trie fills its singles as characters are encoded
+            trie = self._compiled.trie
+            return EncodeTrie(
+                trie=trie,
+                control_bytes=self._compiled.control_bytes(),
+                singles=trie.singles,
+                patterns=patterns,
+            )
+
+        control_bytes: Dict[str, int] = {}
+        for byte_value, code in self.control_codes.items():
+            # The first byte listed for a code wins, as in the .tbl file
+            control_bytes.setdefault(code, byte_value)
+
+        trie = CharTrie()
+        for entries in (self.char_to_byte, control_bytes):
+            for token, byte_value in entries.items():
+                if token:
+                    trie.add(token, byte_value)
+
+        return EncodeTrie(
+            trie=trie,
+            control_bytes=control_bytes,
+            singles=trie.singles(),
+            patterns=patterns,
+        )
+
+    def control_code_byte(self, code: str) -> Optional[int]:
+        """Byte value of a control code.
+
+        Args:
+            code: Control code, e.g. "<END>"
+
+        Returns:
+            Byte value or None if the table has no such code
+        """
+        return self.encode_trie().control_bytes.get(code)
+
+    def terminator_bytes(self) -> FrozenSet[int]:
+        """Byte values that decode as a terminator (<END> or <NULL>)."""
+        marks = self.decode_tables().terminators
+        return frozenset(b for b in range(256) if marks[b] == 1)
 
     def encode_char(self, char: str) -> Optional[int]:
         """Encode a character to byte value.
@@ -131,26 +573,85 @@ class EncodingTable:
         Returns:
             Decoded string
         """
-        result = []
         end = start + length if length else len(data)
-        i = start
+        return self._decode_span(data[start:end], self.decode_tables())
 
-        while i < end:
-            byte_val = data[i]
-            decoded = self.decode_byte(byte_val)
+    def decode_many(
+        self, buffers: Iterable[bytes], length: Optional[int] = None
+    ) -> List[str]:
+        """Decode many byte spans with the same table.
 
-            # Stop at end markers
-            if decoded in ["<END>", "<NULL>"]:
-                break
+        Each span is decoded like :meth:`decode_bytes`, stopping at the first
+        end marker. The compiled lookups are fetched once for the whole batch.
 
-            result.append(decoded)
-            i += 1
+        Args:
+            buffers: Byte spans to decode
+            length: Maximum number of bytes to decode from each span
 
-        return "".join(result)
+        Returns:
+            Decoded strings, one per span
+        """
+        tables = self.decode_tables()
+        if length:
+            return [self._decode_span(buffer[:length], tables) for buffer in buffers]
+        return [self._decode_span(buffer, tables) for buffer in buffers]
+
+    @staticmethod
+    def _decode_span(span: bytes, tables: DecodeTables) -> str:
+        """Decode one span up to its first end marker."""
+        if not isinstance(span, (bytes, bytearray)):
+            span = bytes(span)
+
+        marks = span.translate(tables.terminators)
+        stop = marks.find(1)
+        if stop == -1:
+            stop = len(span)
+        chars = tables.chars
+        if not tables.multi_byte:
+            return "".join(map(chars.__getitem__, span[:stop]))
+
+        # Decode runs of plain bytes in bulk, stopping only at bytes that
+        # may start a multi-byte pattern or a two-byte code
+        wide = tables.wide
+        result = []
+        pos = 0
+        while True:
+            lead = marks.find(2, pos, stop)
+            if lead == -1:
+                result.extend(map(chars.__getitem__, span[pos:stop]))
+                return "".join(result)
+
+            result.extend(map(chars.__getitem__, span[pos:lead]))
+            for pattern in tables.patterns[span[lead]] if tables.patterns else ():
+                decoded = pattern.decode_at(span, lead)
+                if decoded is not None:
+                    result.append(decoded)
+                    pos = lead + pattern.size
+                    break
+            else:
+                decoded = None
+                if lead + 1 < len(span):
+                    decoded = wide.get((span[lead] << 8) | span[lead + 1])
+                if decoded is not None:
+                    result.append(decoded)
+                    pos = lead + 2
+                else:
+                    result.append(chars[span[lead]])
+                    pos = lead + 1
+
+            if pos > stop:
+                # A parameter byte looked like a terminator
+                stop = marks.find(1, pos)
+                if stop == -1:
+                    stop = len(span)
 
     def encode_string(self, text: str) -> bytes:
         """Encode a string to bytes.
 
+        Each position takes the longest table entry that matches, so
+        multi-character entries (e.g. "the") are used when present. Two-byte
+        codes are written big-endian (8140=亜 encodes as 81 40).
+
         Args:
             text: String to encode
 
@@ -160,36 +661,232 @@ class EncodingTable:
         Raises:
             ValueError: If string contains unrecognized characters
         """
-        result = []
+        data, _, error = self._encode_greedy(text, self.encode_trie())
+        if error is not None:
+            raise ValueError(error)
+        return data
+
+    def encode_batch(
+        self, texts: Iterable[str], optimal: bool = False
+    ) -> List[EncodeResult]:
+        """Encode many strings without raising.
+
+        Unencodable strings are reported in their result instead of raising,
+        so large scripts can be checked in one pass.
+
+        Args:
+            texts: Strings to encode
+            optimal: Use the shortest encoding (:meth:`encode_optimal`)
+                instead of greedy longest-match
+
+        Returns:
+            One EncodeResult per string, in order
+        """
+        trie = self.encode_trie()
+        results = []
+        for text in texts:
+            if optimal:
+                costs, steps = self._optimal_paths(text)
+                if costs[len(text)] is not None:
+                    results.append(EncodeResult(self._follow_path(steps, len(text))))
+                    continue
+            results.append(EncodeResult(*self._encode_greedy(text, trie)))
+        return results
+
+    @classmethod
+    def _encode_greedy(
+        cls, text: str, trie: EncodeTrie
+    ) -> Tuple[bytes, Optional[int], Optional[str]]:
+        """Longest-match encode, stopping at the first unencodable position.
+
+        Returns:
+            The bytes encoded so far, the character offset of the error and
+            the error message (both None on success)
+        """
+        singles, longest_match = trie.singles, trie.trie.longest_match
+        result = bytearray()
+        length = len(text)
 
         i = 0
-        while i < len(text):
-            char = text[i]
+        while i < length:
+            encoded_char = singles.get(text[i])
+            if encoded_char is not None:
+                result += encoded_char
+                i += 1
+                continue
+
+            match = longest_match(text, i)
+
+            # "<...>" is always a control code; only control codes both
+            # start with "<" and end with ">"
+            if text[i] == "<" and (match is None or text[match[1] - 1] != ">"):
+                encoded = cls._encode_pattern(text, i, trie.patterns)
+                if encoded is not None:
+                    result += encoded[0]
+                    i = encoded[1]
+                    continue
 
-            # Handle control codes
-            if char == "<":
                 end_bracket = text.find(">", i)
                 if end_bracket != -1:
-                    control_code = text[i : end_bracket + 1]
-                    # Find byte value for this control code
-                    for byte_val, code in self.control_codes.items():
-                        if code == control_code:
-                            result.append(byte_val)
-                            break
-                    else:
-                        raise ValueError(f"Unknown control code: {control_code}")
-                    i = end_bracket + 1
-                    continue
+                    error = f"Unknown control code: {text[i : end_bracket + 1]}"
+                    return bytes(result), i, error
+
+            if match is None:
+                return bytes(result), i, f"Cannot encode character: {text[i]}"
+
+            result += match[0]
+            i = match[1]
+
+        return bytes(result), None, None
+
+    def encode_optimal(self, text: str) -> bytes:
+        """Encode a string in as few bytes as possible.
+
+        Greedy longest-match (:meth:`encode_string`) can lose bytes when
+        multi-character entries overlap: with "ab" and "bcd" entries, "abcd"
+        encodes greedily as "ab" + "c" + "d" where "a" + "bcd" is shorter.
+        This finds the segmentation with the fewest bytes by a shortest-path
+        pass over the string, in time linear in its length (each position
+        only tries the entries starting there).
+
+        Args:
+            text: String to encode
+
+        Returns:
+            Encoded byte data
+
+        Raises:
+            ValueError: If string contains unrecognized characters
+        """
+        costs, steps = self._optimal_paths(text)
+        if costs[len(text)] is None:
+            # No segmentation exists; report the error the greedy encoder
+            # finds
+            return self.encode_string(text)
+        return self._follow_path(steps, len(text))
+
+    def truncate_optimal(self, text: str, max_bytes: int) -> Tuple[str, bytes]:
+        """Longest prefix of a string whose optimal encoding fits.
+
+        Prefixes that end inside a control code or multi-character entry
+        only count if they can be encoded on their own.
+
+        Args:
+            text: String to truncate
+            max_bytes: Maximum encoded size
+
+        Returns:
+            The prefix and its encoding (both empty if nothing fits)
+        """
+        costs, steps = self._optimal_paths(text)
+        for length in range(len(text), 0, -1):
+            if costs[length] is not None and costs[length] <= max_bytes:
+                return text[:length], self._follow_path(steps, length)
+        return "", b""
 
-            # Regular character
-            byte_val = self.encode_char(char)
-            if byte_val is None:
-                raise ValueError(f"Cannot encode character: {char}")
+    def _optimal_paths(
+        self, text: str
+    ) -> Tuple[List[Optional[int]], List[Optional[Tuple[int, bytes]]]]:
+        """Fewest bytes needed for every prefix of ``text``.
 
-            result.append(byte_val)
-            i += 1
+        Returns:
+            ``costs[i]`` (None if text[:i] can't be encoded) and
+            ``steps[i]``, the start and bytes of the last entry on the best
+            path to ``i``
+        """
+        trie = self.encode_trie()
+        costs: List[Optional[int]] = [None] * (len(text) + 1)
+        steps: List[Optional[Tuple[int, bytes]]] = [None] * (len(text) + 1)
+        costs[0] = 0
+
+        for i in range(len(text)):
+            cost = costs[i]
+            if cost is None:
+                continue
+            for encoded, end in self._encode_options(text, i, trie):
+                previous = costs[end]
+                if previous is None or cost + len(encoded) < previous:
+                    costs[end] = cost + len(encoded)
+                    steps[end] = (i, encoded)
+        return costs, steps
+
+    @staticmethod
+    def _follow_path(steps: List[Optional[Tuple[int, bytes]]], end: int) -> bytes:
+        """Bytes of the best path to ``end``."""
+        parts = []
+        while end:
+            end, encoded = steps[end]
+            parts.append(encoded)
+        return b"".join(reversed(parts))
+
+    @classmethod
+    def _encode_options(
+        cls, text: str, pos: int, trie: EncodeTrie
+    ) -> List[Tuple[bytes, int]]:
+        """Entries that can encode ``text`` at ``pos``, as (bytes, end)."""
+        encoded = trie.singles.get(text[pos])
+        if encoded is not None:
+            return [(encoded, pos + 1)]
+
+        options = trie.trie.matches(text, pos)
+        if text[pos] == "<" and text.find(">", pos) != -1:
+            # "<...>" is always a control code, as in encode_string
+            options = [option for option in options if text[option[1] - 1] == ">"]
+            pattern = cls._encode_pattern(text, pos, trie.patterns)
+            if pattern is not None:
+                options.append(pattern)
+        return options
+
+    @staticmethod
+    def _encode_pattern(
+        text: str, pos: int, patterns: Tuple[BytePattern, ...]
+    ) -> Optional[Tuple[bytes, int]]:
+        """Encode a parameterized control code starting at ``pos``.
+
+        Returns:
+            The encoded bytes and the position after the code, or None if no
+            pattern matches
+        """
+        for pattern in patterns:
+            match = pattern.regex.match(text, pos)
+            if match:
+                return pattern.encode_match(match), match.end()
+        return None
 
-        return bytes(result)
+    def freeze(self) -> "EncodingTable":
+        """Make the table read-only so it can be shared.
+
+        The mapping dicts are replaced by read-only views; loading more
+        lines raises TypeError. Mappings served from a compiled table are
+        read-only already.
+
+        Returns:
+            The table itself
+        """
+        for name in TABLE_MAPPINGS:
+            mapping = getattr(self, name)
+            if isinstance(mapping, dict):
+                setattr(self, name, MappingProxyType(dict(mapping)))
+        self.frozen = True
+        return self
+
+    def _check_mutable(self) -> None:
+        if self.frozen:
+            raise TypeError("Shared encoding tables are read-only")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Read-only views and memory maps can't be pickled (process pools
+        # pickle detectors)
+        state = self.__dict__.copy()
+        for name in TABLE_MAPPINGS:
+            state[name] = dict(state[name])
+        state.update(_compiled=None, _decode_cache=None, _encode_cache=None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        if self.frozen:
+            self.freeze()
 
     def get_stats(self) -> Dict[str, int]:
         """Get statistics about the loaded table.
@@ -203,3 +900,39 @@ class EncodingTable:
             "multi_byte_patterns": len(self.multi_byte_patterns),
             "total_mappings": len(self.byte_to_char) + len(self.control_codes),
         }
+
+
+def load_cached_table(table_path: str, compile: bool = True) -> EncodingTable:
+    """Load a .tbl file through the process-wide table cache.
+
+    Tables are cached by resolved path, modification time and size, so an
+    edited file is parsed again while unchanged files are parsed once. The
+    returned table is shared and frozen; copy its mappings before changing
+    them.
+
+    Args:
+        table_path: Path to .tbl file
+        compile: Write the compiled form next to the file on first load
+
+    Returns:
+        Shared read-only EncodingTable
+
+    Raises:
+        FileNotFoundError: If table file doesn't exist
+        ValueError: If table format is invalid
+    """
+    table_file = Path(table_path).resolve()
+    try:
+        stat = table_file.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Table file not found: {table_path}")
+
+    return _load_table(str(table_file), stat.st_mtime_ns, stat.st_size, compile)
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _load_table(
+    table_path: str, mtime_ns: int, size: int, compile: bool = True
+) -> EncodingTable:
+    """Parse and freeze a table; the stat values only form the cache key."""
+    return EncodingTable(table_path, compile=compile).freeze()
@@ -6,19 +6,26 @@ Supports both fixed-location and pointer-table based extraction.
 
 import csv
 import json
-from dataclasses import asdict, dataclass
+import textwrap
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 
 import yaml
 
 try:
     from .detector import TextDetector
-    from .encoding import EncodingTable
+    from .encoding import load_cached_table
+    from .pointer_utils import PointerTable, format_pointer_addresses
+    from .rom_image import RomImage, TerminatorIndex
+    from .string_bank import BankString, StringBank, write_string_bank
 except ImportError:
     # Handle case when run as script
     from detector import TextDetector
-    from encoding import EncodingTable
+    from encoding import load_cached_table
+    from pointer_utils import PointerTable, format_pointer_addresses
+    from rom_image import RomImage, TerminatorIndex
+    from string_bank import BankString, StringBank, write_string_bank
 
 
 @dataclass
@@ -32,6 +39,81 @@ class ExtractedString:
     description: str = ""
     pointer_address: Optional[int] = None
     string_id: Optional[str] = None
+    # Every pointer slot referencing the string (shared targets have several)
+    pointer_addresses: List[int] = field(default_factory=list)
+
+
+# File suffixes TextExtractor.export can write
+EXPORT_FORMATS = (".bank", ".csv", ".json", ".jsonl")
+
+# Columns of the extraction CSV export
+CSV_FIELDS = [
+    "string_id",
+    "address",
+    "length",
+    "original_text",
+    "translated_text",
+    "description",
+    "pointer_address",
+    "pointer_addresses",
+]
+
+
+def string_record(string: ExtractedString) -> Dict[str, Any]:
+    """JSON-serializable record of an extracted string.
+
+    Args:
+        string: Extracted string
+
+    Returns:
+        Its fields, with the original bytes as a hex string
+    """
+    record = asdict(string)
+    record["original_bytes"] = string.original_bytes.hex()
+    return record
+
+
+def bank_string(string: ExtractedString) -> BankString:
+    """String bank entry for an extracted string."""
+    return BankString(
+        string_id=string.string_id,
+        address=string.address,
+        original_bytes=bytes(string.original_bytes),
+        decoded_text=string.decoded_text,
+        description=string.description,
+        pointer_address=string.pointer_address,
+        pointer_addresses=list(string.pointer_addresses),
+    )
+
+
+def iter_string_records(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Read the string records of a string bank, JSON or JSON Lines export.
+
+    String banks and JSON Lines files are read one string at a time, so
+    memory use doesn't grow with the script. A .json export has to be
+    loaded whole.
+
+    Args:
+        path: Path to a .bank, .jsonl or .json export
+
+    Yields:
+        String records, as written by :func:`string_record` (plus any
+        fields added later, such as ``translated_text``)
+    """
+    if Path(path).suffix.lower() == ".bank":
+        with StringBank.open(path) as bank:
+            for string in bank:
+                yield string.to_record()
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        if Path(path).suffix.lower() != ".jsonl":
+            yield from json.load(f).get("strings", [])
+            return
+
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
 
 
 class TextExtractor:
@@ -44,11 +126,13 @@ class TextExtractor:
             config_path: Path to YAML configuration file
         """
         self.config = self._load_config(config_path)
-        self.encoding_table = EncodingTable(
+        self.encoding_table = load_cached_table(
             self.config["text_detection"]["encoding_table"]
         )
         self.detector = TextDetector(self.encoding_table)
+        self.detector.configure(self.config["text_detection"].get("auto_detect", {}))
         self.extracted_strings: List[ExtractedString] = []
+        self._terminators: Optional[TerminatorIndex] = None
 
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file.
@@ -66,38 +150,117 @@ class TextExtractor:
         with open(config_file, "r", encoding="utf-8") as f:
             return yaml.safe_load(f)
 
-    def extract_from_rom(self, rom_path: str) -> List[ExtractedString]:
+    def extract_from_rom(
+        self, rom_path: Union[str, RomImage]
+    ) -> List[ExtractedString]:
         """Extract text from ROM using configured method.
 
         Args:
-            rom_path: Path to ROM file
+            rom_path: Path to ROM file, or an already mapped RomImage
 
         Returns:
             List of extracted strings
         """
-        rom_file = Path(rom_path)
-        if not rom_file.exists():
+        self.extracted_strings = list(self.iter_extract(rom_path))
+        return self.extracted_strings
+
+    def iter_extract(self, rom_path: Union[str, RomImage]) -> Iterator[ExtractedString]:
+        """Extract text from ROM, yielding each string as it is decoded.
+
+        Unlike :meth:`extract_from_rom`, the strings are not kept in
+        ``extracted_strings``.
+
+        Args:
+            rom_path: Path to ROM file, or an already mapped RomImage
+
+        Yields:
+            Extracted strings
+
+        Raises:
+            FileNotFoundError: If the ROM file doesn't exist
+            ValueError: If the extraction method is unknown
+        """
+        if not isinstance(rom_path, RomImage) and not Path(rom_path).exists():
             raise FileNotFoundError(f"ROM file not found: {rom_path}")
 
-        with open(rom_file, "rb") as f:
-            rom_data = f.read()
+        rom = RomImage.load(rom_path)
+        rom_data = rom.data
 
-        # Validate ROM
-        self._validate_rom(rom_data)
+        try:
+            # Validate ROM
+            self._validate_rom(rom_data)
 
-        # Extract based on configured method
-        method = self.config["text_detection"]["method"]
+            # Extract based on configured method
+            method = self.config["text_detection"]["method"]
 
-        if method == "fixed_locations":
-            self.extracted_strings = self._extract_fixed_locations(rom_data)
-        elif method == "pointer_table":
-            self.extracted_strings = self._extract_pointer_table(rom_data)
-        elif method == "auto_detect":
-            self.extracted_strings = self._extract_auto_detect(rom_data)
-        else:
-            raise ValueError(f"Unknown extraction method: {method}")
+            if method == "fixed_locations":
+                yield from self._extract_fixed_locations(rom_data)
+            elif method == "pointer_table":
+                yield from self._extract_pointer_table(rom_data)
+            elif method == "auto_detect":
+                yield from self._extract_auto_detect(rom_data)
+            else:
+                raise ValueError(f"Unknown extraction method: {method}")
+        finally:
+            # Unmap only what this call mapped; a caller's image stays open
+            if rom is not rom_path:
+                rom.close()
 
-        return self.extracted_strings
+    def extract_to_file(self, rom_path: Union[str, RomImage], output_path: str) -> int:
+        """Extract text straight into an export file.
+
+        The format follows the file suffix (.bank, .csv, .json or .jsonl).
+        Except for string banks, strings are written as they are decoded and
+        never held together in memory.
+
+        Args:
+            rom_path: Path to ROM file, or an already mapped RomImage
+            output_path: Path for the export file
+
+        Returns:
+            Number of strings written
+
+        Raises:
+            ValueError: If the suffix is not a supported export format
+        """
+        suffix = Path(output_path).suffix.lower()
+        if suffix not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {suffix}")
+
+        count = 0
+
+        def counted() -> Iterator[ExtractedString]:
+            nonlocal count
+            for string in self.iter_extract(rom_path):
+                count += 1
+                yield string
+
+        self.export(output_path, counted())
+        return count
+
+    def export(
+        self, output_path: str, strings: Optional[Iterable[ExtractedString]] = None
+    ) -> None:
+        """Export strings in the format given by the file suffix.
+
+        Args:
+            output_path: Path for the export file (.bank, .csv, .json or .jsonl)
+            strings: Strings to export (default: ``extracted_strings``)
+
+        Raises:
+            ValueError: If the suffix is not a supported export format
+        """
+        exporters = {
+            ".bank": self.export_to_bank,
+            ".csv": self.export_to_csv,
+            ".json": self.export_to_json,
+            ".jsonl": self.export_to_jsonl,
+        }
+        suffix = Path(output_path).suffix.lower()
+        if suffix not in exporters:
+            raise ValueError(f"Unsupported export format: {suffix}")
+
+        exporters[suffix](output_path, strings)
 
     def _validate_rom(self, rom_data: bytes) -> None:
         """Validate ROM file matches configuration expectations.
@@ -130,16 +293,15 @@ class TextExtractor:
                     f"got {actual_crc:08X}"
                 )
 
-    def _extract_fixed_locations(self, rom_data: bytes) -> List[ExtractedString]:
+    def _extract_fixed_locations(self, rom_data: bytes) -> Iterator[ExtractedString]:
         """Extract text from fixed memory locations.
 
         Args:
             rom_data: ROM file data
 
-        Returns:
-            List of extracted strings
+        Yields:
+            Extracted strings
         """
-        strings = []
         string_configs = self.config["text_detection"].get("strings", [])
 
         for i, string_config in enumerate(string_configs):
@@ -161,65 +323,61 @@ class TextExtractor:
 
             if original_bytes:
                 decoded_text = self.encoding_table.decode_bytes(original_bytes)
-                strings.append(
-                    ExtractedString(
-                        address=address,
-                        original_bytes=original_bytes,
-                        decoded_text=decoded_text,
-                        length=len(original_bytes),
-                        description=description,
-                        string_id=f"string_{i+1:03d}",
-                    )
+                yield ExtractedString(
+                    address=address,
+                    original_bytes=original_bytes,
+                    decoded_text=decoded_text,
+                    length=len(original_bytes),
+                    description=description,
+                    string_id=f"string_{i+1:03d}",
                 )
 
-        return strings
-
-    def _extract_pointer_table(self, rom_data: bytes) -> List[ExtractedString]:
+    def _extract_pointer_table(self, rom_data: bytes) -> Iterator[ExtractedString]:
         """Extract text using pointer table method.
 
         Args:
             rom_data: ROM file data
 
-        Returns:
-            List of extracted strings
+        Yields:
+            Extracted strings, in pointer table order
         """
-        strings = []
-        pointer_config = self.config["text_detection"]["pointer_table"]
+        table = PointerTable.from_config(
+            self.config["text_detection"]["pointer_table"]
+        )
 
-        table_address = pointer_config["address"]
-        pointer_count = pointer_config["count"]
-        pointer_format = pointer_config.get("format", "little_endian_16bit")
-        base_offset = pointer_config.get("base_offset", 0)
+        # Read pointer table (entries past the end of the ROM are dropped)
+        targets = table.targets(rom_data, strict=False)
 
-        # Read pointer table
-        pointers = self._read_pointer_table(
-            rom_data, table_address, pointer_count, pointer_format, base_offset
-        )
+        # Pointers sharing a target get one string that lists all of their
+        # slots, so collect the slots before yielding anything
+        slots: Dict[int, List[int]] = {}
+        for i, target in enumerate(targets):
+            slots.setdefault(target, []).append(table.address + i * table.entry_size)
 
         # Extract strings from each pointer
-        for i, pointer in enumerate(pointers):
-            if pointer >= len(rom_data):
-                print(f"Warning: Pointer {i} (0x{pointer:04X}) is beyond ROM size")
+        for i, target in enumerate(targets):
+            if target >= len(rom_data):
+                print(f"Warning: Pointer {i} (0x{target:04X}) is beyond ROM size")
                 continue
 
-            original_bytes = self._extract_until_terminator(rom_data, pointer)
+            target_slots = slots.pop(target, None)
+            if target_slots is None:
+                continue  # Already extracted for an earlier pointer
+
+            original_bytes = self._extract_until_terminator(rom_data, target)
             if original_bytes:
                 decoded_text = self.encoding_table.decode_bytes(original_bytes)
-                strings.append(
-                    ExtractedString(
-                        address=pointer,
-                        original_bytes=original_bytes,
-                        decoded_text=decoded_text,
-                        length=len(original_bytes),
-                        description=f"Pointer table string {i+1}",
-                        pointer_address=table_address
-                        + (i * 2),  # Assuming 16-bit pointers
-                        string_id=f"ptr_{i+1:03d}",
-                    )
+                yield ExtractedString(
+                    address=target,
+                    original_bytes=original_bytes,
+                    decoded_text=decoded_text,
+                    length=len(original_bytes),
+                    description=f"Pointer table string {i+1}",
+                    pointer_address=target_slots[0],
+                    string_id=f"ptr_{i+1:03d}",
+                    pointer_addresses=target_slots,
                 )
 
-        return strings
-
     def _extract_auto_detect(self, rom_data: bytes) -> List[ExtractedString]:
         """Extract text using automatic detection.
 
@@ -229,7 +387,9 @@ class TextExtractor:
         Returns:
             List of extracted strings
         """
-        candidates = self.detector.detect_text_regions(rom_data)
+        # top_k keeps only the most confident candidates in a bounded heap
+        top_k = self.config["text_detection"].get("auto_detect", {}).get("top_k")
+        candidates = self.detector.detect_text_regions(rom_data, top_k=top_k)
         strings = []
 
         for i, candidate in enumerate(candidates):
@@ -252,51 +412,6 @@ class TextExtractor:
 
         return strings
 
-    def _read_pointer_table(
-        self,
-        rom_data: bytes,
-        address: int,
-        count: int,
-        format_type: str,
-        base_offset: int,
-    ) -> List[int]:
-        """Read pointer table from ROM.
-
-        Args:
-            rom_data: ROM file data
-            address: Pointer table address
-            count: Number of pointers
-            format_type: Pointer format ('little_endian_16bit', etc.)
-            base_offset: Offset to add to each pointer
-
-        Returns:
-            List of pointer addresses
-        """
-        pointers = []
-
-        if format_type == "little_endian_16bit":
-            for i in range(count):
-                ptr_addr = address + (i * 2)
-                if ptr_addr + 1 < len(rom_data):
-                    low = rom_data[ptr_addr]
-                    high = rom_data[ptr_addr + 1]
-                    pointer = (high << 8) | low
-                    pointers.append(pointer + base_offset)
-
-        elif format_type == "big_endian_16bit":
-            for i in range(count):
-                ptr_addr = address + (i * 2)
-                if ptr_addr + 1 < len(rom_data):
-                    high = rom_data[ptr_addr]
-                    low = rom_data[ptr_addr + 1]
-                    pointer = (high << 8) | low
-                    pointers.append(pointer + base_offset)
-
-        else:
-            raise ValueError(f"Unsupported pointer format: {format_type}")
-
-        return pointers
-
     def _extract_until_terminator(self, rom_data: bytes, start_address: int) -> bytes:
         """Extract bytes until a terminator is found.
 
@@ -307,45 +422,47 @@ class TextExtractor:
         Returns:
             Extracted bytes (excluding terminator)
         """
-        # Common terminators
-        terminators = {0x00, 0xFF}
-
-        # Add control code terminators
-        for byte_val, code in self.encoding_table.control_codes.items():
-            if code in ["<END>", "<NULL>"]:
-                terminators.add(byte_val)
+        end = self._terminator_index(rom_data).find(start_address)
+        return rom_data[start_address:end]
 
-        current_pos = start_address
-        while current_pos < len(rom_data):
-            if rom_data[current_pos] in terminators:
-                break
-            current_pos += 1
+    def _terminator_index(self, rom_data: bytes) -> TerminatorIndex:
+        """Terminator positions in ``rom_data``, found once per ROM.
 
-        return rom_data[start_address:current_pos]
+        Args:
+            rom_data: ROM file data
 
-    def export_to_csv(self, output_path: str) -> None:
+        Returns:
+            Index of the <END>/<NULL> bytes, plus 0x00 and 0xFF
+        """
+        index = self._terminators
+        if index is None or index.data is not rom_data:
+            # Common terminators, plus the table's control code terminators
+            terminators = {0x00, 0xFF} | self.encoding_table.terminator_bytes()
+            index = self._terminators = TerminatorIndex(rom_data, terminators)
+        return index
+
+    def export_to_csv(
+        self, output_path: str, strings: Optional[Iterable[ExtractedString]] = None
+    ) -> None:
         """Export extracted strings to CSV file.
 
+        Rows are written as ``strings`` produces them, so an
+        :meth:`iter_extract` generator is never held in memory.
+
         Args:
             output_path: Path for output CSV file
+            strings: Strings to export (default: ``extracted_strings``)
         """
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
+        if strings is None:
+            strings = self.extracted_strings
 
         with open(output_file, "w", newline="", encoding="utf-8") as csvfile:
-            fieldnames = [
-                "string_id",
-                "address",
-                "length",
-                "original_text",
-                "translated_text",
-                "description",
-                "pointer_address",
-            ]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS)
 
             writer.writeheader()
-            for string in self.extracted_strings:
+            for string in strings:
                 writer.writerow(
                     {
                         "string_id": string.string_id,
@@ -359,33 +476,91 @@ class TextExtractor:
                             if string.pointer_address
                             else ""
                         ),
+                        "pointer_addresses": format_pointer_addresses(
+                            string.pointer_addresses
+                        ),
                     }
                 )
 
-    def export_to_json(self, output_path: str) -> None:
+    def export_to_json(
+        self, output_path: str, strings: Optional[Iterable[ExtractedString]] = None
+    ) -> None:
         """Export extracted strings to JSON file.
 
+        The ``strings`` array is written one entry at a time; the file is
+        the same as ``json.dump(..., indent=2)`` of the whole document.
+
         Args:
             output_path: Path for output JSON file
+            strings: Strings to export (default: ``extracted_strings``)
         """
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
+        if strings is None:
+            strings = self.extracted_strings
 
-        # Convert to serializable format
         data = {
             "game_info": self.config.get("game", {}),
             "extraction_method": self.config["text_detection"]["method"],
             "strings": [],
         }
+        # Everything up to the empty strings array, then its entries
+        head = json.dumps(data, indent=2, ensure_ascii=False)[: -len("[]\n}")]
+
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(head + "[")
+            separator = "\n"
+            for string in strings:
+                record = json.dumps(string_record(string), indent=2, ensure_ascii=False)
+                f.write(separator + textwrap.indent(record, "    "))
+                separator = ",\n"
+            f.write("]\n}" if separator == "\n" else "\n  ]\n}")
+
+    def export_to_jsonl(
+        self, output_path: str, strings: Optional[Iterable[ExtractedString]] = None
+    ) -> None:
+        """Export extracted strings to a JSON Lines file.
+
+        Each line is one string record, so the file can be written and read
+        back (see :func:`iter_string_records`) without holding the script in
+        memory.
 
-        for string in self.extracted_strings:
-            string_data = asdict(string)
-            # Convert bytes to hex string for JSON serialization
-            string_data["original_bytes"] = string.original_bytes.hex()
-            data["strings"].append(string_data)
+        Args:
+            output_path: Path for output JSON Lines file
+            strings: Strings to export (default: ``extracted_strings``)
+        """
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        if strings is None:
+            strings = self.extracted_strings
 
         with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            for string in strings:
+                f.write(json.dumps(string_record(string), ensure_ascii=False) + "\n")
+
+    def export_to_bank(
+        self, output_path: str, strings: Optional[Iterable[ExtractedString]] = None
+    ) -> None:
+        """Export extracted strings to a binary string bank.
+
+        Banks are the interchange format between pipeline stages: they are
+        memory-mapped on load and keep the original bytes raw.
+
+        Args:
+            output_path: Path for output bank file
+            strings: Strings to export (default: ``extracted_strings``)
+        """
+        if strings is None:
+            strings = self.extracted_strings
+
+        write_string_bank(
+            output_path,
+            (bank_string(string) for string in strings),
+            metadata={
+                "game_info": self.config.get("game", {}),
+                "extraction_method": self.config["text_detection"]["method"],
+            },
+        )
 
     def get_stats(self) -> Dict[str, Any]:
         """Get extraction statistics.
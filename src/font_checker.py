@@ -13,10 +13,10 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 try:
-    from .encoding import EncodingTable
+    from .encoding import EncodingTable, load_cached_table
     from .chr_analyzer import CHRAnalyzer, CHRAnalysis, CHRType
 except ImportError:
-    from encoding import EncodingTable
+    from encoding import EncodingTable, load_cached_table
     from chr_analyzer import CHRAnalyzer, CHRAnalysis, CHRType
 
 
@@ -181,7 +181,7 @@ class FontChecker:
         if encoding_table:
             self.encoding = encoding_table
         elif table_path:
-            self.encoding = EncodingTable(table_path)
+            self.encoding = load_cached_table(table_path)
         else:
             # Create empty table - will accept any character
             self.encoding = EncodingTable()
@@ -217,6 +217,10 @@ class FontChecker:
                 warnings=["No encoding table loaded - skipping compatibility check"]
             )
         
+        # Every character is in the font: nothing to report
+        if self.available_chars.issuperset(text):
+            return FontCheckResult(text=text, is_compatible=True)
+        
         # Check each character
         for char in text:
             if char not in self.available_chars:
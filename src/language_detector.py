@@ -8,7 +8,12 @@ to improve text extraction accuracy from ROMs.
 import re
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+try:
+    from .rom_image import RomImage, rom_buffer
+except ImportError:
+    from rom_image import RomImage, rom_buffer
 
 
 class Language(Enum):
@@ -164,7 +169,7 @@ class LanguageDetector:
     
     def analyze_byte_patterns(
         self,
-        data: bytes,
+        data: Union[bytes, RomImage],
         encoding_hints: Optional[Dict[int, str]] = None
     ) -> Dict[str, any]:
         """
@@ -173,12 +178,14 @@ class LanguageDetector:
         This is useful for ROMs where we don't yet have an encoding table.
         
         Args:
-            data: Raw byte data to analyze
+            data: Raw byte data (or a mapped RomImage) to analyze
             encoding_hints: Optional byte->char mappings to test
             
         Returns:
             Analysis results with byte frequency and pattern info
         """
+        # A view iterates byte values even over a mapped file
+        data = memoryview(rom_buffer(data))
         if not data:
             return {"error": "empty data"}
         
@@ -20,6 +20,8 @@ try:
     from .font_checker import FontChecker, FontCheckResult
     from .chr_analyzer import CHRAnalyzer, CHRAnalysis
     from .validator import ROMValidator
+    from .pointer_utils import format_pointer_addresses
+    from .string_bank import BankString, StringBank, write_string_bank
 except ImportError:
     from project import ProjectStatus, TranslationProject, TranslationEntry
     from extractor import TextExtractor
@@ -29,6 +31,8 @@ except ImportError:
     from font_checker import FontChecker, FontCheckResult
     from chr_analyzer import CHRAnalyzer, CHRAnalysis
     from validator import ROMValidator
+    from pointer_utils import format_pointer_addresses
+    from string_bank import BankString, StringBank, write_string_bank
 
 
 @dataclass
@@ -178,6 +182,7 @@ class TranslationPipeline:
                     status="pending",
                     max_bytes=len(string.original_bytes),
                     pointer_address=string.pointer_address,
+                    pointer_addresses=list(string.pointer_addresses),
                 )
                 self.project.translations.append(entry)
             
@@ -185,9 +190,11 @@ class TranslationPipeline:
             paths = self.project.get_output_paths()
             self.extractor.export_to_csv(str(paths["extracted_csv"]))
             self.extractor.export_to_json(str(paths["extracted_json"]))
+            self.extractor.export_to_bank(str(paths["extracted_bank"]))
             
             print(f"   ✓ Exported to {paths['extracted_csv'].name}")
             print(f"   ✓ Exported to {paths['extracted_json'].name}")
+            print(f"   ✓ Saved string bank {paths['extracted_bank'].name}")
             
             # Save stats
             stats = self.extractor.get_stats()
@@ -312,8 +319,9 @@ class TranslationPipeline:
             glossary.save(str(glossary_path))
             memory.save(str(memory_path))
             
-            # Export translated CSV
+            # Export translated CSV and the bank the reinjection stage reads
             self._export_translations_csv()
+            self._export_translations_bank()
             
             # Save project state
             self.project.state.translation_progress = self.project.get_translation_stats()
@@ -342,7 +350,8 @@ class TranslationPipeline:
         with open(paths["translated_csv"], "w", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(f, fieldnames=[
                 "string_id", "address", "length", "original_text",
-                "translated_text", "description", "pointer_address", "confidence"
+                "translated_text", "description", "pointer_address",
+                "pointer_addresses", "confidence"
             ])
             writer.writeheader()
             
@@ -355,11 +364,48 @@ class TranslationPipeline:
                     "translated_text": entry.translated_text,
                     "description": entry.notes,
                     "pointer_address": f"0x{entry.pointer_address:04X}" if entry.pointer_address else "",
+                    "pointer_addresses": format_pointer_addresses(entry.pointer_addresses),
                     "confidence": entry.confidence,
                 })
         
         print(f"   ✓ Saved translations to {paths['translated_csv'].name}")
     
+    def _export_translations_bank(self) -> None:
+        """Save translations to a string bank, with the extracted original bytes."""
+        paths = self.project.get_output_paths()
+        if not paths["extracted_bank"].exists():
+            return  # Extracted before banks existed; reinjection reads the CSV
+        
+        with StringBank.open(paths["extracted_bank"]) as extracted:
+            strings = []
+            missing = []
+            for entry in self.project.translations:
+                source = extracted.get(entry.string_id)
+                if source is None:
+                    missing.append(entry.string_id)
+                    continue
+                strings.append(BankString(
+                    string_id=entry.string_id,
+                    address=entry.address,
+                    original_bytes=source.original_bytes,
+                    decoded_text=entry.original_text,
+                    translated_text=entry.translated_text,
+                    description=entry.notes,
+                    pointer_address=entry.pointer_address,
+                    pointer_addresses=list(entry.pointer_addresses),
+                ))
+        
+        if missing:
+            # Without the original bytes the bank would be wrong; drop any
+            # older one so reinjection reads the CSV just written
+            print(f"   ⚠️  {len(missing)} strings are not in "
+                  f"{paths['extracted_bank'].name} (first: {missing[0]}), "
+                  f"skipping the translated bank")
+            paths["translated_bank"].unlink(missing_ok=True)
+            return
+        
+        write_string_bank(paths["translated_bank"], strings)
+    
     def _check_font_compatibility(self) -> int:
         """
         Check translated text for font compatibility and auto-fix issues.
@@ -432,11 +478,19 @@ class TranslationPipeline:
             # Load translations
             paths = self.project.get_output_paths()
             translations_csv = csv_path or str(paths["translated_csv"])
-            
-            if not Path(translations_csv).exists():
-                raise FileNotFoundError(f"Translations CSV not found: {translations_csv}")
-            
-            self.reinjector.load_translations_from_csv(translations_csv)
+            translated_bank = paths["translated_bank"]
+            
+            # The bank is used unless the CSV was edited after it was written
+            if csv_path is None and translated_bank.exists() and (
+                not paths["translated_csv"].exists()
+                or paths["translated_csv"].stat().st_mtime <= translated_bank.stat().st_mtime
+            ):
+                self.reinjector.load_translations_from_bank(str(translated_bank))
+            else:
+                if not Path(translations_csv).exists():
+                    raise FileNotFoundError(f"Translations CSV not found: {translations_csv}")
+                
+                self.reinjector.load_translations_from_csv(translations_csv)
             
             print(f"   ✓ Loaded {len(self.reinjector.translated_strings)} translations")
             
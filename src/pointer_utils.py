@@ -5,7 +5,262 @@ Provides functions for reading, writing, and updating pointer tables.
 """
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy ships with the optional "enhanced" extra
+    np = None
+
+# Pointer table formats. Split tables store every low byte, then every high
+# byte; banked tables pair each 16-bit pointer with a bank number byte.
+POINTER_FORMATS = (
+    "little_endian_16bit",
+    "big_endian_16bit",
+    "little_endian_24bit",
+    "big_endian_24bit",
+    "split_16bit",
+    "banked_16bit",
+)
+
+# A lane is one byte of every entry: (first address, stride, bit shift)
+Lane = Tuple[int, int, int]
+
+
+def format_pointer_addresses(addresses: Iterable[int]) -> str:
+    """Pointer slot addresses as a CSV cell ("0x1234 0x1236")."""
+    return " ".join(f"0x{address:04X}" for address in addresses)
+
+
+def parse_pointer_addresses(text: Optional[str]) -> List[int]:
+    """Inverse of :func:`format_pointer_addresses` (empty cell -> [])."""
+    return [int(address, 16) for address in (text or "").split()]
+
+
+@dataclass(frozen=True)
+class PointerTable:
+    """
+    Layout of a pointer table, read in bulk.
+
+    Every byte position of an entry (low byte, high byte, bank byte) is read
+    for the whole table with one strided slice, so decoding thousands of
+    pointers is a handful of NumPy operations (or list comprehensions without
+    NumPy) instead of a Python call per pointer.
+
+    Example:
+        table = PointerTable.from_config(config["text_detection"]["pointer_table"])
+        pointers = table.read(rom_data)
+    """
+
+    address: int
+    count: int
+    format_type: str = "little_endian_16bit"
+    base_offset: int = 0  # Added to each pointer value
+    # split_16bit: start of the high bytes (default: right after the lows)
+    high_address: Optional[int] = None
+    # banked_16bit: start of a separate bank byte table (default: each
+    # pointer is followed by its bank byte)
+    bank_address: Optional[int] = None
+    bank_size: int = 0x4000  # banked_16bit: bytes per bank
+
+    def __post_init__(self) -> None:
+        if self.format_type not in POINTER_FORMATS:
+            raise ValueError(f"Unsupported pointer format: {self.format_type}")
+        if self.bank_size <= 0:
+            raise ValueError("bank_size must be positive")
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "PointerTable":
+        """Build from a config's ``pointer_table`` block.
+
+        Args:
+            config: Mapping with ``address`` and ``count``, and optionally
+                ``format``, ``base_offset``, ``high_address``,
+                ``bank_address`` and ``bank_size``
+
+        Returns:
+            PointerTable
+        """
+        return cls(
+            address=config["address"],
+            count=config["count"],
+            format_type=config.get("format", "little_endian_16bit"),
+            base_offset=config.get("base_offset", 0),
+            high_address=config.get("high_address"),
+            bank_address=config.get("bank_address"),
+            bank_size=config.get("bank_size", 0x4000),
+        )
+
+    @property
+    def entry_size(self) -> int:
+        """Bytes between consecutive entries in the main table."""
+        if self.format_type == "split_16bit":
+            return 1
+        if self.format_type.endswith("24bit"):
+            return 3
+        if self.format_type == "banked_16bit" and self.bank_address is None:
+            return 3
+        return 2
+
+    def value_lanes(self) -> List[Lane]:
+        """Lanes holding the pointer value bytes."""
+        address, stride = self.address, self.entry_size
+        if self.format_type == "split_16bit":
+            high = self.address + self.count
+            if self.high_address is not None:
+                high = self.high_address
+            return [(address, 1, 0), (high, 1, 8)]
+        if self.format_type.endswith("24bit"):
+            shifts = (0, 8, 16) if self.format_type.startswith("little") else (16, 8, 0)
+        elif self.format_type == "big_endian_16bit":
+            shifts = (8, 0)
+        else:
+            shifts = (0, 8)
+        return [(address + k, stride, shift) for k, shift in enumerate(shifts)]
+
+    def bank_lane(self) -> Optional[Lane]:
+        """Lane holding the bank bytes (banked tables only)."""
+        if self.format_type != "banked_16bit":
+            return None
+        if self.bank_address is not None:
+            return (self.bank_address, 1, 0)
+        return (self.address + 2, 3, 0)
+
+    def fitting_count(self, rom_size: int) -> int:
+        """Number of leading entries whose bytes all lie inside the ROM."""
+        count = self.count
+        lanes = self.value_lanes() + [lane for lane in [self.bank_lane()] if lane]
+        for start, stride, _ in lanes:
+            count = min(count, max(0, (rom_size - 1 - start) // stride + 1))
+        return count
+
+    def read(self, rom_data: bytes, strict: bool = True) -> List["PointerInfo"]:
+        """Read every pointer in the table.
+
+        Args:
+            rom_data: ROM data (any bytes-like object)
+            strict: Raise if the table runs past the end of the ROM;
+                otherwise only the entries that fit are read
+
+        Returns:
+            Pointers in table order
+
+        Raises:
+            ValueError: If ``strict`` and the table runs past the ROM
+        """
+        size = self.entry_size
+        return [
+            PointerInfo(
+                self.address + i * size, target, self.format_type, size, i, self
+            )
+            for i, target in enumerate(self.targets(rom_data, strict))
+        ]
+
+    def targets(self, rom_data: bytes, strict: bool = True) -> List[int]:
+        """ROM addresses of every entry, without building PointerInfo objects.
+
+        Args:
+            rom_data: ROM data (any bytes-like object)
+            strict: Raise if the table runs past the end of the ROM;
+                otherwise only the entries that fit are read
+
+        Returns:
+            Target addresses in table order
+
+        Raises:
+            ValueError: If ``strict`` and the table runs past the ROM
+        """
+        count = self.fitting_count(len(rom_data))
+        if strict and count < self.count:
+            raise ValueError(
+                f"Pointer address 0x{self.address + count * self.entry_size:04X} "
+                "is beyond ROM size"
+            )
+
+        bank_lane = self.bank_lane()
+        if bank_lane is None:
+            return _read_lanes(rom_data, self.value_lanes(), count, self.base_offset)
+
+        values = _read_lanes(rom_data, self.value_lanes(), count)
+        banks = _read_lanes(rom_data, [bank_lane], count)
+        base, bank_size = self.base_offset, self.bank_size
+        return [
+            base + bank * bank_size + value % bank_size
+            for value, bank in zip(values, banks)
+        ]
+
+    def write(self, rom_data: bytearray, pointer: "PointerInfo", target: int) -> None:
+        """Point an entry read from this table at a new ROM address.
+
+        Banked pointers keep the bits above the bank offset (the CPU window
+        the bank is mapped at) and get a new bank number if needed.
+
+        Args:
+            rom_data: ROM data (mutable)
+            pointer: Entry from :meth:`read`
+            target: New target ROM address
+
+        Raises:
+            ValueError: If the target can't be expressed in this format
+        """
+        lanes = self.value_lanes()
+        bank_lane = self.bank_lane()
+        relative = target - self.base_offset
+        value = relative
+        if bank_lane is not None:
+            bank, offset = divmod(relative, self.bank_size)
+            if not 0 <= bank <= 0xFF:
+                raise ValueError(f"Target address 0x{target:04X} is outside bank 0-255")
+            old_value = sum(
+                rom_data[start + pointer.index * stride] << shift
+                for start, stride, shift in lanes
+            )
+            value = old_value - old_value % self.bank_size + offset
+
+        if not 0 <= value < 1 << (8 * len(lanes)):
+            raise ValueError(
+                f"Target address 0x{target:04X} too large for "
+                f"{self.format_type} pointer"
+            )
+
+        for start, stride, shift in lanes:
+            rom_data[start + pointer.index * stride] = (value >> shift) & 0xFF
+        if bank_lane is not None:
+            start, stride, _ = bank_lane
+            rom_data[start + pointer.index * stride] = bank
+
+
+def _read_lanes(
+    rom_data: bytes, lanes: List[Lane], count: int, initial: int = 0
+) -> List[int]:
+    """Combine the bytes of each lane into one value per entry.
+
+    Args:
+        rom_data: ROM data
+        lanes: Lanes of the value bytes
+        count: Number of entries
+        initial: Added to every value
+
+    Returns:
+        One value per entry
+    """
+    if count <= 0:
+        return []
+
+    if np is not None:
+        data = np.frombuffer(rom_data, dtype=np.uint8)
+        values = np.full(count, initial, dtype=np.int64)
+        for start, stride, shift in lanes:
+            column = data[start : start + (count - 1) * stride + 1 : stride]
+            values += column.astype(np.int64) << shift
+        return values.tolist()
+
+    view = memoryview(rom_data)
+    values = [initial] * count
+    for start, stride, shift in lanes:
+        column = view[start : start + (count - 1) * stride + 1 : stride]
+        values = [value + (byte << shift) for value, byte in zip(values, column)]
+    return values
 
 
 @dataclass
@@ -16,6 +271,8 @@ class PointerInfo:
     target_address: int
     format_type: str
     size_bytes: int
+    index: int = 0  # Entry number in its table
+    table: Optional[PointerTable] = None  # Table the pointer was read from
 
 
 class PointerUtils:
@@ -84,6 +341,7 @@ class PointerUtils:
         count: int,
         format_type: str = "little_endian_16bit",
         base_offset: int = 0,
+        **layout: Any,
     ) -> List[PointerInfo]:
         """Read an entire pointer table.
 
@@ -91,40 +349,20 @@ class PointerUtils:
             rom_data: ROM file data
             table_address: Starting address of pointer table
             count: Number of pointers in table
-            format_type: Format of pointers
+            format_type: Format of pointers (one of POINTER_FORMATS)
             base_offset: Offset to add to each pointer value
+            **layout: ``high_address``, ``bank_address`` or ``bank_size``
+                for split and banked tables
 
         Returns:
             List of pointer information
-        """
-        pointers = []
-
-        if format_type == "little_endian_16bit":
-            little_endian = True
-            pointer_size = 2
-        elif format_type == "big_endian_16bit":
-            little_endian = False
-            pointer_size = 2
-        else:
-            raise ValueError(f"Unsupported pointer format: {format_type}")
-
-        for i in range(count):
-            ptr_address = table_address + (i * pointer_size)
-            target = PointerUtils.read_16bit_pointer(
-                rom_data, ptr_address, little_endian
-            )
-            target += base_offset
-
-            pointers.append(
-                PointerInfo(
-                    address=ptr_address,
-                    target_address=target,
-                    format_type=format_type,
-                    size_bytes=pointer_size,
-                )
-            )
 
-        return pointers
+        Raises:
+            ValueError: If the format is unknown or the table runs past the
+                end of the ROM
+        """
+        table = PointerTable(table_address, count, format_type, base_offset, **layout)
+        return table.read(rom_data)
 
     @staticmethod
     def update_pointer_table(
@@ -144,7 +382,9 @@ class PointerUtils:
             if old_target in address_changes:
                 new_target = address_changes[old_target]
 
-                if pointer.format_type in ["little_endian_16bit", "big_endian_16bit"]:
+                if pointer.table is not None:
+                    pointer.table.write(rom_data, pointer, new_target)
+                elif pointer.format_type in ["little_endian_16bit", "big_endian_16bit"]:
                     little_endian = pointer.format_type == "little_endian_16bit"
                     PointerUtils.write_16bit_pointer(
                         rom_data, pointer.address, new_target, little_endian
@@ -265,8 +505,9 @@ class PointerUtils:
 
         Args:
             rom_data: ROM file data (mutable)
-            pointers: List of pointers that reference strings
-            strings_data: New string data to insert
+            pointers: List of pointers that reference strings, one per
+                target (shared targets would be written more than once)
+            strings_data: New string data to insert, in ``pointers`` order
 
         Returns:
             Dictionary mapping old addresses to new addresses
@@ -277,12 +518,11 @@ class PointerUtils:
         address_changes = {}
         current_address = min(p.target_address for p in pointers)
 
-        # Sort pointers by target address to maintain order
-        sorted_pointers = sorted(pointers, key=lambda p: p.target_address)
+        # Sort pointers (with their data) by target address to maintain order
+        entries = sorted(zip(pointers, strings_data), key=lambda e: e[0].target_address)
 
-        for i, pointer in enumerate(sorted_pointers):
+        for pointer, new_data in entries:
             old_address = pointer.target_address
-            new_data = strings_data[i]
 
             # Update mapping
             address_changes[old_address] = current_address
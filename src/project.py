@@ -43,6 +43,7 @@ class TranslationEntry:
     notes: str = ""
     max_bytes: int = 0
     pointer_address: Optional[int] = None
+    pointer_addresses: List[int] = field(default_factory=list)  # Shared strings
 
 
 @dataclass 
@@ -298,6 +299,8 @@ class TranslationProject:
                     "confidence_threshold": 0.5,
                     "entropy_min": 2.0,
                     "entropy_max": 6.0,
+                    "entropy_window_size": 32,
+                    "entropy_step_size": 16,
                     "common_char_threshold": 0.3,
                 },
             },
@@ -324,7 +327,9 @@ class TranslationProject:
         return {
             "extracted_csv": self.output_dir / f"{base_name}_extracted.csv",
             "extracted_json": self.output_dir / f"{base_name}_extracted.json",
+            "extracted_bank": self.output_dir / f"{base_name}_extracted.bank",
             "translated_csv": self.output_dir / f"{base_name}_translated.csv",
+            "translated_bank": self.output_dir / f"{base_name}_translated.bank",
             "translated_rom": self.output_dir / f"{base_name}_translated.nes",
             "patch_ips": self.output_dir / f"{base_name}_translation.ips",
             "validation_report": self.output_dir / f"{base_name}_validation_report.txt",
@@ -5,18 +5,33 @@ Handles the complex process of putting translated text back into ROMs.
 """
 
 import csv
-import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 try:
-    from .encoding import EncodingTable
-    from .pointer_utils import PointerInfo, PointerUtils
+    from .encoding import load_cached_table
+    from .extractor import iter_string_records
+    from .pointer_utils import (
+        PointerInfo,
+        PointerTable,
+        PointerUtils,
+        parse_pointer_addresses,
+    )
+    from .rom_image import RomImage, TerminatorIndex
+    from .string_bank import StringBank
     from .validator import ROMValidator
 except ImportError:
-    from encoding import EncodingTable
-    from pointer_utils import PointerInfo, PointerUtils
+    from encoding import load_cached_table
+    from extractor import iter_string_records
+    from pointer_utils import (
+        PointerInfo,
+        PointerTable,
+        PointerUtils,
+        parse_pointer_addresses,
+    )
+    from rom_image import RomImage, TerminatorIndex
+    from string_bank import StringBank
     from validator import ROMValidator
 
 
@@ -32,6 +47,8 @@ class TranslatedString:
     translated_bytes: bytes
     pointer_address: Optional[int] = None
     description: str = ""
+    # Every pointer slot referencing the string (shared targets have several)
+    pointer_addresses: List[int] = field(default_factory=list)
 
 
 class TextReinjector:
@@ -52,7 +69,7 @@ class TextReinjector:
         with open(config_file, "r", encoding="utf-8") as f:
             self.config = yaml.safe_load(f)
 
-        self.encoding_table = EncodingTable(
+        self.encoding_table = load_cached_table(
             self.config["text_detection"]["encoding_table"]
         )
         self.validator = ROMValidator(self.config)
@@ -69,6 +86,7 @@ class TextReinjector:
             raise FileNotFoundError(f"Translation CSV not found: {csv_path}")
 
         self.translated_strings = []
+        pending = []
 
         with open(csv_file, "r", encoding="utf-8") as f:
             reader = csv.DictReader(f)
@@ -91,47 +109,58 @@ class TextReinjector:
                     if row.get("pointer_address") and row["pointer_address"].strip():
                         ptr_str = row["pointer_address"].replace("0x", "")
                         pointer_address = int(ptr_str, 16)
-
-                    # Encode original and translated text
-                    original_bytes = self.encoding_table.encode_string(
-                        row["original_text"]
-                    )
-                    translated_bytes = self.encoding_table.encode_string(
-                        row["translated_text"]
+                    pointer_addresses = parse_pointer_addresses(
+                        row.get("pointer_addresses")
                     )
 
-                    self.translated_strings.append(
+                    pending.append(
                         TranslatedString(
                             string_id=row["string_id"],
                             address=address,
                             original_text=row["original_text"],
                             translated_text=row["translated_text"],
-                            original_bytes=original_bytes,
-                            translated_bytes=translated_bytes,
+                            original_bytes=b"",
+                            translated_bytes=b"",
                             pointer_address=pointer_address,
                             description=row.get("description", ""),
+                            pointer_addresses=pointer_addresses,
                         )
                     )
 
                 except Exception as e:
                     print(f"Warning: Skipping row {row.get('string_id', '?')}: {e}")
 
+        # Encode original and translated text for the whole script at once
+        originals = self.encoding_table.encode_batch(s.original_text for s in pending)
+        translations = self.encoding_table.encode_batch(
+            s.translated_text for s in pending
+        )
+        for string, original, translated in zip(pending, originals, translations):
+            error = original.error or translated.error
+            if error:
+                print(f"Warning: Skipping row {string.string_id}: {error}")
+                continue
+
+            string.original_bytes = original.data
+            string.translated_bytes = translated.data
+            self.translated_strings.append(string)
+
     def load_translations_from_json(self, json_path: str) -> None:
-        """Load translated strings from JSON file.
+        """Load translated strings from JSON or JSON Lines file.
+
+        A .jsonl file is read one record at a time.
 
         Args:
-            json_path: Path to JSON file with translations
+            json_path: Path to JSON (or .jsonl) file with translations
         """
         json_file = Path(json_path)
         if not json_file.exists():
             raise FileNotFoundError(f"Translation JSON not found: {json_path}")
 
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
         self.translated_strings = []
+        pending = []
 
-        for string_data in data.get("strings", []):
+        for string_data in iter_string_records(json_file):
             # Skip if no translation provided
             if "translated_text" not in string_data:
                 continue
@@ -139,20 +168,18 @@ class TextReinjector:
             try:
                 # Convert hex string back to bytes
                 original_bytes = bytes.fromhex(string_data["original_bytes"])
-                translated_bytes = self.encoding_table.encode_string(
-                    string_data["translated_text"]
-                )
 
-                self.translated_strings.append(
+                pending.append(
                     TranslatedString(
                         string_id=string_data["string_id"],
                         address=string_data["address"],
                         original_text=string_data["decoded_text"],
                         translated_text=string_data["translated_text"],
                         original_bytes=original_bytes,
-                        translated_bytes=translated_bytes,
+                        translated_bytes=b"",
                         pointer_address=string_data.get("pointer_address"),
                         description=string_data.get("description", ""),
+                        pointer_addresses=string_data.get("pointer_addresses", []),
                     )
                 )
 
@@ -161,6 +188,66 @@ class TextReinjector:
                     f"Warning: Skipping string {string_data.get('string_id', '?')}: {e}"
                 )
 
+        translations = self.encoding_table.encode_batch(
+            string.translated_text for string in pending
+        )
+        for string, translated in zip(pending, translations):
+            if not translated.ok:
+                error = translated.error
+                print(f"Warning: Skipping string {string.string_id}: {error}")
+                continue
+
+            string.translated_bytes = translated.data
+            self.translated_strings.append(string)
+
+    def load_translations_from_bank(self, bank_path: str) -> None:
+        """Load translated strings from a string bank.
+
+        Original bytes come straight from the bank. Translations already
+        stored encoded are used as is; the rest are encoded here.
+
+        Args:
+            bank_path: Path to string bank with translations
+        """
+        bank_file = Path(bank_path)
+        if not bank_file.exists():
+            raise FileNotFoundError(f"String bank not found: {bank_path}")
+
+        with StringBank.open(bank_file) as bank:
+            strings = [
+                TranslatedString(
+                    string_id=string.string_id,
+                    address=string.address,
+                    original_text=string.decoded_text,
+                    translated_text=string.translated_text,
+                    original_bytes=string.original_bytes,
+                    translated_bytes=string.translated_bytes,
+                    pointer_address=string.pointer_address,
+                    description=string.description,
+                    pointer_addresses=string.pointer_addresses,
+                )
+                for string in bank
+                if string.translated_text.strip()
+            ]
+
+        # Encode only the translations the bank doesn't hold encoded
+        translations = iter(
+            self.encoding_table.encode_batch(
+                s.translated_text for s in strings if not s.translated_bytes
+            )
+        )
+
+        self.translated_strings = []
+        for string in strings:
+            if not string.translated_bytes:
+                translated = next(translations)
+                if not translated.ok:
+                    error = translated.error
+                    print(f"Warning: Skipping string {string.string_id}: {error}")
+                    continue
+                string.translated_bytes = translated.data
+            self.translated_strings.append(string)
+
     def reinject_into_rom(
         self, input_rom_path: str, output_rom_path: str
     ) -> Dict[str, Any]:
@@ -178,36 +265,39 @@ class TextReinjector:
         if not input_file.exists():
             raise FileNotFoundError(f"Input ROM not found: {input_rom_path}")
 
-        with open(input_file, "rb") as f:
-            original_data = f.read()
+        # Unmapped before writing, since the output may be the input file
+        with RomImage.open(input_file) as rom:
+            original_data = rom.data
 
-        # Create mutable copy
-        modified_data = bytearray(original_data)
+            # Create mutable copy (the only copy of the ROM that is made)
+            modified_data = bytearray(original_data)
 
-        # Validate original ROM
-        validation_results = self.validator.validate_original_rom(original_data)
+            # Validate original ROM
+            validation_results = self.validator.validate_original_rom(original_data)
 
-        # Perform reinsertion
-        reinsertion_method = self.config["text_detection"]["method"]
+            # Perform reinsertion
+            reinsertion_method = self.config["text_detection"]["method"]
 
-        if reinsertion_method == "fixed_locations":
-            results = self._reinject_fixed_locations(modified_data)
-        elif reinsertion_method == "pointer_table":
-            results = self._reinject_pointer_table(modified_data)
-        else:
-            raise ValueError(f"Unsupported reinsertion method: {reinsertion_method}")
+            if reinsertion_method == "fixed_locations":
+                results = self._reinject_fixed_locations(modified_data)
+            elif reinsertion_method == "pointer_table":
+                results = self._reinject_pointer_table(modified_data)
+            else:
+                raise ValueError(
+                    f"Unsupported reinsertion method: {reinsertion_method}"
+                )
 
-        # Validate modified ROM
-        changed_regions = [
-            (s.address, s.address + len(s.translated_bytes))
-            for s in self.translated_strings
-        ]
+            # Validate modified ROM
+            changed_regions = [
+                (s.address, s.address + len(s.translated_bytes))
+                for s in self.translated_strings
+            ]
 
-        validation_results.extend(
-            self.validator.validate_modified_rom(
-                original_data, bytes(modified_data), changed_regions
+            validation_results.extend(
+                self.validator.validate_modified_rom(
+                    original_data, modified_data, changed_regions
+                )
             )
-        )
 
         # Write output ROM
         output_file = Path(output_rom_path)
@@ -243,6 +333,12 @@ class TextReinjector:
         for string in self.translated_strings:
             try:
                 # Check if translated text fits in original space
+                if len(string.translated_bytes) > len(string.original_bytes):
+                    # The shortest encoding may fit where greedy matching doesn't
+                    string.translated_bytes = self.encoding_table.encode_optimal(
+                        string.translated_text
+                    )
+
                 if len(string.translated_bytes) > len(string.original_bytes):
                     # Try to find space or truncate
                     if self._can_expand_string(rom_data, string):
@@ -253,7 +349,7 @@ class TextReinjector:
                         truncated_text = self._truncate_translation(
                             string.translated_text, max_length
                         )
-                        string.translated_bytes = self.encoding_table.encode_string(
+                        string.translated_bytes = self.encoding_table.encode_optimal(
                             truncated_text
                         )
                         results["issues"].append(
@@ -267,13 +363,8 @@ class TextReinjector:
                 # Add terminator if there's space
                 if end_addr < len(rom_data):
                     # Find appropriate terminator
-                    terminator = 0xFF  # Default
-                    for byte_val, code in self.encoding_table.control_codes.items():
-                        if code == "<END>":
-                            terminator = byte_val
-                            break
-
-                    rom_data[end_addr] = terminator
+                    terminator = self.encoding_table.control_code_byte("<END>")
+                    rom_data[end_addr] = 0xFF if terminator is None else terminator
 
                 results["successful"] += 1
 
@@ -300,24 +391,26 @@ class TextReinjector:
             "pointers_updated": 0,
         }
 
-        # Read pointer configuration
-        pointer_config = self.config["text_detection"]["pointer_table"]
-
         # Read existing pointer table
-        pointers = PointerUtils.read_pointer_table(
-            bytes(rom_data),
-            pointer_config["address"],
-            pointer_config["count"],
-            pointer_config.get("format", "little_endian_16bit"),
-            pointer_config.get("base_offset", 0),
+        table = PointerTable.from_config(
+            self.config["text_detection"]["pointer_table"]
         )
+        pointers = table.read(rom_data)
 
         # Group strings by their current addresses
         strings_by_address = {s.address: s for s in self.translated_strings}
 
+        # Shared targets are written once; every pointer to them is updated
+        targets: Dict[int, PointerInfo] = {}
+        for pointer in pointers:
+            targets.setdefault(pointer.target_address, pointer)
+
         # Prepare new string data
+        terminators = TerminatorIndex(
+            rom_data, self.encoding_table.terminator_bytes()
+        )
         new_strings_data = []
-        for pointer in pointers:
+        for pointer in targets.values():
             if pointer.target_address in strings_by_address:
                 string = strings_by_address[pointer.target_address]
                 # Add terminator to string data
@@ -326,21 +419,23 @@ class TextReinjector:
             else:
                 # Extract original string data
                 original_data = self._extract_original_string(
-                    rom_data, pointer.target_address
+                    rom_data, pointer.target_address, terminators
                 )
                 new_strings_data.append(original_data)
 
         try:
             # Compact strings and get address mapping
             address_mapping = PointerUtils.compact_pointer_targets(
-                rom_data, pointers, new_strings_data
+                rom_data, list(targets.values()), new_strings_data
             )
 
             # Update pointer table
             PointerUtils.update_pointer_table(rom_data, pointers, address_mapping)
 
             results["successful"] = len([s for s in self.translated_strings])
-            results["pointers_updated"] = len(address_mapping)
+            results["pointers_updated"] = sum(
+                1 for p in pointers if p.target_address in address_mapping
+            )
 
         except Exception as e:
             results["failed"] = len(self.translated_strings)
@@ -396,45 +491,34 @@ class TextReinjector:
         Returns:
             Truncated text that fits within limit
         """
-        # Try progressively shorter versions
-        for length in range(len(text), 0, -1):
-            truncated = text[:length]
-            try:
-                encoded = self.encoding_table.encode_string(truncated)
-                if len(encoded) <= max_bytes:
-                    return truncated
-            except:
-                continue
-
-        return ""  # Fallback to empty string
+        # One shortest-encoding pass gives the size of every prefix
+        truncated, _ = self.encoding_table.truncate_optimal(text, max_bytes)
+        return truncated
 
-    def _extract_original_string(self, rom_data: bytearray, address: int) -> bytes:
+    def _extract_original_string(
+        self,
+        rom_data: bytearray,
+        address: int,
+        terminators: Optional[TerminatorIndex] = None,
+    ) -> bytes:
         """Extract original string data from ROM.
 
         Args:
             rom_data: ROM data
             address: Starting address
+            terminators: Index of the table's <END>/<NULL> bytes in
+                ``rom_data``; built on the fly when not given
 
         Returns:
-            Original string bytes including terminator
+            Original string bytes including terminator (the rest of the data
+            if there is no terminator)
         """
-        current_pos = address
-        while current_pos < len(rom_data):
-            byte_val = rom_data[current_pos]
-            # Check for common terminators
-            if (
-                byte_val in [0x00, 0xFF]
-                or byte_val in self.encoding_table.control_codes
-            ):
-                if self.encoding_table.control_codes.get(byte_val) in [
-                    "<END>",
-                    "<NULL>",
-                ]:
-                    return rom_data[address : current_pos + 1]
-            current_pos += 1
-
-        # No terminator found, return rest of data
-        return rom_data[address:]
+        if terminators is None:
+            terminators = TerminatorIndex(
+                rom_data, self.encoding_table.terminator_bytes()
+            )
+        end = terminators.find(address)
+        return rom_data[address : end + 1]
 
     def generate_patch(
         self,
@@ -466,12 +550,32 @@ class TextReinjector:
             modified_path: Path to modified ROM
             patch_path: Path for IPS patch file
         """
-        with open(original_path, "rb") as f:
-            original_data = f.read()
+        with RomImage.open(original_path) as original, RomImage.open(
+            modified_path
+        ) as modified:
+            patch_data = self._diff_ips(original.view, modified.view)
+
+        # Write patch file
+        patch_file = Path(patch_path)
+        patch_file.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(modified_path, "rb") as f:
-            modified_data = f.read()
+        with open(patch_file, "wb") as f:
+            f.write(patch_data)
+
+    @staticmethod
+    def _diff_ips(original_data: memoryview, modified_data: memoryview) -> bytes:
+        """Build an IPS patch from two ROM images.
+
+        Args:
+            original_data: Original ROM
+            modified_data: Modified ROM
+
+        Returns:
+            IPS patch data
 
+        Raises:
+            ValueError: If the ROMs differ in size
+        """
         if len(original_data) != len(modified_data):
             raise ValueError("ROM files must be same size for IPS patch")
 
@@ -499,13 +603,7 @@ class TextReinjector:
                 i += 1
 
         patch_data.extend(b"EOF")  # IPS footer
-
-        # Write patch file
-        patch_file = Path(patch_path)
-        patch_file.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(patch_file, "wb") as f:
-            f.write(patch_data)
+        return bytes(patch_data)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get reinsertion statistics.
@@ -537,5 +635,8 @@ class TextReinjector:
             "strings_with_pointers": sum(
                 1 for s in self.translated_strings if s.pointer_address
             ),
+            "shared_strings": sum(
+                1 for s in self.translated_strings if len(s.pointer_addresses) > 1
+            ),
             "encoding_table_stats": self.encoding_table.get_stats(),
         }
@@ -0,0 +1,240 @@
+"""
+Relative search - discover custom encodings from a known word.
+
+NES games rarely store text as ASCII, but most keep letters (or kana) in
+order: if "A" is byte 0x0A then "B" is 0x0B. Searching for the *differences*
+between a known word's letters finds the word no matter where the alphabet
+starts, and each hit pins down a full alphabet that can be handed to
+TableBuilder.create_table.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from .rom_image import RomImage
+except ImportError:
+    from rom_image import RomImage
+
+try:
+    import numpy as np
+except ImportError:  # numpy ships with the optional "enhanced" extra
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Character orderings a game's font may follow. Kana orderings are written in
+# hiragana; katakana words are matched against the same order.
+ORDERINGS: Dict[str, str] = {
+    "alphabet": "ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    "gojuon": (
+        "あいうえおかきくけこさしすせそたちつてとなにぬねの"
+        "はひふへほまみむめもやゆよらりるれろわをん"
+    ),
+    "iroha": (
+        "いろはにほへとちりぬるをわかよたれそつねならむ"
+        "うゐのおくやまけふこえてあさきゆめみしゑひもせすん"
+    ),
+}
+
+# Offset between a katakana character and its hiragana counterpart
+KATAKANA_OFFSET = 0x60
+
+
+@dataclass
+class RelativeSearchHit:
+    """A ROM offset where a word's letter deltas match."""
+
+    offset: int  # ROM offset of the word's first byte
+    base: int  # Byte value of the ordering's first character (may be < 0)
+    mappings: Dict[int, str] = field(default_factory=dict)  # byte -> char
+
+
+class RelativeSearch:
+    """
+    Finds a known word in ROM data by the deltas between its letters.
+
+    Example:
+        search = RelativeSearch("alphabet")
+        hits = search.search(rom_data, "ZELDA")
+        TableBuilder().create_table("zelda", hits[0].mappings)
+    """
+
+    def __init__(self, ordering: str = "alphabet"):
+        """Initialize relative search.
+
+        Args:
+            ordering: Name of the character ordering (see ORDERINGS)
+
+        Raises:
+            ValueError: If the ordering is unknown
+        """
+        if ordering not in ORDERINGS:
+            raise ValueError(f"Unknown ordering: {ordering}")
+
+        self.ordering = ordering
+        self.sequence = ORDERINGS[ordering]
+        self._index = {char: i for i, char in enumerate(self.sequence)}
+
+    def search(self, rom_data: bytes, word: str) -> List[RelativeSearchHit]:
+        """Find every offset whose byte deltas match the word's letter deltas.
+
+        Args:
+            rom_data: Data to search
+            word: Known word, at least two characters from the ordering
+
+        Returns:
+            Hits sorted by offset, each with its proposed table mappings
+
+        Raises:
+            ValueError: If the word is too short or has characters outside
+                the ordering
+        """
+        positions = self._positions(word)
+
+        if np is not None:
+            offsets = self._find_offsets_np(rom_data, positions)
+        else:
+            offsets = self._find_offsets(rom_data, positions)
+
+        mappings_by_base: Dict[int, Dict[int, str]] = {}
+        hits = []
+        for offset in offsets:
+            base = rom_data[offset] - positions[0]
+            if base not in mappings_by_base:
+                mappings_by_base[base] = self.propose_mappings(base, word)
+            hits.append(RelativeSearchHit(offset, base, mappings_by_base[base]))
+
+        logger.debug(f"Relative search for {word!r} found {len(hits)} hits")
+        return hits
+
+    def search_rom(self, rom_path: str, word: str) -> List[RelativeSearchHit]:
+        """Search the PRG ROM of an iNES file (or all of a headerless file).
+
+        Args:
+            rom_path: Path to ROM file
+            word: Known word
+
+        Returns:
+            Hits with file offsets, sorted by offset
+
+        Raises:
+            FileNotFoundError: If the ROM file doesn't exist
+        """
+        rom_file = Path(rom_path)
+        if not rom_file.exists():
+            raise FileNotFoundError(f"ROM file not found: {rom_path}")
+
+        with RomImage.open(rom_file) as rom:
+            start = rom.header.prg_start if rom.header else 0
+            prg = rom.prg
+            try:
+                hits = self.search(prg, word)
+            finally:
+                prg.release()
+
+        for hit in hits:
+            hit.offset += start
+        return hits
+
+    def propose_mappings(self, base: int, word: str = "") -> Dict[int, str]:
+        """Table mappings implied by the ordering starting at ``base``.
+
+        Args:
+            base: Byte value of the ordering's first character
+            word: The searched word; its case (or kana script) is used for
+                the proposed characters
+
+        Returns:
+            Dict of byte_value -> character for every in-range character
+        """
+        sequence = self.sequence
+        if self.ordering == "alphabet" and word.islower():
+            sequence = sequence.lower()
+        elif word and any(self._is_katakana(char) for char in word):
+            sequence = "".join(chr(ord(char) + KATAKANA_OFFSET) for char in sequence)
+
+        return {
+            base + i: char
+            for i, char in enumerate(sequence)
+            if 0 <= base + i <= 0xFF
+        }
+
+    def _positions(self, word: str) -> List[int]:
+        """Ordering index of every character of the word."""
+        if len(word) < 2:
+            raise ValueError("Relative search needs a word of at least 2 characters")
+
+        positions = []
+        for char in word:
+            key = self._normalize(char)
+            if key not in self._index:
+                raise ValueError(
+                    f"Character {char!r} is not in the {self.ordering} ordering"
+                )
+            positions.append(self._index[key])
+        return positions
+
+    def _normalize(self, char: str) -> str:
+        """Fold case and katakana onto the ordering's characters."""
+        if self.ordering == "alphabet":
+            return char.upper()
+        if self._is_katakana(char):
+            return chr(ord(char) - KATAKANA_OFFSET)
+        return char
+
+    @staticmethod
+    def _is_katakana(char: str) -> bool:
+        return "ァ" <= char <= "ヶ"
+
+    def _find_offsets(self, rom_data: bytes, positions: List[int]) -> List[int]:
+        """Pure-Python search: look for the word at every possible base."""
+        if isinstance(rom_data, memoryview):
+            rom_data = rom_data.tobytes()  # Views have no find()
+
+        offsets = []
+        for base in range(-min(positions), 0x100 - max(positions)):
+            pattern = bytes(base + position for position in positions)
+            offset = rom_data.find(pattern)
+            while offset != -1:
+                offsets.append(offset)
+                offset = rom_data.find(pattern, offset + 1)
+        return sorted(offsets)
+
+    def _find_offsets_np(self, rom_data: bytes, positions: List[int]) -> List[int]:
+        """Vectorized search: compare the ROM's byte deltas to the word's."""
+        count = len(rom_data) - len(positions) + 1
+        if count <= 0:
+            return []
+
+        diffs = np.diff(np.frombuffer(rom_data, dtype=np.uint8).astype(np.int16))
+        matches = np.ones(count, dtype=bool)
+        for k in range(len(positions) - 1):
+            matches &= diffs[k : k + count] == positions[k + 1] - positions[k]
+
+        return np.flatnonzero(matches).tolist()
+
+
+def group_hits_by_base(
+    hits: List[RelativeSearchHit], limit: Optional[int] = None
+) -> List[List[RelativeSearchHit]]:
+    """Group hits that imply the same table, most frequent first.
+
+    A base that matches the word in several places is far more likely to be
+    the real encoding than a one-off coincidence.
+
+    Args:
+        hits: Hits from RelativeSearch.search
+        limit: Maximum number of groups to return
+
+    Returns:
+        Lists of hits sharing a base, ordered by hit count (then base)
+    """
+    groups: Dict[int, List[RelativeSearchHit]] = {}
+    for hit in hits:
+        groups.setdefault(hit.base, []).append(hit)
+
+    ranked = sorted(groups.values(), key=lambda group: (-len(group), group[0].base))
+    return ranked[:limit] if limit is not None else ranked
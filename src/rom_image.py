@@ -0,0 +1,306 @@
+"""
+Memory-mapped ROM images.
+
+Every reader used to load the whole ROM into a fresh bytes object and then
+copy slices of it again. A RomImage maps the file once and hands out views:
+``data`` behaves like the ROM's bytes (indexing, slicing, find, the buffer
+protocol) without reading the file up front, and ``prg``, ``chr`` and
+``bank()`` are zero-copy memoryviews of the iNES sections.
+"""
+
+import mmap
+import re
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import FrozenSet, Iterable, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy ships with the optional "enhanced" extra
+    np = None
+
+# iNES header constants
+INES_HEADER_SIZE = 16
+INES_MAGIC = b"NES\x1a"
+TRAINER_SIZE = 512
+PRG_ROM_UNIT = 16384  # 16KB per PRG ROM unit
+CHR_ROM_UNIT = 8192  # 8KB per CHR ROM unit
+
+# Famicom Disk System images, with or without the fwNES header
+FDS_MAGIC = b"FDS\x1a"
+FDS_DISK_MAGIC = b"\x01*NINTENDO-HVC*"
+FDS_SIDE_SIZE = 65500
+
+
+@dataclass(frozen=True)
+class INESHeader:
+    """Fields of an iNES header."""
+
+    prg_size: int  # Bytes of PRG ROM
+    chr_size: int  # Bytes of CHR ROM (0 for CHR RAM)
+    mapper: int
+    has_trainer: bool
+
+    @property
+    def prg_start(self) -> int:
+        return INES_HEADER_SIZE + (TRAINER_SIZE if self.has_trainer else 0)
+
+    @property
+    def chr_start(self) -> int:
+        return self.prg_start + self.prg_size
+
+
+def parse_ines_header(data) -> Optional[INESHeader]:
+    """Parse the iNES header at the start of ROM data.
+
+    Args:
+        data: ROM data (any bytes-like object)
+
+    Returns:
+        INESHeader, or None if the data doesn't start with one
+    """
+    if len(data) < INES_HEADER_SIZE or bytes(data[:4]) != INES_MAGIC:
+        return None
+
+    flags6 = data[6]
+    flags7 = data[7]
+    return INESHeader(
+        prg_size=data[4] * PRG_ROM_UNIT,
+        chr_size=data[5] * CHR_ROM_UNIT,
+        mapper=(flags7 & 0xF0) | (flags6 >> 4),
+        has_trainer=bool(flags6 & 0x04),
+    )
+
+
+class RomImage:
+    """
+    A ROM file mapped into memory.
+
+    ``data`` is the mapped file: indexing gives ints, slicing copies just the
+    slice, and it can be passed anywhere a bytes-like buffer is accepted
+    (numpy, zlib, memoryview). Iterating it yields 1-byte strings, so use
+    ``view`` to loop over byte values.
+
+    Example:
+        rom = RomImage.open("roms/game.nes")
+        font = rom.chr[0x1000:0x2000]  # No copy
+        bank = rom.bank(3)
+    """
+
+    def __init__(self, data: Union[bytes, bytearray, "mmap.mmap"], path=None):
+        """Wrap ROM data already in memory.
+
+        Args:
+            data: ROM contents
+            path: File the data came from, if any
+        """
+        self.data = data
+        self.path = Path(path) if path is not None else None
+        self.view = memoryview(data)
+        self.header = parse_ines_header(data)
+
+    @classmethod
+    def open(cls, rom_path: Union[str, Path]) -> "RomImage":
+        """Map a ROM file read-only.
+
+        Args:
+            rom_path: Path to the ROM file
+
+        Returns:
+            RomImage backed by the file
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        rom_file = Path(rom_path)
+        if not rom_file.exists():
+            raise FileNotFoundError(f"ROM not found: {rom_path}")
+
+        with open(rom_file, "rb") as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped
+                data = f.read()
+        return cls(data, rom_file)
+
+    @classmethod
+    def load(
+        cls, rom: Union["RomImage", str, Path, bytes, bytearray]
+    ) -> "RomImage":
+        """RomImage for a path, ROM data or an existing image.
+
+        Args:
+            rom: Path to map, data to wrap, or a RomImage (returned as is)
+
+        Returns:
+            RomImage
+        """
+        if isinstance(rom, RomImage):
+            return rom
+        if isinstance(rom, (bytes, bytearray)):
+            return cls(rom)
+        return cls.open(rom)
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    def __enter__(self) -> "RomImage":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file.
+
+        Views handed out earlier (``prg``, ``chr``, ``bank()``) must be
+        released first.
+        """
+        self.view.release()
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    @property
+    def format(self) -> str:
+        """Image format: "ines", "fds" or "raw"."""
+        if self.header is not None:
+            return "ines"
+        if bytes(self.view[:4]) == FDS_MAGIC:
+            return "fds"
+        if bytes(self.view[: len(FDS_DISK_MAGIC)]) == FDS_DISK_MAGIC:
+            return "fds"
+        return "raw"
+
+    @property
+    def prg(self) -> memoryview:
+        """PRG ROM (the whole image when there is no iNES header)."""
+        if self.header is None:
+            return self.view
+        start = self.header.prg_start
+        return self.view[start : start + self.header.prg_size]
+
+    @property
+    def chr(self) -> memoryview:
+        """CHR ROM; empty for CHR RAM, headerless or truncated images."""
+        if self.header is None or not self.header.chr_size:
+            return self.view[0:0]
+        start = self.header.chr_start
+        end = start + self.header.chr_size
+        if end > len(self.view):
+            return self.view[0:0]
+        return self.view[start:end]
+
+    def bank(self, index: int, bank_size: int = PRG_ROM_UNIT) -> memoryview:
+        """One PRG bank.
+
+        Args:
+            index: Bank number
+            bank_size: Bank size in bytes (16KB by default)
+
+        Returns:
+            View of the bank (shorter if the PRG ROM ends inside it)
+
+        Raises:
+            IndexError: If the bank lies outside the PRG ROM
+        """
+        prg = self.prg
+        if index < 0 or index * bank_size >= len(prg):
+            raise IndexError(f"Bank {index} is outside the PRG ROM")
+        return prg[index * bank_size : (index + 1) * bank_size]
+
+    def bank_count(self, bank_size: int = PRG_ROM_UNIT) -> int:
+        """Number of PRG banks of ``bank_size`` bytes."""
+        return -(-len(self.prg) // bank_size)
+
+    def disk_sides(self) -> int:
+        """Number of FDS disk sides (0 for other formats)."""
+        if self.format != "fds":
+            return 0
+        return (len(self.view) - self._disk_start()) // FDS_SIDE_SIZE
+
+    def disk_side(self, index: int) -> memoryview:
+        """One FDS disk side.
+
+        Raises:
+            IndexError: If the image has no such side
+        """
+        if not 0 <= index < self.disk_sides():
+            raise IndexError(f"Disk side {index} is outside the image")
+        start = self._disk_start() + index * FDS_SIDE_SIZE
+        return self.view[start : start + FDS_SIDE_SIZE]
+
+    def _disk_start(self) -> int:
+        """Offset of the first disk side (after the fwNES header, if any)."""
+        return INES_HEADER_SIZE if self.view[:4] == FDS_MAGIC else 0
+
+
+def rom_buffer(rom: Union[RomImage, bytes, bytearray]):
+    """The bytes-like data of a RomImage, or ``rom`` itself."""
+    return rom.data if isinstance(rom, RomImage) else rom
+
+
+class TerminatorIndex:
+    """
+    Sorted positions of every terminator byte in ROM data.
+
+    Scanning for the end of each string byte by byte costs a Python loop per
+    string; pointer-table games do it for every pointer. The index finds all
+    terminators in one pass (NumPy, or a regex over the buffer), after which
+    each string end is a single bisect.
+
+    Example:
+        index = TerminatorIndex(rom.data, {0x00, 0xFF})
+        end = index.find(0x8010)
+        text = rom.data[0x8010:end]
+    """
+
+    def __init__(self, data, terminators: Iterable[int]):
+        """Index the terminators in ``data``.
+
+        Args:
+            data: ROM data (any bytes-like object)
+            terminators: Byte values that end a string
+        """
+        self.data = data
+        self.terminators: FrozenSet[int] = frozenset(terminators)
+        self.size = len(data)
+        self.positions = _find_all(data, self.terminators)
+
+    def find(self, start: int, end: Optional[int] = None) -> int:
+        """Position of the first terminator in ``[start, end)``.
+
+        Args:
+            start: First position to search
+            end: Position after the last one to search (default: end of data)
+
+        Returns:
+            Terminator position, or ``end`` if there is none
+        """
+        end = self.size if end is None else min(end, self.size)
+        i = bisect_left(self.positions, start)
+        if i < len(self.positions) and self.positions[i] < end:
+            return self.positions[i]
+        return end
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+
+def _find_all(data, terminators: FrozenSet[int]) -> "array[int]":
+    """Ascending positions of the ``terminators`` bytes in ``data``."""
+    if not terminators or not len(data):
+        return array("q")
+
+    if np is not None:
+        is_terminator = np.zeros(256, dtype=bool)
+        is_terminator[sorted(terminators)] = True
+        found = np.flatnonzero(is_terminator[np.frombuffer(data, dtype=np.uint8)])
+        return array("q", found.astype(np.int64).tobytes())
+
+    pattern = re.compile(
+        b"[" + b"".join(re.escape(bytes([b])) for b in sorted(terminators)) + b"]"
+    )
+    return array("q", (match.start() for match in pattern.finditer(data)))
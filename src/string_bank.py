@@ -0,0 +1,352 @@
+"""
+Binary string banks.
+
+Every stage used to hand strings to the next through CSV or JSON text,
+converting hex back to bytes and re-encoding the translations each time. A
+string bank stores them once in a compact binary file that is memory-mapped
+on load:
+
+    header   magic, version, string count and section offsets
+    index    one fixed-size entry per string (addresses and pool spans)
+    order    entry numbers sorted by string_id, for lookups by id
+    bytes    raw pool: original/translated bytes and pointer slots
+    text     UTF-8 pool: ids, texts, descriptions and JSON metadata
+
+Strings are decoded one at a time, so iterating a bank or looking up a
+single ``string_id`` never parses the rest of the file.
+"""
+
+import json
+import mmap
+import os
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+BANK_MAGIC = b"FLSB"
+BANK_VERSION = 1
+
+# magic, version, reserved, count, index/order offsets, bytes and text
+# pool offsets and sizes, metadata span in the text pool
+HEADER = struct.Struct("<4sHHIIIIIIIII")
+
+# address, pointer_address, then (start, length) spans of string_id,
+# decoded_text, translated_text, description (text pool) and
+# original_bytes, translated_bytes, pointer_addresses (bytes pool)
+ENTRY = struct.Struct("<II14I")
+
+ORDER = struct.Struct("<I")
+
+# Stored in place of a missing pointer address
+NO_POINTER = 0xFFFFFFFF
+
+
+@dataclass
+class BankString:
+    """A string as stored in a bank."""
+
+    string_id: str
+    address: int
+    original_bytes: bytes
+    decoded_text: str
+    translated_text: str = ""
+    translated_bytes: bytes = b""  # Encoded translation, if already known
+    description: str = ""
+    pointer_address: Optional[int] = None
+    pointer_addresses: List[int] = field(default_factory=list)
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "BankString":
+        """Bank string for a record of the extractor's JSON exports."""
+        return cls(
+            string_id=record["string_id"],
+            address=record["address"],
+            original_bytes=bytes.fromhex(record.get("original_bytes", "")),
+            decoded_text=record.get("decoded_text", ""),
+            translated_text=record.get("translated_text", ""),
+            description=record.get("description", ""),
+            pointer_address=record.get("pointer_address"),
+            pointer_addresses=list(record.get("pointer_addresses", [])),
+        )
+
+    def to_record(self) -> Dict[str, Any]:
+        """Record in the layout of the extractor's JSON exports."""
+        record = {
+            "address": self.address,
+            "original_bytes": self.original_bytes.hex(),
+            "decoded_text": self.decoded_text,
+            "length": len(self.original_bytes),
+            "description": self.description,
+            "pointer_address": self.pointer_address,
+            "string_id": self.string_id,
+            "pointer_addresses": list(self.pointer_addresses),
+        }
+        if self.translated_text:
+            record["translated_text"] = self.translated_text
+        return record
+
+
+def write_string_bank(
+    path: Union[str, Path],
+    strings: Iterable[BankString],
+    metadata: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Write strings to a bank file.
+
+    Args:
+        path: Output path
+        strings: Strings to store, in order
+        metadata: JSON-serializable data stored with the strings
+
+    Returns:
+        Number of strings written
+
+    Raises:
+        ValueError: If a string_id is repeated
+    """
+    index = bytearray()
+    raw = bytearray()
+    text = bytearray()
+    ids: Dict[bytes, int] = {}
+
+    def span(pool: bytearray, data: bytes):
+        start = len(pool)
+        pool += data
+        return start, len(data)
+
+    for number, string in enumerate(strings):
+        string_id = string.string_id.encode("utf-8")
+        if string_id in ids:
+            raise ValueError(f"Duplicate string_id in bank: {string.string_id}")
+        ids[string_id] = number
+
+        slots = string.pointer_addresses
+        index += ENTRY.pack(
+            string.address,
+            NO_POINTER if string.pointer_address is None else string.pointer_address,
+            *span(text, string_id),
+            *span(text, string.decoded_text.encode("utf-8")),
+            *span(text, string.translated_text.encode("utf-8")),
+            *span(text, string.description.encode("utf-8")),
+            *span(raw, string.original_bytes),
+            *span(raw, string.translated_bytes),
+            *span(raw, struct.pack(f"<{len(slots)}I", *slots)),
+        )
+
+    metadata_start, metadata_length = span(
+        text, json.dumps(metadata or {}, ensure_ascii=False).encode("utf-8")
+    )
+    order = b"".join(ORDER.pack(ids[key]) for key in sorted(ids))
+
+    index_offset = HEADER.size
+    order_offset = index_offset + len(index)
+    bytes_offset = order_offset + len(order)
+    text_offset = bytes_offset + len(raw)
+    header = HEADER.pack(
+        BANK_MAGIC,
+        BANK_VERSION,
+        0,
+        len(ids),
+        index_offset,
+        order_offset,
+        bytes_offset,
+        len(raw),
+        text_offset,
+        len(text),
+        metadata_start,
+        metadata_length,
+    )
+
+    # Readers may have the old bank mapped: replace the file, never rewrite it
+    output_file = Path(path)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_file.with_name(f"{output_file.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(header)
+            f.write(index)
+            f.write(order)
+            f.write(raw)
+            f.write(text)
+        os.replace(temp_path, output_file)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return len(ids)
+
+
+class StringBank:
+    """
+    A string bank file mapped into memory.
+
+    Example:
+        with StringBank.open("output/game_extracted.bank") as bank:
+            title = bank.get("ptr_001")
+            for string in bank:
+                ...
+    """
+
+    def __init__(self, data: Union[bytes, bytearray, "mmap.mmap"], path=None):
+        """Read the header of bank data already in memory.
+
+        Args:
+            data: Bank file contents
+            path: File the data came from, if any
+
+        Raises:
+            ValueError: If the data is not a string bank
+        """
+        self.data = data
+        self.path = Path(path) if path is not None else None
+        self.view = memoryview(data)
+
+        if len(data) < HEADER.size:
+            raise ValueError("Not a string bank: file too short")
+        (
+            magic,
+            version,
+            _,
+            self.count,
+            self._index_offset,
+            self._order_offset,
+            self._bytes_offset,
+            bytes_size,
+            self._text_offset,
+            text_size,
+            metadata_start,
+            metadata_length,
+        ) = HEADER.unpack_from(data)
+
+        if magic != BANK_MAGIC:
+            raise ValueError("Not a string bank: bad magic")
+        if version != BANK_VERSION:
+            raise ValueError(f"Unsupported string bank version: {version}")
+        if (
+            self._index_offset + self.count * ENTRY.size > self._order_offset
+            or self._bytes_offset + bytes_size > self._text_offset
+            or self._text_offset + text_size > len(data)
+        ):
+            raise ValueError("Truncated string bank")
+
+        self.metadata: Dict[str, Any] = json.loads(
+            self._text(metadata_start, metadata_length) or "{}"
+        )
+
+    @classmethod
+    def open(cls, bank_path: Union[str, Path]) -> "StringBank":
+        """Map a bank file read-only.
+
+        Args:
+            bank_path: Path to the bank file
+
+        Returns:
+            StringBank backed by the file
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If the file is not a string bank
+        """
+        bank_file = Path(bank_path)
+        if not bank_file.exists():
+            raise FileNotFoundError(f"String bank not found: {bank_path}")
+
+        with open(bank_file, "rb") as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped
+                data = f.read()
+        return cls(data, bank_file)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[BankString]:
+        for number in range(self.count):
+            yield self[number]
+
+    def __getitem__(self, number: int) -> BankString:
+        """String by position in the bank."""
+        if number < 0:
+            number += self.count
+        if not 0 <= number < self.count:
+            raise IndexError(f"String {number} is outside the bank")
+
+        address, pointer_address, *spans = ENTRY.unpack_from(
+            self.data, self._index_offset + number * ENTRY.size
+        )
+        slots = self._bytes(spans[12], spans[13])
+        return BankString(
+            string_id=self._text(spans[0], spans[1]),
+            address=address,
+            original_bytes=self._bytes(spans[8], spans[9]),
+            decoded_text=self._text(spans[2], spans[3]),
+            translated_text=self._text(spans[4], spans[5]),
+            translated_bytes=self._bytes(spans[10], spans[11]),
+            description=self._text(spans[6], spans[7]),
+            pointer_address=None if pointer_address == NO_POINTER else pointer_address,
+            pointer_addresses=list(struct.unpack(f"<{len(slots) // 4}I", slots)),
+        )
+
+    def __contains__(self, string_id: str) -> bool:
+        return self.find(string_id) is not None
+
+    def __enter__(self) -> "StringBank":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self.view.release()
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def find(self, string_id: str) -> Optional[int]:
+        """Position of a string in the bank.
+
+        Args:
+            string_id: Id to look up
+
+        Returns:
+            Position, or None if the bank has no such string
+        """
+        key = string_id.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            number = self._ordered(middle)
+            found = self._string_id(number)
+            if found == key:
+                return number
+            if found < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def get(self, string_id: str) -> Optional[BankString]:
+        """String by id, or None if the bank has no such string."""
+        number = self.find(string_id)
+        return None if number is None else self[number]
+
+    def _ordered(self, rank: int) -> int:
+        """Entry number of the ``rank``-th string_id in sorted order."""
+        return ORDER.unpack_from(self.data, self._order_offset + rank * ORDER.size)[0]
+
+    def _string_id(self, number: int) -> bytes:
+        """Raw UTF-8 string_id of an entry."""
+        offset = self._index_offset + number * ENTRY.size + 8
+        start, length = struct.unpack_from("<II", self.data, offset)
+        start += self._text_offset
+        return bytes(self.view[start : start + length])
+
+    def _bytes(self, start: int, length: int) -> bytes:
+        start += self._bytes_offset
+        return bytes(self.view[start : start + length])
+
+    def _text(self, start: int, length: int) -> str:
+        start += self._text_offset
+        return str(self.view[start : start + length], "utf-8")
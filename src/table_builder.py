@@ -10,6 +10,11 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    from .encoding import split_table_line
+except ImportError:
+    from encoding import split_table_line
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,6 +46,8 @@ class TableData:
     name: str
     mappings: Dict[int, str] = field(default_factory=dict)  # byte -> char
     control_codes: Dict[int, str] = field(default_factory=dict)  # byte -> code
+    # Parameterized codes, e.g. "F0XX" -> "<DELAY:XX>"
+    multi_byte_patterns: Dict[str, str] = field(default_factory=dict)
     description: str = ""
     
 
@@ -72,6 +79,7 @@ class TableBuilder:
         mappings: Dict[int, str],
         control_codes: Optional[Dict[int, str]] = None,
         description: str = "",
+        multi_byte_patterns: Optional[Dict[str, str]] = None,
     ) -> TableBuilderResult:
         """
         Create a new .tbl file from user-provided mappings.
@@ -81,6 +89,8 @@ class TableBuilder:
             mappings: Dict of byte_value -> character
             control_codes: Optional dict of byte_value -> control code (e.g., "<END>")
             description: Optional description for the table header
+            multi_byte_patterns: Optional dict of hex pattern -> code
+                (e.g., "F0XX" -> "<DELAY:XX>")
             
         Returns:
             TableBuilderResult with status and path
@@ -103,7 +113,12 @@ class TableBuilder:
         
         try:
             self._write_table_file(
-                table_path, mappings, control_codes, game_name, description
+                table_path,
+                mappings,
+                control_codes,
+                game_name,
+                description,
+                multi_byte_patterns or {},
             )
             
             logger.info(f"Created table {table_path} with {len(mappings)} mappings")
@@ -143,27 +158,23 @@ class TableBuilder:
         
         mappings = {}
         control_codes = {}
+        multi_byte_patterns = {}
         
         try:
             with open(path, "r", encoding="utf-8") as f:
                 for line in f:
-                    line = line.strip()
-                    
-                    # Skip comments and empty lines
-                    if not line or line.startswith("#"):
+                    # Same line syntax as EncodingTable, but invalid lines
+                    # are skipped so broken tables can still be edited
+                    parts = split_table_line(line)
+                    if parts is None:
                         continue
+                    hex_part, char_part = parts
                     
-                    if "=" not in line:
+                    # Parameterized codes (e.g., F0XX=<DELAY:XX>)
+                    if "XX" in hex_part or "YY" in hex_part:
+                        multi_byte_patterns[hex_part] = char_part
                         continue
                     
-                    hex_part, char_part = line.split("=", 1)
-                    hex_part = hex_part.strip()
-                    
-                    # Handle inline comments
-                    if "#" in char_part:
-                        char_part = char_part.split("#")[0]
-                    char_part = char_part.rstrip()
-                    
                     try:
                         byte_value = int(hex_part, 16)
                     except ValueError:
@@ -179,6 +190,7 @@ class TableBuilder:
                 name=path.stem,
                 mappings=mappings,
                 control_codes=control_codes,
+                multi_byte_patterns=multi_byte_patterns,
             )
             
         except Exception as e:
@@ -213,15 +225,18 @@ class TableBuilder:
                 existing.control_codes.update(control_codes)
             final_mappings = existing.mappings
             final_codes = existing.control_codes
+            final_patterns = existing.multi_byte_patterns
         else:
             final_mappings = mappings
             final_codes = control_codes or {}
+            final_patterns = {}
         
         return self.create_table(
             path.stem,
             final_mappings,
             final_codes,
             description=f"Updated table for {path.stem}",
+            multi_byte_patterns=final_patterns,
         )
     
     def get_common_presets(self) -> Dict[str, Dict[int, str]]:
@@ -292,6 +307,7 @@ class TableBuilder:
         control_codes: Dict[int, str],
         game_name: str,
         description: str,
+        multi_byte_patterns: Optional[Dict[str, str]] = None,
     ) -> None:
         """Write encoding table to file."""
         with open(path, "w", encoding="utf-8") as f:
@@ -311,6 +327,12 @@ class TableBuilder:
                     f.write(f"{byte_val:02X}={control_codes[byte_val]}\n")
                 f.write("\n")
             
+            if multi_byte_patterns:
+                f.write("# Multi-byte Patterns\n")
+                for hex_part in sorted(multi_byte_patterns.keys()):
+                    f.write(f"{hex_part}={multi_byte_patterns[hex_part]}\n")
+                f.write("\n")
+            
             # Group and write character mappings
             if mappings:
                 # Separate by type
@@ -318,10 +340,13 @@ class TableBuilder:
                 digits = {}
                 punctuation = {}
                 japanese = {}
+                dictionary = {}
                 other = {}
                 
                 for byte_val, char in mappings.items():
-                    if char.isalpha() and ord(char) < 128:
+                    if len(char) > 1:
+                        dictionary[byte_val] = char
+                    elif char.isalpha() and ord(char) < 128:
                         letters[byte_val] = char
                     elif char.isdigit():
                         digits[byte_val] = char
@@ -348,10 +373,9 @@ class TableBuilder:
                     f.write("# Punctuation\n")
                     for byte_val in sorted(punctuation.keys()):
                         char = punctuation[byte_val]
-                        if char == " ":
-                            f.write(f"{byte_val:02X}=  # space\n")
-                        else:
-                            f.write(f"{byte_val:02X}={char}\n")
+                        # No inline comment after a space: the parser would
+                        # strip the space along with the comment
+                        f.write(f"{byte_val:02X}={char}\n")
                     f.write("\n")
                 
                 if japanese:
@@ -360,6 +384,12 @@ class TableBuilder:
                         f.write(f"{byte_val:02X}={japanese[byte_val]}\n")
                     f.write("\n")
                 
+                if dictionary:
+                    f.write("# Dictionary (DTE/MTE)\n")
+                    for byte_val in sorted(dictionary.keys()):
+                        f.write(f"{byte_val:02X}={dictionary[byte_val]}\n")
+                    f.write("\n")
+                
                 if other:
                     f.write("# Other Characters\n")
                     for byte_val in sorted(other.keys()):
@@ -0,0 +1,188 @@
+"""Tests for batch extraction across a ROM directory."""
+
+import csv
+import os
+import zlib
+
+import pytest
+
+import src.batch as batch_module
+from src.batch import BatchExtractor, find_roms, load_config_index, rom_crc32
+from src.string_bank import StringBank
+
+
+def rom_bytes(marker):
+    """100-byte ROM holding "ABC " at 0x10, made unique by ``marker``."""
+    data = bytearray(100)
+    data[0x10:0x15] = b"ABC \xff"
+    data[0x40] = marker
+    return bytes(data)
+
+
+def write_config(path, method, crc32=None):
+    game = f'game:\n  crc32: "0x{crc32:08X}"\n' if crc32 is not None else ""
+    path.write_text(
+        game + "text_detection:\n"
+        f"  method: {method}\n"
+        "  encoding_table: tests/test_table.tbl\n"
+        "  strings:\n"
+        "    - address: 0x10\n"
+        "      length: 4\n"
+    )
+
+
+@pytest.fixture
+def library(tmp_path):
+    """Three ROMs: one matched by CRC32, one left to the default, one broken."""
+    roms = tmp_path / "roms"
+    configs = tmp_path / "configs"
+    roms.mkdir()
+    configs.mkdir()
+
+    for name, marker in [("known.nes", 1), ("unknown.nes", 2), ("broken.nes", 3)]:
+        (roms / name).write_bytes(rom_bytes(marker))
+    (roms / "notes.txt").write_text("not a ROM")
+
+    write_config(configs / "known.yaml", "fixed_locations", zlib.crc32(rom_bytes(1)))
+    write_config(configs / "broken.yaml", "telepathy", zlib.crc32(rom_bytes(3)))
+    write_config(tmp_path / "default.yaml", "fixed_locations")
+    return tmp_path
+
+
+def make_batch(library, **kwargs):
+    return BatchExtractor(
+        library / "out",
+        config_dir=library / "configs",
+        default_config=library / "default.yaml",
+        **kwargs,
+    )
+
+
+def test_find_roms(library):
+    assert [p.name for p in find_roms(library / "roms")] == [
+        "broken.nes",
+        "known.nes",
+        "unknown.nes",
+    ]
+    with pytest.raises(FileNotFoundError):
+        find_roms(library / "missing")
+
+
+def test_config_index(library):
+    index = load_config_index(library / "configs")
+
+    assert index == {
+        zlib.crc32(rom_bytes(1)): library / "configs" / "known.yaml",
+        zlib.crc32(rom_bytes(3)): library / "configs" / "broken.yaml",
+    }
+
+
+class TestBatchExtractor:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_run(self, library, workers):
+        batch = make_batch(library, workers=workers)
+        seen = []
+
+        results = batch.run(
+            library / "roms", progress=lambda r, done, total: seen.append(total)
+        )
+
+        assert seen == [3, 3, 3]
+        by_rom = {r.rom: r for r in results}
+        assert by_rom["known.nes"].config.endswith("known.yaml")
+        assert by_rom["unknown.nes"].config.endswith("default.yaml")
+        assert by_rom["broken.nes"].status == "failed"
+        assert "telepathy" in by_rom["broken.nes"].error
+
+        known = by_rom["known.nes"]
+        assert known.status == "done"
+        assert known.strings == 1
+        assert known.outputs == [
+            "known/known_extracted.bank",
+            "known/known_extracted.csv",
+        ]
+        with StringBank.open(library / "out" / known.outputs[0]) as bank:
+            assert bank[0].decoded_text == "ABC "
+
+        with open(batch.index_path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["rom"] for row in rows] == [
+            "broken.nes",
+            "known.nes",
+            "unknown.nes",
+        ]
+        assert [row["status"] for row in rows] == ["failed", "done", "done"]
+
+    def test_resume_skips_done_roms(self, library):
+        make_batch(library).run(library / "roms")
+        (library / "roms" / "unknown.nes").write_bytes(rom_bytes(4))  # Changed
+        retried = []
+
+        results = make_batch(library).run(
+            library / "roms", progress=lambda r, done, total: retried.append(r.rom)
+        )
+
+        assert sorted(retried) == ["broken.nes", "unknown.nes"]
+        assert len(results) == 3
+        assert make_batch(library).load_manifest()["known.nes"].status == "done"
+
+    def test_resume_checks_only_changed_files(self, library, monkeypatch):
+        make_batch(library).run(library / "roms")
+        known = library / "roms" / "known.nes"
+        os.utime(known, ns=(0, known.stat().st_mtime_ns + 10**9))  # Touched only
+        checked = []
+
+        def crc32(rom):
+            checked.append(rom.name)
+            return rom_crc32(rom)
+
+        monkeypatch.setattr(batch_module, "rom_crc32", crc32)
+        results = make_batch(library).run(library / "roms")
+
+        # broken.nes failed, so it is retried
+        assert checked == ["broken.nes", "known.nes"]
+        assert [r.status for r in results] == ["failed", "done", "done"]
+
+        checked.clear()
+        make_batch(library).run(library / "roms")
+        assert checked == ["broken.nes"]
+
+    def test_roms_sharing_a_stem(self, library):
+        (library / "roms" / "known.fds").write_bytes(rom_bytes(5))
+
+        results = {r.rom: r for r in make_batch(library).run(library / "roms")}
+
+        assert results["known.nes"].outputs == [
+            "known_nes/known_nes_extracted.bank",
+            "known_nes/known_nes_extracted.csv",
+        ]
+        assert results["known.fds"].outputs[0] == "known_fds/known_fds_extracted.bank"
+        assert results["unknown.nes"].outputs[0] == "unknown/unknown_extracted.bank"
+        assert not (library / "out" / "known").exists()
+
+    def test_restart(self, library):
+        make_batch(library).run(library / "roms")
+        rerun = []
+
+        make_batch(library).run(
+            library / "roms",
+            resume=False,
+            progress=lambda r, done, total: rerun.append(r.rom),
+        )
+
+        assert len(rerun) == 3
+
+    def test_no_default_config(self, library):
+        batch = make_batch(library)
+        batch.default_config = None
+
+        results = {r.rom: r for r in batch.run(library / "roms")}
+
+        assert results["unknown.nes"].status == "failed"
+        assert "No config matches" in results["unknown.nes"].error
+
+    def test_bad_arguments(self, library):
+        with pytest.raises(ValueError, match="Unsupported export format"):
+            make_batch(library, formats=["xml"])
+        with pytest.raises(ValueError, match="workers"):
+            make_batch(library, workers=-1)
@@ -0,0 +1,78 @@
+"""
+Tests for the synthetic benchmark corpus and its scoring.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.run_benchmarks import compare, score_candidates
+from benchmarks.synthetic import PROFILES, generate_corpus, generate_rom
+from src.detector import TextCandidate
+from src.encoding import EncodingTable
+
+TABLE = str(project_root / "tables" / "common.tbl")
+
+
+@pytest.fixture(scope="module")
+def rom():
+    return generate_rom(PROFILES[0], TABLE, seed=1)
+
+
+def _candidate(address, length):
+    return TextCandidate(address, length, 0.9, "", "entropy")
+
+
+class TestSyntheticRom:
+    def test_size_and_header(self, rom):
+        assert len(rom.data) == PROFILES[0].size
+        assert rom.data[:4] == b"NES\x1a"
+        assert rom.data[4] == PROFILES[0].prg_units
+
+    def test_planted_strings_decode(self, rom):
+        table = EncodingTable(TABLE)
+        assert len(rom.strings) == PROFILES[0].strings
+        for planted in rom.strings:
+            encoded = rom.data[planted.address : planted.address + planted.length]
+            assert table.decode_bytes(encoded) == planted.text
+            assert rom.data[planted.address + planted.length] == 0xFF
+
+    def test_deterministic(self, rom):
+        assert generate_rom(PROFILES[0], TABLE, seed=1).data == rom.data
+        assert generate_rom(PROFILES[0], TABLE, seed=2).data != rom.data
+
+    def test_corpus_cycles_tables(self):
+        corpus = generate_corpus(PROFILES[:2])
+        assert len({r.table_path for r in corpus}) == 2
+
+
+class TestScoring:
+    def test_exact_match(self, rom):
+        candidates = [_candidate(s.address, s.length) for s in rom.strings]
+        assert score_candidates(candidates, rom.strings) == {
+            "precision": 1.0,
+            "recall": 1.0,
+        }
+
+    def test_false_positive_and_miss(self, rom):
+        first, second = rom.strings[0], rom.strings[1]
+        # Noise between the first two strings, and the first string only
+        noise = _candidate(first.address + first.length + 2, 4)
+        if noise.address + noise.length > second.address:
+            pytest.skip("Strings too close for a gap candidate")
+        scores = score_candidates(
+            [_candidate(first.address, first.length), noise], rom.strings
+        )
+        assert scores["precision"] == 0.5
+        assert scores["recall"] == 1 / len(rom.strings)
+
+    def test_compare_flags_regressions(self):
+        baseline = {"rom": {"detect": {"mb_per_s": 10.0, "recall": 0.9}}}
+        ok = {"rom": {"detect": {"mb_per_s": 9.0, "recall": 0.89}}}
+        slow = {"rom": {"detect": {"mb_per_s": 5.0, "recall": 0.5}}}
+        assert compare(ok, baseline) == []
+        assert len(compare(slow, baseline)) == 2
@@ -11,6 +11,7 @@ from src.chr_analyzer import (
     FontRegion,
     analyze_chr_rom,
 )
+from src.rom_image import RomImage
 
 
 class TestCHRType:
@@ -248,6 +249,20 @@ class TestCHRAnalyzer:
         """Test analyzing non-existent ROM."""
         with pytest.raises(FileNotFoundError):
             self.analyzer.analyze_rom("/nonexistent/path/game.nes")
+    
+    def test_analyze_mapped_rom_can_be_closed(self, tmp_path):
+        """Test that no view of a caller's RomImage outlives the analysis."""
+        header = b"NES\x1a" + bytes([1, 1, 0, 0]) + bytes(8)
+        chr_rom = bytearray(8192)
+        chr_rom[16:32] = bytes([0xFF] * 16)  # Tile 1 is solid
+        rom_file = tmp_path / "game.nes"
+        rom_file.write_bytes(header + bytes(16384) + bytes(chr_rom))
+        
+        with RomImage.open(rom_file) as rom:
+            analysis = self.analyzer.analyze_rom(rom)
+        
+        assert analysis.total_tiles == 512
+        assert self.analyzer.get_tile_bitmap(1)[0] == [3] * 8
 
 
 class TestAnalyzeCHRRomFunction:
@@ -0,0 +1,483 @@
+"""Tests for the detector module."""
+
+import random
+
+import pytest
+
+from src.detector import TextCandidate, TextDetector, load_table_dir, np
+from src.encoding import EncodingTable
+
+requires_numpy = pytest.mark.skipif(np is None, reason="NumPy not installed")
+
+MESSAGE = b"THE QUICK BROWN FOX JUMPS, OVER the lazy dog!"
+
+
+@pytest.fixture
+def table(tmp_path):
+    """ASCII-style encoding table with common control codes."""
+    lines = [f"{code:02X}={chr(code)}" for code in range(0x41, 0x5B)]
+    lines += [f"{code:02X}={chr(code)}" for code in range(0x61, 0x7B)]
+    lines += ["20= ", "21=!", "2C=,", "2E=.", "00=<NULL>", "FE=<NEWLINE>", "FF=<END>"]
+    table_path = tmp_path / "ascii.tbl"
+    table_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return EncodingTable(str(table_path))
+
+
+@pytest.fixture
+def rom_data():
+    """Noise with planted text strings and a block of 0xFF padding."""
+    rng = random.Random(1234)
+    data = bytearray(rng.getrandbits(8) for _ in range(16 * 1024))
+    for _ in range(12):
+        address = rng.randrange(0, len(data) - 100)
+        data[address : address + len(MESSAGE)] = MESSAGE
+        data[address + len(MESSAGE)] = 0xFF
+    data[0x1000:0x1200] = b"\xff" * 0x200
+    return bytes(data)
+
+
+class TestEngineSelection:
+    """Test detection engine resolution."""
+
+    def test_python_engine(self, table):
+        """Test explicitly requesting the pure-Python engine."""
+        assert TextDetector(table, engine="python").engine == "python"
+
+    def test_auto_engine(self, table):
+        """Test auto engine picks NumPy only when available."""
+        expected = "numpy" if np is not None else "python"
+        assert TextDetector(table).engine == expected
+
+    def test_unknown_engine(self, table):
+        """Test unknown engine names are rejected."""
+        with pytest.raises(ValueError):
+            TextDetector(table, engine="gpu")
+
+
+class TestHeuristics:
+    """Test the scoring helpers shared by both engines."""
+
+    def test_entropy_uniform(self, table):
+        """Test entropy of a single repeated byte is zero."""
+        detector = TextDetector(table, engine="python")
+        assert detector._calculate_entropy(b"\x41" * 32) == pytest.approx(0.0)
+
+    def test_entropy_distinct(self, table):
+        """Test entropy of all-distinct bytes is log2(n)."""
+        detector = TextDetector(table, engine="python")
+        assert detector._calculate_entropy(bytes(range(32))) == pytest.approx(5.0)
+
+    def test_text_confidence(self, table):
+        """Test text scores higher than unmapped bytes."""
+        detector = TextDetector(table, engine="python")
+        text_score = detector._calculate_text_confidence(b"HELLO WORLD")
+        noise_score = detector._calculate_text_confidence(b"\x80\x81\x82\x83")
+        assert text_score > 0.6
+        assert noise_score < 0.2
+
+    def test_byte_classes_cached(self, table):
+        """Test lookup tables are compiled once per encoding table state."""
+        detector = TextDetector(table, engine="python")
+        classes = detector._byte_classes()
+        assert detector._byte_classes() is classes
+        assert classes.score_units[0x41] == 2
+        assert classes.score_units[0x2E] == 1
+        assert classes.recognized[0x41] == 1
+        assert classes.control[0xFE] == 1
+        assert classes.common[0x20] == 1 and classes.common[0x61] == 0
+        assert classes.terminators[0xFF] == 1 and classes.terminators[0xFE] == 0
+
+    def test_byte_classes_rebuilt_on_table_change(self, table):
+        """Test new mappings are picked up without a new detector."""
+        detector = TextDetector(table, engine="python")
+        assert detector._calculate_text_confidence(b"\x80\x81\x82") < 0.2
+
+        table._parse_table_line("80=A")
+        table._parse_table_line("81=B")
+        table._parse_table_line("82=<END>")
+        assert detector._byte_classes().recognized[0x80] == 1
+        assert detector._byte_classes().terminators[0x82] == 1
+        assert detector._calculate_text_confidence(b"\x80\x81\x82") > 0.6
+
+        detector.encoding_table = EncodingTable()
+        assert 1 not in detector._byte_classes().recognized
+
+    def test_detects_planted_text(self, table, rom_data):
+        """Test planted strings are found."""
+        detector = TextDetector(table, engine="python")
+        candidates = detector.detect_text_regions(rom_data)
+        assert candidates
+        assert all(isinstance(c, TextCandidate) for c in candidates)
+        assert any("QUICK" in c.sample_text for c in candidates)
+
+
+class TestRollingEntropy:
+    """Test the rolling-window entropy scanner."""
+
+    @pytest.mark.parametrize("step", [1, 5, 16, 40])
+    def test_matches_full_recompute(self, table, rom_data, step):
+        """Test rolling updates equal recomputing every window."""
+        detector = TextDetector(table, engine="python")
+        detector.configure({"entropy_step_size": step})
+        data = rom_data[:2048]
+
+        scanned = list(detector._scan_windows(data))
+        assert [s[0] for s in scanned] == list(range(0, len(data) - 32, step))
+        for address, entropy, confidence in scanned:
+            window = data[address : address + 32]
+            assert entropy == detector._calculate_entropy(window)
+            assert confidence == detector._calculate_text_confidence(window)
+
+    def test_configure(self, table):
+        """Test auto_detect settings are applied."""
+        detector = TextDetector(table, engine="python")
+        detector.configure(
+            {
+                "entropy_window_size": 64,
+                "entropy_step_size": 1,
+                "entropy_min": 1.5,
+                "entropy_max": 5.5,
+                "confidence_threshold": 0.5,
+                "unrelated_key": True,
+            }
+        )
+        assert detector.entropy_window_size == 64
+        assert detector.entropy_step_size == 1
+        assert detector.entropy_min == 1.5
+        assert detector.entropy_max == 5.5
+        assert detector.confidence_threshold == 0.5
+
+    def test_configure_rejects_zero_step(self, table):
+        """Test a zero step is rejected."""
+        detector = TextDetector(table, engine="python")
+        with pytest.raises(ValueError):
+            detector.configure({"entropy_step_size": 0})
+
+    def test_entropy_bounds(self, table, rom_data):
+        """Test candidates respect the configured entropy bounds."""
+        detector = TextDetector(table, engine="python")
+        detector.configure({"entropy_step_size": 1, "entropy_max": 4.5})
+        candidates = detector._detect_by_entropy(rom_data)
+        assert candidates
+        for candidate in candidates:
+            entropy = float(candidate.description.split(": ")[1])
+            assert entropy <= 4.5
+
+
+class TestTerminatorDetection:
+    """Test single-pass terminator detection."""
+
+    def test_string_starts_after_previous_terminator(self, table):
+        """Test each span runs back only to the previous terminator."""
+        detector = TextDetector(table, engine="python")
+        data = b"\x80" * 8 + b"HELLO\xffWORLD THERE\x00"
+        candidates = detector._detect_by_terminators(data)
+
+        spans = [(c.address, c.sample_text) for c in candidates]
+        assert (14, "WORLD THERE") in spans
+        assert candidates[-1].description == "Terminator: 0x00"
+
+    def test_padding_yields_no_candidates(self, table):
+        """Test runs of terminator padding do not produce candidates."""
+        detector = TextDetector(table, engine="python")
+        data = b"HELLO WORLD\xff" + b"\xff" * 4096
+        candidates = detector._detect_by_terminators(data)
+        assert len(candidates) == 1
+        assert candidates[0].address == 0
+        assert candidates[0].sample_text == "HELLO WORLD"
+
+    def test_span_limited_to_max_length(self, table):
+        """Test spans never exceed max_string_length."""
+        detector = TextDetector(table, engine="python")
+        data = b"A" * 300 + b"\xff"
+        candidates = detector._detect_by_terminators(data)
+        assert [(c.address, c.length) for c in candidates] == [(200, 100)]
+
+
+def _pairwise_deduplicate(candidates):
+    """Reference implementation comparing each candidate to every survivor."""
+    result = []
+    for candidate in sorted(candidates, key=lambda x: x.address):
+        overlaps = False
+        for existing in result:
+            overlap_start = max(candidate.address, existing.address)
+            overlap_end = min(
+                candidate.address + candidate.length,
+                existing.address + existing.length,
+            )
+            overlap_length = max(0, overlap_end - overlap_start)
+            if overlap_length > min(candidate.length, existing.length) * 0.5:
+                if candidate.confidence > existing.confidence:
+                    result.remove(existing)
+                else:
+                    overlaps = True
+                break
+        if not overlaps:
+            result.append(candidate)
+    return result
+
+
+def _candidate(address, length, confidence):
+    return TextCandidate(address, length, confidence, "", "test")
+
+
+class TestDeduplication:
+    """Test interval-index candidate deduplication."""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_pairwise(self, table, seed):
+        """Test survivors match the pairwise overlap rule."""
+        rng = random.Random(seed)
+        candidates = [
+            _candidate(
+                rng.randrange(0, 1000),
+                rng.choice([0, 3, 32, rng.randrange(1, 120)]),
+                round(rng.random(), 1),
+            )
+            for _ in range(rng.randrange(1, 200))
+        ]
+        expected = _pairwise_deduplicate(candidates)
+
+        detector = TextDetector(table, engine="python")
+        result = detector._deduplicate_candidates(candidates)
+        assert [(c.address, c.length, c.confidence) for c in result] == [
+            (c.address, c.length, c.confidence) for c in expected
+        ]
+        assert sum(c.absorbed for c in result) == len(candidates) - len(result)
+
+    def test_absorbed_counts(self, table):
+        """Test survivors report how many candidates they absorbed."""
+        detector = TextDetector(table, engine="python")
+        result = detector._deduplicate_candidates(
+            [
+                _candidate(0, 32, 0.5),
+                _candidate(4, 32, 0.4),
+                _candidate(8, 32, 0.9),
+                _candidate(100, 20, 0.7),
+            ]
+        )
+        assert [(c.address, c.absorbed) for c in result] == [(8, 2), (100, 0)]
+
+    def test_touching_regions_kept(self, table):
+        """Test adjacent regions without overlap both survive."""
+        detector = TextDetector(table, engine="python")
+        result = detector._deduplicate_candidates(
+            [_candidate(0, 32, 0.8), _candidate(32, 32, 0.9)]
+        )
+        assert len(result) == 2
+
+
+def _ines_rom(prg_units, chr_units, mapper, rng):
+    """Random iNES ROM with text planted across every 8KB PRG seam."""
+    header = b"NES\x1a" + bytes([prg_units, chr_units, (mapper & 0x0F) << 4])
+    header += bytes([mapper & 0xF0]) + bytes(8)
+    prg = bytearray(rng.getrandbits(8) for _ in range(prg_units * 0x4000))
+    for seam in range(0x2000, len(prg), 0x2000):
+        address = seam - rng.randrange(5, 40)
+        prg[address : address + len(MESSAGE) + 1] = MESSAGE + b"\xff"
+    chr_rom = bytes(rng.getrandbits(8) for _ in range(chr_units * 0x2000))
+    return bytes(header + prg + chr_rom)
+
+
+class TestBankParallel:
+    """Test bank splitting and process-pool detection."""
+
+    def test_bank_ranges_nrom(self, table):
+        """Test 16KB PRG banks plus 8KB CHR banks for mapper 0."""
+        detector = TextDetector(table, engine="python")
+        rom = _ines_rom(2, 1, 0, random.Random(1))
+        assert detector._bank_ranges(rom) == [
+            (0, 0x4010),
+            (0x4010, 0x8010),
+            (0x8010, 0xA010),
+        ]
+
+    def test_bank_ranges_mmc3(self, table):
+        """Test MMC3 PRG is split into 8KB banks."""
+        detector = TextDetector(table, engine="python")
+        rom = _ines_rom(2, 0, 4, random.Random(1))
+        assert [end for _, end in detector._bank_ranges(rom)] == [
+            0x2010,
+            0x4010,
+            0x6010,
+            0x8010,
+        ]
+
+    def test_bank_ranges_headerless(self, table):
+        """Test data without an iNES header is split into 16KB banks."""
+        detector = TextDetector(table, engine="python")
+        ranges = detector._bank_ranges(bytes(0x9000))
+        assert ranges == [(0, 0x4000), (0x4000, 0x8000), (0x8000, 0x9000)]
+
+    def test_configure_rejects_negative_workers(self, table):
+        """Test negative worker counts are rejected."""
+        detector = TextDetector(table, engine="python")
+        with pytest.raises(ValueError):
+            detector.configure({"workers": -1})
+
+    @pytest.mark.parametrize(
+        "engine", ["python", pytest.param("numpy", marks=requires_numpy)]
+    )
+    def test_matches_single_process(self, table, engine):
+        """Test parallel detection returns the single-process result."""
+        rom = _ines_rom(2, 1, 4, random.Random(99))
+        detector = TextDetector(table, engine=engine)
+        detector.configure({"entropy_step_size": 5})
+        expected = detector.detect_text_regions(rom)
+
+        detector.configure({"workers": 2})
+        assert detector.detect_text_regions(rom) == expected
+        assert any("QUICK" in c.sample_text for c in expected)
+
+
+class TestStreaming:
+    """Test streaming and top-K candidate selection."""
+
+    def test_iter_matches_detect(self, table):
+        """Test streamed candidates are the detected ones, by address."""
+        rom = _ines_rom(2, 1, 4, random.Random(5))
+        detector = TextDetector(table, engine="python")
+        streamed = list(detector.iter_text_regions(rom))
+
+        assert [c.address for c in streamed] == sorted(c.address for c in streamed)
+        assert sorted(
+            streamed, key=lambda c: c.confidence, reverse=True
+        ) == detector.detect_text_regions(rom)
+
+    def test_iter_yields_before_scan_completes(self, table, monkeypatch):
+        """Test the first candidate arrives before later banks are scanned."""
+        rom = _ines_rom(2, 1, 4, random.Random(5))
+        detector = TextDetector(table, engine="python")
+        scanned = []
+        original = TextDetector._detect_all
+
+        def spy(self, data):
+            scanned.append(len(data))
+            return original(self, data)
+
+        monkeypatch.setattr(TextDetector, "_detect_all", spy)
+        next(detector.iter_text_regions(rom))
+        assert len(scanned) < len(detector._bank_ranges(rom))
+
+    @pytest.mark.parametrize("top_k", [0, 1, 5, 1000])
+    def test_top_k(self, table, rom_data, top_k):
+        """Test top_k equals the first K of the full result."""
+        detector = TextDetector(table, engine="python")
+        expected = detector.detect_text_regions(rom_data)[:top_k]
+        assert detector.detect_text_regions(rom_data, top_k=top_k) == expected
+
+    def test_top_k_tie_order(self):
+        """Test equal confidences keep their original order."""
+        from src.detector import _select_top
+
+        candidates = [_candidate(i, 10, 0.5) for i in range(6)]
+        assert [c.address for c in _select_top(iter(candidates), 3)] == [0, 1, 2]
+
+
+def _shifted_table(table, shift):
+    """Copy of ``table`` with every character moved ``shift`` bytes up."""
+    shifted = EncodingTable()
+    for byte, char in table.byte_to_char.items():
+        shifted.byte_to_char[(byte + shift) & 0xFF] = char
+    shifted.control_codes = dict(table.control_codes)
+    return shifted
+
+
+class TestTableRanking:
+    """Test ranking encoding tables by text coverage."""
+
+    def test_matching_table_ranks_first(self, table, rom_data):
+        """Test the table the text was written with wins."""
+        detector = TextDetector(table, engine="python")
+        detector.configure({"entropy_step_size": 4})
+        ranking = detector.rank_tables(
+            rom_data,
+            {"shifted": _shifted_table(table, 0x40), "ascii": table},
+        )
+        assert [score.name for score in ranking] == ["ascii", "shifted"]
+        assert ranking[0].text_windows > ranking[1].text_windows
+        assert 0 < ranking[0].coverage <= 1
+        assert ranking[0].mean_confidence >= detector.confidence_threshold
+
+    def test_no_tables(self, table, rom_data):
+        """Test ranking nothing returns an empty list."""
+        detector = TextDetector(table, engine="python")
+        assert detector.rank_tables(rom_data, {}) == []
+
+    def test_load_table_dir(self, table, tmp_path):
+        """Test every parseable .tbl in a directory is loaded."""
+        (tmp_path / "broken.tbl").write_text("ZZ=A\n", encoding="utf-8")
+        tables = load_table_dir(str(tmp_path))
+        assert list(tables) == ["ascii.tbl"]
+
+    @requires_numpy
+    def test_numpy_matches(self, table, rom_data):
+        """Test the table x window matrix gives the same ranking."""
+        tables = {"ascii": table, "shifted": _shifted_table(table, 0x21)}
+        python = TextDetector(table, engine="python")
+        vectorized = TextDetector(table, engine="numpy")
+        expected = python.rank_tables(rom_data, tables)
+        result = vectorized.rank_tables(rom_data, tables)
+
+        assert [(s.name, s.text_windows) for s in result] == [
+            (s.name, s.text_windows) for s in expected
+        ]
+        for got, want in zip(result, expected):
+            assert got.mean_confidence == pytest.approx(want.mean_confidence)
+
+
+@requires_numpy
+class TestNumpyEngine:
+    """Test the NumPy engine matches the pure-Python engine."""
+
+    def test_entropy_matches(self, table, rom_data):
+        """Test entropy candidates are identical."""
+        python = TextDetector(table, engine="python")
+        vectorized = TextDetector(table, engine="numpy")
+        data = np.frombuffer(rom_data, dtype=np.uint8)
+        assert vectorized._detect_by_entropy_np(
+            rom_data, data
+        ) == python._detect_by_entropy(rom_data)
+
+    def test_frequency_matches(self, table, rom_data):
+        """Test frequency candidates are identical."""
+        python = TextDetector(table, engine="python")
+        vectorized = TextDetector(table, engine="numpy")
+        data = np.frombuffer(rom_data, dtype=np.uint8)
+        assert vectorized._detect_by_frequency_np(
+            rom_data, data
+        ) == python._detect_by_frequency(rom_data)
+
+    def test_terminators_match(self, table, rom_data):
+        """Test terminator candidates are identical."""
+        python = TextDetector(table, engine="python")
+        vectorized = TextDetector(table, engine="numpy")
+        data = np.frombuffer(rom_data, dtype=np.uint8)
+        assert vectorized._detect_by_terminators_np(
+            rom_data, data
+        ) == python._detect_by_terminators(rom_data)
+
+    def test_detect_text_regions_matches(self, table, rom_data):
+        """Test the full detection result is identical."""
+        python = TextDetector(table, engine="python")
+        vectorized = TextDetector(table, engine="numpy")
+        assert vectorized.detect_text_regions(
+            rom_data
+        ) == python.detect_text_regions(rom_data)
+
+    def test_entropy_step_one_matches(self, table, rom_data):
+        """Test configured window and step are honoured by both engines."""
+        settings = {"entropy_window_size": 24, "entropy_step_size": 1}
+        python = TextDetector(table, engine="python")
+        vectorized = TextDetector(table, engine="numpy")
+        python.configure(settings)
+        vectorized.configure(settings)
+        data = rom_data[:4096]
+        assert vectorized._detect_by_entropy_np(
+            data, np.frombuffer(data, dtype=np.uint8)
+        ) == python._detect_by_entropy(data)
+
+    def test_short_rom(self, table):
+        """Test data shorter than a window yields no candidates."""
+        detector = TextDetector(table, engine="numpy")
+        assert detector.detect_text_regions(b"HI") == []
@@ -0,0 +1,114 @@
+"""Tests for the DTE/MTE dictionary compression planner."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from src.dte_planner import DTEPlanner
+from src.encoding import EncodingTable
+from src.table_builder import TableBuilder
+
+SCRIPT = [
+    "THE KING IS IN THE CASTLE.<END>",
+    "GO TO THE TOWER IN THE NORTH.<END>",
+    "THE SWORD IS THERE.<NEWLINE>TAKE IT!<DELAY:FF><END>",
+    "IT IS DANGEROUS TO GO ALONE.<END>",
+]
+
+
+@pytest.fixture
+def table():
+    """Uppercase letters and punctuation at 0x00-0x2F, codes at 0xFE-0xFF."""
+    table = EncodingTable()
+    chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZ .,!?#"
+    for byte_value, char in enumerate(chars):
+        table._parse_table_line(f"{byte_value:02X}={char}")
+    table._parse_table_line("FE=<NEWLINE>")
+    table._parse_table_line("FF=<END>")
+    table._parse_table_line("F0XX=<DELAY:XX>")
+    return table
+
+
+class TestDTEPlanner:
+    """Tests for DTEPlanner."""
+
+    def test_unused_bytes(self, table):
+        planner = DTEPlanner(table)
+        free = planner.unused_bytes(reserved=[0x80])
+
+        assert free[0] == 0x20
+        assert 0x80 not in free
+        assert 0xF0 not in free  # Leading byte of the DELAY pattern
+        assert 0xFE not in free and 0xFF not in free
+
+    def test_dte_plan_saves_space(self, table):
+        plan = DTEPlanner(table).plan(SCRIPT)
+
+        assert plan.entries
+        assert all(len(entry.text) == 2 for entry in plan.entries)
+        assert all(entry.uses > 0 for entry in plan.entries)
+        assert {"TH", "HE"} & {entry.text for entry in plan.entries}
+        assert plan.compressed_bytes < plan.original_bytes
+        assert plan.original_bytes == sum(
+            len(table.encode_string(text)) for text in SCRIPT
+        )
+
+    def test_mte_entries_are_longer(self, table):
+        dte = DTEPlanner(table).plan(SCRIPT)
+        mte = DTEPlanner(table, max_entry_length=6).plan(SCRIPT)
+
+        assert max(len(entry.text) for entry in mte.entries) > 2
+        assert mte.saved_bytes >= dte.saved_bytes
+
+    def test_entries_never_span_control_codes(self, table):
+        plan = DTEPlanner(table, max_entry_length=8).plan(SCRIPT)
+
+        for entry in plan.entries:
+            assert "<" not in entry.text and ">" not in entry.text
+            assert "#" not in entry.text
+
+    def test_max_entries(self, table):
+        plan = DTEPlanner(table).plan(SCRIPT, max_entries=3)
+
+        assert len(plan.entries) <= 3
+        assert all(0x20 <= entry.byte_value <= 0x22 for entry in plan.entries)
+
+    def test_bank_report(self, table):
+        addresses = [0x0010, 0x0100, 0x4010, 0x4100]
+        plan = DTEPlanner(table).plan(SCRIPT, addresses)
+
+        assert set(plan.banks) == {0, 1}
+        assert sum(bank.saved_bytes for bank in plan.banks.values()) == (
+            plan.saved_bytes
+        )
+
+    def test_unencodable_strings_skipped(self, table):
+        plan = DTEPlanner(table).plan(SCRIPT + ["lowercase"])
+
+        assert plan.skipped == [len(SCRIPT)]
+
+    def test_invalid_settings(self, table):
+        with pytest.raises(ValueError):
+            DTEPlanner(table, max_entry_length=1)
+        with pytest.raises(ValueError):
+            DTEPlanner(table, bank_size=0)
+
+    def test_write_table_round_trip(self, table):
+        planner = DTEPlanner(table, max_entry_length=4)
+        plan = planner.plan(SCRIPT)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = planner.write_table(plan, "game", TableBuilder(tmpdir))
+            assert result.success is True
+            assert "Dictionary (DTE/MTE)" in Path(result.table_path).read_text()
+
+            extended = EncodingTable(result.table_path)
+
+        for entry in plan.entries:
+            assert extended.decode_byte(entry.byte_value) == entry.text
+        compressed = [extended.encode_string(text) for text in SCRIPT]
+        assert sum(map(len, compressed)) == plan.compressed_bytes
+        assert [extended.decode_bytes(data) for data in compressed] == [
+            text.split("<END>")[0] for text in SCRIPT
+        ]
@@ -3,9 +3,14 @@ Tests for encoding table functionality.
 """
 
 import os
+import pickle
+import shutil
+import tempfile
 import unittest
+from pathlib import Path
 
-from src.encoding import EncodingTable
+from src.compiled_table import compiled_path
+from src.encoding import EncodingTable, load_cached_table
 
 
 class TestEncodingTable(unittest.TestCase):
@@ -89,6 +94,383 @@ class TestEncodingTable(unittest.TestCase):
         result = table.encode_char("A")
         self.assertIsNone(result)
 
+    def test_decode_bytes_window(self):
+        """Test decoding with start and length."""
+        table = EncodingTable(self.table_path)
+        data = b"\x20\x41\x42\x99\x43\xff\x41"
+
+        self.assertEqual(table.decode_bytes(data, start=1, length=2), "AB")
+        self.assertEqual(table.decode_bytes(data, start=1), "AB<UNK:99>C")
+        self.assertEqual(table.decode_bytes(memoryview(data), start=4), "C")
+
+    def test_decode_many(self):
+        """Test bulk decoding matches decode_bytes span by span."""
+        table = EncodingTable(self.table_path)
+        table._parse_table_line("00=<NULL>")
+        buffers = [b"ABC", b"A\xfeB\xffC", b"\x00AB", b"", b"\x99\x41"]
+
+        self.assertEqual(
+            table.decode_many(buffers), [table.decode_bytes(b) for b in buffers]
+        )
+        self.assertEqual(
+            table.decode_many(buffers, length=1), ["A", "A", "", "", "<UNK:99>"]
+        )
+
+    def test_decode_tables_rebuilt_on_change(self):
+        """Test compiled lookups follow new mappings."""
+        table = EncodingTable(self.table_path)
+        self.assertEqual(table.decode_bytes(b"AD"), "A<UNK:44>")
+        first = table.decode_tables()
+        self.assertIs(table.decode_tables(), first)
+
+        table._parse_table_line("44=D")
+        self.assertEqual(table.decode_bytes(b"AD"), "AD")
+
+        table._parse_table_line("43=<END>")
+        self.assertEqual(table.decode_bytes(b"ABCD"), "AB")
+        self.assertEqual(table.decode_tables().terminators[0xFF], 1)
+        self.assertEqual(table.decode_tables().terminators[0x41], 0)
+
+    def test_encode_longest_match(self):
+        """Test multi-character entries are preferred over single characters."""
+        table = EncodingTable(self.table_path)
+        table._parse_table_line("80=AB")
+        table._parse_table_line("81=ABC")
+
+        self.assertEqual(table.encode_string("ABCAB"), b"\x81\x80")
+        self.assertEqual(table.encode_string("ABA"), b"\x80\x41")
+        self.assertEqual(table.encode_string("A<END>"), b"\x41\xff")
+
+    def test_encode_errors(self):
+        """Test unknown control codes and characters raise."""
+        table = EncodingTable(self.table_path)
+
+        with self.assertRaisesRegex(ValueError, "Unknown control code: <FOO>"):
+            table.encode_string("A<FOO>B")
+        with self.assertRaisesRegex(ValueError, "Cannot encode character: <"):
+            table.encode_string("A<B")
+        with self.assertRaisesRegex(ValueError, "Cannot encode character: Z"):
+            table.encode_string("AZ")
+
+    def test_control_code_byte(self):
+        """Test reverse control code lookup uses the first listed byte."""
+        table = EncodingTable(self.table_path)
+        table._parse_table_line("FD=<END>")
+
+        self.assertEqual(table.control_code_byte("<END>"), 0xFF)
+        self.assertEqual(table.control_code_byte("<NEWLINE>"), 0xFE)
+        self.assertIsNone(table.control_code_byte("<WAIT>"))
+
+    def test_multi_byte_pattern_round_trip(self):
+        """Test F0XX-style parameterized codes decode and encode."""
+        table = EncodingTable(self.table_path)
+
+        # A parameter byte equal to the terminator doesn't end the string
+        self.assertEqual(
+            table.decode_bytes(b"\x41\xf0\xff\x42\xff\x43"), "A<DELAY:FF>B"
+        )
+        self.assertEqual(table.encode_string("A<DELAY:FF>B"), b"\x41\xf0\xff\x42")
+        self.assertEqual(table.encode_string("<DELAY:0a>"), b"\xf0\x0a")
+
+        # A truncated pattern decodes its leading byte on its own
+        self.assertEqual(table.decode_bytes(b"\x41\xf0"), "A<UNK:F0>")
+
+    def test_multi_byte_pattern_parameter_order(self):
+        """Test patterns with several parameters in any byte order."""
+        table = EncodingTable(self.table_path)
+        table._parse_table_line("F1XXYY=<POS:XX,YY>")
+        table._parse_table_line("F2YYXX=<SWAP:XX,YY>")
+
+        for text, data in [
+            ("<POS:01,FF>C", b"\xf1\x01\xff\x43"),
+            ("<SWAP:12,34>", b"\xf2\x34\x12"),
+        ]:
+            self.assertEqual(table.encode_string(text), data)
+            self.assertEqual(table.decode_bytes(data), text)
+
+        with self.assertRaisesRegex(ValueError, "Unknown control code"):
+            table.encode_string("<POS:1,2>")
+
+    def test_invalid_multi_byte_pattern(self):
+        """Test malformed patterns are rejected when the table loads."""
+        table = EncodingTable()
+
+        for line in ["F0X=<A:XX>", "XXF0=<A:XX>", "F0XXZZ=<A:XX>"]:
+            with self.assertRaises(ValueError):
+                table._parse_table_line(line)
+
+
+class TestTableCache(unittest.TestCase):
+    """Test cases for the shared table cache."""
+
+    def setUp(self):
+        """Copy the test table so it can be edited."""
+        self.tmpdir = tempfile.mkdtemp()
+        self.table_path = os.path.join(self.tmpdir, "game.tbl")
+        shutil.copy(
+            os.path.join(os.path.dirname(__file__), "test_table.tbl"), self.table_path
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_same_file_is_parsed_once(self):
+        """Test equivalent paths return the same shared table."""
+        table = load_cached_table(self.table_path)
+        same = load_cached_table(os.path.join(self.tmpdir, ".", "game.tbl"))
+
+        self.assertIs(table, same)
+        self.assertEqual(table.decode_bytes(b"ABC"), "ABC")
+
+    def test_edited_file_is_reloaded(self):
+        """Test a changed file gets a fresh table."""
+        table = load_cached_table(self.table_path)
+        with open(self.table_path, "a", encoding="utf-8") as f:
+            f.write("44=D\n")
+
+        reloaded = load_cached_table(self.table_path)
+        self.assertIsNot(table, reloaded)
+        self.assertEqual(reloaded.decode_byte(0x44), "D")
+        self.assertEqual(table.decode_byte(0x44), "<UNK:44>")
+
+    def test_cached_tables_are_read_only(self):
+        """Test shared tables can't be modified."""
+        table = load_cached_table(self.table_path)
+
+        with self.assertRaises(TypeError):
+            table._parse_table_line("44=D")
+        with self.assertRaises(TypeError):
+            table.byte_to_char[0x44] = "D"
+        with self.assertRaises(TypeError):
+            table.load_table(self.table_path)
+
+    def test_frozen_table_pickles(self):
+        """Test frozen tables survive pickling (used by process pools)."""
+        table = pickle.loads(pickle.dumps(load_cached_table(self.table_path)))
+
+        self.assertTrue(table.frozen)
+        self.assertEqual(table.encode_string("A<DELAY:01>"), b"\x41\xf0\x01")
+        with self.assertRaises(TypeError):
+            table.char_to_byte["D"] = 0x44
+
+    def test_missing_file(self):
+        """Test a missing table raises FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            load_cached_table(os.path.join(self.tmpdir, "missing.tbl"))
+
+
+class TestCompiledTable(unittest.TestCase):
+    """Test cases for compiled (memory-mapped) tables."""
+
+    def setUp(self):
+        """Write a table with single- and two-byte codes."""
+        self.tmpdir = tempfile.mkdtemp()
+        self.table_path = os.path.join(self.tmpdir, "game.tbl")
+        with open(self.table_path, "w", encoding="utf-8") as f:
+            f.write(
+                "20= \n41=A\n42=B\n80=the\nFE=<NEWLINE>\nFF=<END>\n"
+                "F0XX=<DELAY:XX>\n8140=亜\n8141=唖\n81FF=娃\n"
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_first_load_writes_compiled_file(self):
+        """Test parsing a table writes its compiled form next to it."""
+        table = EncodingTable(self.table_path)
+
+        self.assertTrue(os.path.exists(self.table_path + "c"))
+        self.assertIsNone(table._compiled)
+
+    def test_compile_false_writes_nothing(self):
+        """Test loading with compile=False leaves the directory untouched."""
+        table = EncodingTable(self.table_path, compile=False)
+        cached = load_cached_table(self.table_path, compile=False)
+
+        self.assertFalse(os.path.exists(self.table_path + "c"))
+        self.assertEqual(table.encode_string("AB"), b"AB")
+        self.assertEqual(cached.encode_string("AB"), b"AB")
+
+    def test_compiled_load_matches_parsed(self):
+        """Test a mapped table behaves like the parsed one."""
+        parsed = EncodingTable(self.table_path)
+        mapped = EncodingTable(self.table_path)
+
+        self.assertIsNotNone(mapped._compiled)
+        for name in ("byte_to_char", "char_to_byte", "control_codes"):
+            self.assertEqual(
+                list(getattr(mapped, name).items()),
+                list(getattr(parsed, name).items()),
+            )
+        self.assertEqual(mapped.multi_byte_patterns, parsed.multi_byte_patterns)
+
+        text = "the A亜<DELAY:FF>唖 B<NEWLINE>娃"
+        encoded = parsed.encode_string(text)
+        self.assertEqual(mapped.encode_string(text), encoded)
+        self.assertEqual(mapped.decode_bytes(encoded + b"\xff"), text)
+        self.assertEqual(mapped.control_code_byte("<END>"), 0xFF)
+        self.assertEqual(mapped.char_to_byte[" "], 0x20)
+        self.assertNotIn("<END>", mapped.char_to_byte)
+
+    def test_stale_compiled_file_is_rebuilt(self):
+        """Test editing the .tbl file invalidates its compiled form."""
+        EncodingTable(self.table_path)
+        with open(self.table_path, "a", encoding="utf-8") as f:
+            f.write("43=C\n")
+
+        table = EncodingTable(self.table_path)
+        self.assertIsNone(table._compiled)
+        self.assertEqual(table.decode_byte(0x43), "C")
+        self.assertEqual(EncodingTable(self.table_path).decode_byte(0x43), "C")
+
+    def test_corrupt_compiled_file_is_ignored(self):
+        """Test an unreadable compiled file falls back to parsing."""
+        EncodingTable(self.table_path)
+        with open(compiled_path(Path(self.table_path)), "r+b") as f:
+            f.write(b"JUNK")
+
+        table = EncodingTable(self.table_path)
+        self.assertEqual(table.decode_bytes(b"\x81\x40AB"), "亜AB")
+
+    def test_two_byte_codes(self):
+        """Test two-byte codes decode and encode big-endian."""
+        table = EncodingTable(self.table_path)
+
+        self.assertEqual(table.encode_string("亜A"), b"\x81\x40\x41")
+        self.assertEqual(table.decode_byte(0x8141), "唖")
+        # The second byte of a two-byte code isn't a terminator
+        self.assertEqual(table.decode_bytes(b"\x81\xffA\xff"), "娃A")
+        # A lead byte without a matching second byte decodes on its own
+        self.assertEqual(table.decode_bytes(b"\x81\x20"), "<UNK:81> ")
+
+        with self.assertRaises(ValueError):
+            table._parse_table_line("814041=x")
+
+    def test_compiled_table_can_be_extended(self):
+        """Test loading more lines into a mapped table."""
+        EncodingTable(self.table_path)
+        table = EncodingTable(self.table_path)
+
+        table._parse_table_line("43=C")
+        self.assertIsNone(table._compiled)
+        self.assertEqual(table.encode_string("C亜"), b"\x43\x81\x40")
+        self.assertEqual(table.decode_byte(0x41), "A")
+
+    def test_cached_compiled_table_pickles(self):
+        """Test shared mapped tables survive pickling."""
+        EncodingTable(self.table_path)
+        table = load_cached_table(self.table_path)
+        self.assertIsNotNone(table._compiled)
+
+        copy = pickle.loads(pickle.dumps(table))
+        self.assertTrue(copy.frozen)
+        self.assertEqual(copy.encode_string("亜A"), b"\x81\x40\x41")
+        with self.assertRaises(TypeError):
+            table.byte_to_char[0x43] = "C"
+
+
+class TestOptimalEncoding(unittest.TestCase):
+    """Test cases for shortest-length encoding."""
+
+    def setUp(self):
+        """Create a table with overlapping multi-character entries."""
+        self.table = EncodingTable()
+        for line in [
+            "41=A",
+            "42=B",
+            "43=C",
+            "44=D",
+            "80=AB",
+            "81=BCD",
+            "FF=<END>",
+            "F0XX=<DELAY:XX>",
+            "8140=亜",
+        ]:
+            self.table._parse_table_line(line)
+
+    def test_beats_greedy_on_overlapping_entries(self):
+        """Test the optimal encoding is shorter where greedy is not."""
+        self.assertEqual(self.table.encode_string("ABCD"), b"\x80\x43\x44")
+        self.assertEqual(self.table.encode_optimal("ABCD"), b"\x41\x81")
+
+    def test_never_longer_than_greedy(self):
+        """Test optimal encoding round-trips and never loses to greedy."""
+        for text in ["", "A", "ABAB", "CABCDD<DELAY:05>亜AB<END>", "DCBA"]:
+            encoded = self.table.encode_optimal(text)
+            self.assertLessEqual(len(encoded), len(self.table.encode_string(text)))
+            self.assertEqual(self.table.decode_bytes(encoded), text.split("<END>")[0])
+
+    def test_unencodable_text_raises(self):
+        """Test errors match the greedy encoder's."""
+        with self.assertRaisesRegex(ValueError, "Cannot encode character: Z"):
+            self.table.encode_optimal("ABZ")
+        with self.assertRaisesRegex(ValueError, "Unknown control code"):
+            self.table.encode_optimal("A<WAIT>")
+
+    def test_truncate_optimal(self):
+        """Test the longest fitting prefix is found."""
+        self.assertEqual(self.table.truncate_optimal("ABCDA", 2), ("ABCD", b"\x41\x81"))
+        # A prefix ending inside a control code can't be encoded
+        self.assertEqual(self.table.truncate_optimal("A<END>", 1), ("A", b"\x41"))
+        self.assertEqual(self.table.truncate_optimal("ZA", 5), ("", b""))
+
+    def test_compiled_table(self):
+        """Test a memory-mapped table gives the same encoding."""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        table_path = os.path.join(tmpdir, "game.tbl")
+        with open(table_path, "w", encoding="utf-8") as f:
+            f.write("41=A\n42=B\n43=C\n44=D\n80=AB\n81=BCD\n")
+
+        EncodingTable(table_path)
+        mapped = EncodingTable(table_path)
+        self.assertIsNotNone(mapped._compiled)
+        self.assertEqual(mapped.encode_optimal("ABCD"), b"\x41\x81")
+
+
+class TestEncodeBatch(unittest.TestCase):
+    """Test cases for batch encoding."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.table = EncodingTable(
+            os.path.join(os.path.dirname(__file__), "test_table.tbl")
+        )
+
+    def test_results_match_encode_string(self):
+        """Test every item is encoded like encode_string."""
+        texts = ["ABC", "", "A<DELAY:05>B", "CAB BA<NEWLINE>"]
+        results = self.table.encode_batch(texts)
+
+        self.assertEqual(len(results), len(texts))
+        for text, result in zip(texts, results):
+            self.assertTrue(result.ok)
+            self.assertIsNone(result.error_offset)
+            self.assertEqual(result.data, self.table.encode_string(text))
+            self.assertEqual(result.length, len(result.data))
+
+    def test_errors_are_reported_not_raised(self):
+        """Test failures carry the offset and the encode_string message."""
+        results = self.table.encode_batch(["AB~C", "A<BOGUS>", "BA"])
+
+        self.assertFalse(results[0].ok)
+        self.assertEqual(results[0].error_offset, 2)
+        self.assertEqual(results[0].error, "Cannot encode character: ~")
+        self.assertEqual(results[0].data, b"\x41\x42")
+        self.assertEqual(results[1].error_offset, 1)
+        self.assertEqual(results[1].error, "Unknown control code: <BOGUS>")
+        self.assertTrue(results[2].ok)
+
+    def test_optimal(self):
+        """Test the optimal mode uses the shortest encoding."""
+        table = EncodingTable()
+        for line in ["41=A", "42=B", "43=C", "44=D", "80=AB", "81=BCD"]:
+            table._parse_table_line(line)
+
+        ok, bad = table.encode_batch(["ABCD", "ABX"], optimal=True)
+        self.assertEqual(ok.data, b"\x41\x81")
+        self.assertEqual((bad.error_offset, bad.data), (2, b"\x80"))
+
 
 if __name__ == "__main__":
     unittest.main()
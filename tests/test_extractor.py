@@ -8,7 +8,8 @@ import unittest
 from pathlib import Path
 
 from src.encoding import EncodingTable
-from src.extractor import TextExtractor
+from src.extractor import TextExtractor, iter_string_records
+from src.string_bank import StringBank
 
 
 class TestTextExtractor(unittest.TestCase):
@@ -75,6 +76,35 @@ validation:
         self.assertEqual(strings[0].decoded_text, "ABC ")
         self.assertEqual(strings[0].length, 5)  # Including terminator in original bytes
 
+    def test_extract_pointer_table(self):
+        """Test each pointer's string ends at the next terminator."""
+        rom_data = bytearray(100)
+        rom_data[0x10:0x16] = b"\x41\x42\xff\x43\x20\x00"  # "AB", "C "
+        rom_data[0x40:0x46] = b"\x10\x00\x13\x00\x58\x00"
+        rom_data[0x58:0x60] = b"\x42" * 8  # Runs to the end of the ROM
+        rom_path = os.path.join(self.temp_dir, "pointers.rom")
+        with open(rom_path, "wb") as f:
+            f.write(rom_data)
+
+        config_path = os.path.join(self.temp_dir, "pointers.yaml")
+        with open(config_path, "w") as f:
+            f.write(
+                f"""
+text_detection:
+  method: "pointer_table"
+  encoding_table: "{self.table_path}"
+  pointer_table:
+    address: 0x40
+    count: 3
+"""
+            )
+
+        extractor = TextExtractor(config_path)
+        strings = extractor.extract_from_rom(rom_path)
+
+        self.assertEqual([s.decoded_text for s in strings], ["AB", "C ", "B" * 8])
+        self.assertEqual([s.address for s in strings], [0x10, 0x13, 0x58])
+
     def test_export_to_csv(self):
         """Test CSV export functionality."""
         extractor = TextExtractor(self.config_path)
@@ -109,6 +139,92 @@ validation:
             self.assertIn("strings", data)
             self.assertEqual(len(data["strings"]), 1)
 
+    def test_streamed_json_matches_json_dump(self):
+        """Test the streamed JSON export is the same as dumping it whole."""
+        import json
+
+        extractor = TextExtractor(self.config_path)
+        strings = extractor.extract_from_rom(self.rom_path) * 2
+
+        for exported in (strings, []):
+            json_path = os.path.join(self.temp_dir, "output.json")
+            extractor.export_to_json(json_path, iter(exported))
+
+            with open(json_path, "r", encoding="utf-8") as f:
+                text = f.read()
+            self.assertEqual(
+                text, json.dumps(json.loads(text), indent=2, ensure_ascii=False)
+            )
+            self.assertEqual(len(json.loads(text)["strings"]), len(exported))
+
+    def test_export_to_jsonl(self):
+        """Test JSON Lines export reads back one record per string."""
+        extractor = TextExtractor(self.config_path)
+        extractor.extract_from_rom(self.rom_path)
+
+        jsonl_path = os.path.join(self.temp_dir, "output.jsonl")
+        json_path = os.path.join(self.temp_dir, "output.json")
+        extractor.export_to_jsonl(jsonl_path)
+        extractor.export_to_json(json_path)
+
+        records = list(iter_string_records(jsonl_path))
+        self.assertEqual(records, list(iter_string_records(json_path)))
+        self.assertEqual(records[0]["decoded_text"], "ABC ")
+        self.assertEqual(records[0]["original_bytes"], "41424320ff")
+
+    def test_extract_to_file(self):
+        """Test extracting straight to a file without keeping the strings."""
+        extractor = TextExtractor(self.config_path)
+
+        jsonl_path = os.path.join(self.temp_dir, "output.jsonl")
+        count = extractor.extract_to_file(self.rom_path, jsonl_path)
+
+        self.assertEqual(count, 1)
+        self.assertEqual(extractor.extracted_strings, [])
+        self.assertEqual(len(list(iter_string_records(jsonl_path))), 1)
+        with self.assertRaises(ValueError):
+            extractor.extract_to_file(self.rom_path, "output.txt")
+
+    def test_export_to_bank(self):
+        """Test string bank export keeps the raw bytes and metadata."""
+        extractor = TextExtractor(self.config_path)
+        extractor.extract_from_rom(self.rom_path)
+
+        bank_path = os.path.join(self.temp_dir, "output.bank")
+        extractor.export_to_bank(bank_path)
+
+        with StringBank.open(bank_path) as bank:
+            string = bank.get("string_001")
+            self.assertEqual(string.original_bytes, b"\x41\x42\x43\x20\xff")
+            self.assertEqual(string.decoded_text, "ABC ")
+            self.assertEqual(bank.metadata["game_info"]["name"], "Test Game")
+        self.assertEqual(
+            list(iter_string_records(bank_path))[0]["original_bytes"], "41424320ff"
+        )
+
+    def test_auto_detect_settings(self):
+        """Test the auto_detect block configures the detector."""
+        config_path = os.path.join(self.temp_dir, "auto.yaml")
+        with open(config_path, "w") as f:
+            f.write(
+                f"""
+text_detection:
+  method: "auto_detect"
+  encoding_table: "{self.table_path}"
+  auto_detect:
+    entropy_window_size: 16
+    entropy_step_size: 1
+    entropy_min: 1.0
+    confidence_threshold: 0.5
+"""
+            )
+
+        extractor = TextExtractor(config_path)
+        self.assertEqual(extractor.detector.entropy_window_size, 16)
+        self.assertEqual(extractor.detector.entropy_step_size, 1)
+        self.assertEqual(extractor.detector.entropy_min, 1.0)
+        self.assertEqual(extractor.detector.confidence_threshold, 0.5)
+
     def test_get_stats(self):
         """Test statistics generation."""
         extractor = TextExtractor(self.config_path)
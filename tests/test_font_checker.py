@@ -274,6 +274,38 @@ class TestFontCheckerWithEncodingTable:
             assert result.is_compatible is False
         finally:
             Path(temp_path).unlink(missing_ok=True)
+    
+    def test_batch_check_with_encoding_table(self):
+        """Test batch results match per-text checks."""
+        table = EncodingTable()
+        for i, c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZ"):
+            table._parse_table_line(f"{0x41+i:02X}={c}")
+        table._parse_table_line("20= ")
+        checker = FontChecker(encoding_table=table)
+        
+        texts = ["HELLO WORLD", "hello", "CAFÉ"]
+        result = checker.check_batch(texts, auto_fix=True)
+        
+        assert result.compatible_count == 1
+        assert result.all_missing_chars == set("helo") | {"É"}
+        for text, text_result in zip(texts, result.results):
+            expected = checker.check_text(text, auto_fix=True)
+            assert text_result.is_compatible == expected.is_compatible
+            assert text_result.missing_chars == expected.missing_chars
+    
+    def test_batch_check_with_multi_char_entries(self):
+        """Test a text the table encodes through a DTE/MTE entry."""
+        table = EncodingTable()
+        for line in ["80=the", "81=h", "82=e", "FF=[END]"]:
+            table._parse_table_line(line)
+        checker = FontChecker(encoding_table=table)
+        
+        for text in ["the", "he", "eh"]:
+            expected = checker.check_text(text, auto_fix=True)
+            result = checker.check_batch([text], auto_fix=True)
+            assert result.results[0] == expected
+        
+        assert checker.check_text("the").missing_chars == {"t"}
 
 
 class TestCheckFontCompatibilityFunction:
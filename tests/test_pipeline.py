@@ -0,0 +1,48 @@
+"""Tests for the translation pipeline's exports."""
+
+import pytest
+
+from src.pipeline import TranslationPipeline
+from src.project import TranslationEntry, TranslationProject
+from src.string_bank import BankString, StringBank, write_string_bank
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    rom_file = tmp_path / "game.nes"
+    rom_file.write_bytes(bytes(100))
+    project = TranslationProject(str(rom_file), output_dir=str(tmp_path / "out"))
+    project.translations = [
+        TranslationEntry("ptr_001", 0x10, "ABC", translated_text="XYZ"),
+        TranslationEntry("ptr_002", 0x20, "DE", translated_text="FG"),
+    ]
+    write_string_bank(
+        project.get_output_paths()["extracted_bank"],
+        [
+            BankString("ptr_001", 0x10, b"\x41\x42\x43\xff", "ABC"),
+            BankString("ptr_002", 0x20, b"\x44\x45\xff", "DE"),
+        ],
+    )
+    return TranslationPipeline(project)
+
+
+class TestTranslationsBank:
+    def test_keeps_original_bytes(self, pipeline):
+        pipeline._export_translations_bank()
+
+        paths = pipeline.project.get_output_paths()
+        with StringBank.open(paths["translated_bank"]) as bank:
+            assert bank.get("ptr_001").original_bytes == b"\x41\x42\x43\xff"
+            assert bank.get("ptr_002").translated_text == "FG"
+
+    def test_string_missing_from_extracted_bank(self, pipeline, capsys):
+        pipeline._export_translations_bank()  # An older, complete bank
+        paths = pipeline.project.get_output_paths()
+        pipeline.project.translations.append(
+            TranslationEntry("ptr_003", 0x30, "HI", translated_text="JK")
+        )
+
+        pipeline._export_translations_bank()
+
+        assert "ptr_003" in capsys.readouterr().out
+        assert not paths["translated_bank"].exists()  # Reinjection uses the CSV
@@ -0,0 +1,150 @@
+"""Tests for pointer table reading and writing."""
+
+import pytest
+
+import src.pointer_utils as pointer_utils
+from src.pointer_utils import (
+    PointerTable,
+    PointerUtils,
+    format_pointer_addresses,
+    parse_pointer_addresses,
+)
+
+
+@pytest.fixture(params=["numpy", "python"])
+def engine(request, monkeypatch):
+    """Run each test with and without NumPy."""
+    if request.param == "numpy" and pointer_utils.np is None:
+        pytest.skip("NumPy not installed")
+    if request.param == "python":
+        monkeypatch.setattr(pointer_utils, "np", None)
+    return request.param
+
+
+def targets(pointers):
+    return [p.target_address for p in pointers]
+
+
+class TestPointerTable:
+    @pytest.mark.parametrize(
+        "format_type, entries, expected",
+        [
+            ("little_endian_16bit", b"\x34\x12\x78\x56", [0x1234, 0x5678]),
+            ("big_endian_16bit", b"\x12\x34\x56\x78", [0x1234, 0x5678]),
+            ("little_endian_24bit", b"\x56\x34\x12\x03\x02\x01", [0x123456, 0x10203]),
+            ("big_endian_24bit", b"\x12\x34\x56\x01\x02\x03", [0x123456, 0x10203]),
+            ("split_16bit", b"\x34\x78\x12\x56", [0x1234, 0x5678]),
+        ],
+    )
+    def test_formats(self, engine, format_type, entries, expected):
+        rom_data = bytes(8) + entries
+        table = PointerTable(8, 2, format_type)
+
+        pointers = table.read(rom_data)
+
+        assert targets(pointers) == expected
+        assert [p.index for p in pointers] == [0, 1]
+
+    def test_split_high_address(self, engine):
+        rom_data = b"\x34\x78" + bytes(6) + b"\x12\x56"
+        table = PointerTable(0, 2, "split_16bit", high_address=8)
+
+        assert targets(table.read(rom_data)) == [0x1234, 0x5678]
+
+    def test_banked_interleaved(self, engine):
+        # $8010 in bank 2 and $A000 in bank 0, 16KB banks after a header
+        rom_data = b"\x10\x80\x02\x00\xa0\x00"
+        table = PointerTable(0, 2, "banked_16bit", base_offset=0x10)
+
+        pointers = table.read(rom_data)
+
+        assert targets(pointers) == [0x10 + 0x8010, 0x10 + 0x2000]
+        assert pointers[1].address == 3
+
+    def test_banked_separate_bank_table(self, engine):
+        rom_data = b"\x00\x80\x00\x90" + b"\x01\x03"
+        table = PointerTable(0, 2, "banked_16bit", bank_address=4, bank_size=0x2000)
+
+        assert targets(table.read(rom_data)) == [0x2000, 0x3 * 0x2000 + 0x1000]
+
+    def test_base_offset(self, engine):
+        table = PointerTable(0, 1, base_offset=0x18000)
+
+        assert targets(table.read(b"\x00\x01")) == [0x18100]
+
+    def test_large_table_matches_single_reads(self, engine):
+        rom_data = bytes(range(256)) * 64
+        pointers = PointerTable(0, 8000).read(rom_data)
+
+        assert targets(pointers) == [
+            PointerUtils.read_16bit_pointer(rom_data, i * 2) for i in range(8000)
+        ]
+
+    def test_past_end_of_rom(self, engine):
+        table = PointerTable(0, 3)
+
+        with pytest.raises(ValueError, match="beyond ROM size"):
+            table.read(b"\x00\x01\x02\x03\x04")
+        assert targets(table.read(b"\x00\x01\x02\x03\x04", strict=False)) == [
+            0x100,
+            0x302,
+        ]
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError, match="Unsupported pointer format"):
+            PointerTable(0, 1, "middle_endian_16bit")
+
+    def test_from_config(self):
+        table = PointerTable.from_config(
+            {"address": 0x10, "count": 4, "format": "split_16bit", "high_address": 0x20}
+        )
+
+        assert table == PointerTable(0x10, 4, "split_16bit", high_address=0x20)
+
+
+class TestPointerWrite:
+    @pytest.mark.parametrize(
+        "format_type", ["big_endian_16bit", "little_endian_24bit", "split_16bit"]
+    )
+    def test_update_round_trip(self, format_type):
+        rom_data = bytearray(64)
+        table = PointerTable(0, 2, format_type, base_offset=0x10)
+        pointers = table.read(rom_data)
+
+        PointerUtils.update_pointer_table(rom_data, pointers, {0x10: 0x30})
+
+        assert targets(table.read(rom_data)) == [0x30, 0x30]
+
+    def test_banked_write_keeps_window(self):
+        rom_data = bytearray(b"\x10\x80\x00")
+        table = PointerTable(0, 1, "banked_16bit")
+        pointer = table.read(rom_data)[0]
+
+        table.write(rom_data, pointer, 0x4000 * 3 + 0x20)
+
+        assert rom_data == bytearray(b"\x20\x80\x03")
+
+    def test_target_too_large(self):
+        rom_data = bytearray(2)
+        table = PointerTable(0, 1)
+
+        with pytest.raises(ValueError, match="too large"):
+            table.write(rom_data, table.read(rom_data)[0], 0x10000)
+
+    def test_compact_keeps_data_with_its_pointer(self):
+        # Table order differs from target order
+        rom_data = bytearray(b"\x08\x00\x04\x00" + bytes(12))
+        pointers = PointerTable(0, 2).read(rom_data)
+
+        changes = PointerUtils.compact_pointer_targets(
+            rom_data, pointers, [b"second", b"1st"]
+        )
+
+        assert changes == {0x04: 0x04, 0x08: 0x07}
+        assert rom_data[4:13] == b"1stsecond"
+
+
+def test_pointer_address_cells():
+    assert format_pointer_addresses([0x40, 0x1A2B3]) == "0x0040 0x1A2B3"
+    assert parse_pointer_addresses("0x0040 0x1A2B3") == [0x40, 0x1A2B3]
+    assert parse_pointer_addresses("") == parse_pointer_addresses(None) == []
@@ -3,11 +3,14 @@ Tests for text reinsertion functionality.
 """
 
 import csv
+import json
 import os
 import tempfile
 import unittest
 
+from src.extractor import TextExtractor
 from src.reinjector import TextReinjector
+from src.string_bank import StringBank, write_string_bank
 
 
 class TestTextReinjector(unittest.TestCase):
@@ -106,6 +109,32 @@ validation:
             # Should contain "DEE " (0x44, 0x45, 0x45, 0x20)
             self.assertEqual(modified_data[0x10:0x14], b"\x44\x45\x45\x20")
 
+    def test_overlong_translation_uses_shortest_encoding(self):
+        """Test a translation that only fits with optimal encoding."""
+        with open(self.table_path, "a") as f:
+            f.write("80=DE\n81=EAB\n")
+        reinjector = TextReinjector(self.config_path)
+        reinjector.load_translations_from_csv(self.csv_path)
+        string = reinjector.translated_strings[0]
+        string.translated_text = "DEABC "
+        # Greedy: "DE" + "A" + "B" + "C" + " ", one byte too many
+        string.translated_bytes = reinjector.encoding_table.encode_string("DEABC ")
+
+        results = reinjector._reinject_fixed_locations(bytearray(self.rom_data))
+
+        self.assertEqual(results["issues"], [])
+        self.assertEqual(string.translated_bytes, b"\x44\x81\x43\x20")
+
+    def test_truncation_counts_shortest_encoding(self):
+        """Test truncation keeps the longest prefix that can fit."""
+        with open(self.table_path, "a") as f:
+            f.write("80=AB\n81=BCD\n")
+        reinjector = TextReinjector(self.config_path)
+
+        # "A" + "BCD" fits in two bytes; greedy "AB" + "C" + "D" doesn't
+        self.assertEqual(reinjector._truncate_translation("ABCDE", 2), "ABCD")
+        self.assertEqual(reinjector._truncate_translation("ABCDE", 0), "")
+
     def test_get_stats(self):
         """Test statistics generation."""
         reinjector = TextReinjector(self.config_path)
@@ -394,5 +423,123 @@ validation:
         self.assertEqual(output_data[0x50:0x54], b"\xAA\xBB\xCC\xDD")
 
 
+
+class TestSharedPointerTargets(unittest.TestCase):
+    """Test strings referenced by several pointers are handled once."""
+
+    def setUp(self):
+        """Set up a pointer table whose first and third entries share a target."""
+        self.temp_dir = tempfile.mkdtemp()
+
+        self.table_path = os.path.join(self.temp_dir, "test.tbl")
+        with open(self.table_path, "w") as f:
+            f.write("41=A\n42=B\n43=C\n20= \nFF=<END>\n")
+
+        self.config_path = os.path.join(self.temp_dir, "test.yaml")
+        with open(self.config_path, "w") as f:
+            f.write(
+                f"""
+text_detection:
+  method: "pointer_table"
+  encoding_table: "{self.table_path}"
+  pointer_table:
+    address: 0x40
+    count: 3
+validation:
+  expected_size: 256
+"""
+            )
+
+        rom_data = bytearray(256)
+        rom_data[0x40:0x46] = b"\x80\x00\x84\x00\x80\x00"
+        rom_data[0x80:0x83] = b"\x41\x42\xff"  # "AB<END>"
+        rom_data[0x84:0x86] = b"\x43\xff"  # "C<END>"
+        self.rom_path = os.path.join(self.temp_dir, "test.rom")
+        with open(self.rom_path, "wb") as f:
+            f.write(rom_data)
+
+    def tearDown(self):
+        """Clean up."""
+        import shutil
+
+        shutil.rmtree(self.temp_dir)
+
+    def test_shared_string_translated_and_written_once(self):
+        """Test extraction, CSV export and reinsertion of a shared string."""
+        extractor = TextExtractor(self.config_path)
+        strings = extractor.extract_from_rom(self.rom_path)
+
+        self.assertEqual([s.decoded_text for s in strings], ["AB", "C"])
+        self.assertEqual(strings[0].pointer_addresses, [0x40, 0x44])
+
+        csv_path = os.path.join(self.temp_dir, "strings.csv")
+        extractor.export_to_csv(csv_path)
+        with open(csv_path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows[0]["pointer_addresses"], "0x0040 0x0044")
+        rows[0]["translated_text"] = "BA"
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+        reinjector = TextReinjector(self.config_path)
+        reinjector.load_translations_from_csv(csv_path)
+        shared = reinjector.translated_strings[0]
+        self.assertEqual(shared.pointer_addresses, [0x40, 0x44])
+
+        output_path = os.path.join(self.temp_dir, "output.rom")
+        result = reinjector.reinject_into_rom(self.rom_path, output_path)
+
+        with open(output_path, "rb") as f:
+            data = f.read()
+        self.assertEqual(result["reinsertion_results"]["pointers_updated"], 3)
+        self.assertEqual(data[0x80:0x85], b"\x42\x41\xff\x43\xff")
+        self.assertEqual(data[0x40:0x46], b"\x80\x00\x83\x00\x80\x00")
+
+
+    def test_load_translations_from_jsonl(self):
+        """Test translations are read from a JSON Lines export."""
+        extractor = TextExtractor(self.config_path)
+        jsonl_path = os.path.join(self.temp_dir, "strings.jsonl")
+        extractor.extract_to_file(self.rom_path, jsonl_path)
+
+        with open(jsonl_path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        records[0]["translated_text"] = "BA"
+        with open(jsonl_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+
+        reinjector = TextReinjector(self.config_path)
+        reinjector.load_translations_from_json(jsonl_path)
+
+        self.assertEqual(len(reinjector.translated_strings), 1)
+        self.assertEqual(reinjector.translated_strings[0].translated_bytes, b"BA")
+        self.assertEqual(
+            reinjector.translated_strings[0].pointer_addresses, [0x40, 0x44]
+        )
+
+    def test_load_translations_from_bank(self):
+        """Test translations are read from a string bank."""
+        extractor = TextExtractor(self.config_path)
+        bank_path = os.path.join(self.temp_dir, "strings.bank")
+        extractor.extract_to_file(self.rom_path, bank_path)
+
+        with StringBank.open(bank_path) as bank:
+            strings = list(bank)
+        strings[0].translated_text = "BA"
+        strings[1].translated_text = "CC"
+        strings[1].translated_bytes = b"\x43"  # Already encoded, used as is
+        write_string_bank(bank_path, strings)
+
+        reinjector = TextReinjector(self.config_path)
+        reinjector.load_translations_from_bank(bank_path)
+
+        shared, single = reinjector.translated_strings
+        self.assertEqual(shared.translated_bytes, b"BA")
+        self.assertEqual(shared.original_bytes, b"AB")
+        self.assertEqual(shared.pointer_addresses, [0x40, 0x44])
+        self.assertEqual(single.translated_bytes, b"\x43")
+
 if __name__ == "__main__":
     unittest.main()
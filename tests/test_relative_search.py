@@ -0,0 +1,122 @@
+"""Tests for relative search encoding discovery."""
+
+import random
+
+import pytest
+
+import src.relative_search as relative_search
+from src.relative_search import RelativeSearch, group_hits_by_base
+from src.table_builder import TableBuilder
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+GOJUON = relative_search.ORDERINGS["gojuon"]
+
+
+def encode(word, sequence, base):
+    """Encode a word with a font that starts ``sequence`` at ``base``."""
+    return bytes(base + sequence.index(char) for char in word)
+
+
+@pytest.fixture
+def rom_data():
+    """Random data with "ZELDA" planted twice using A=0x0A."""
+    rng = random.Random(42)
+    data = bytearray(rng.getrandbits(8) for _ in range(0x8000))
+    data[0x1234:0x1239] = encode("ZELDA", ALPHABET, 0x0A)
+    data[0x6000:0x6005] = encode("ZELDA", ALPHABET, 0x0A)
+    return bytes(data)
+
+
+@pytest.fixture(params=["numpy", "python"])
+def engine(request, monkeypatch):
+    """Run each test with and without NumPy."""
+    if request.param == "numpy" and relative_search.np is None:
+        pytest.skip("NumPy not installed")
+    if request.param == "python":
+        monkeypatch.setattr(relative_search, "np", None)
+    return request.param
+
+
+class TestRelativeSearch:
+    """Tests for the RelativeSearch class."""
+
+    def test_finds_word(self, rom_data, engine):
+        """Test planted words are found with the right base."""
+        hits = RelativeSearch().search(rom_data, "ZELDA")
+        assert [(hit.offset, hit.base) for hit in hits] == [
+            (0x1234, 0x0A),
+            (0x6000, 0x0A),
+        ]
+
+    def test_proposed_mappings(self, rom_data, engine):
+        """Test a hit proposes the whole alphabet."""
+        hit = RelativeSearch().search(rom_data, "ZELDA")[0]
+        assert hit.mappings[0x0A] == "A"
+        assert hit.mappings[0x0A + 25] == "Z"
+        assert len(hit.mappings) == 26
+
+    def test_lowercase_word(self, engine):
+        """Test lowercase words propose lowercase mappings."""
+        data = b"\x00" * 8 + encode("LINK", ALPHABET, 0x80) + b"\x00" * 8
+        hits = RelativeSearch().search(data, "link")
+        assert [hit.offset for hit in hits] == [8]
+        assert hits[0].mappings[0x80] == "a"
+
+    def test_engines_agree(self, rom_data, monkeypatch):
+        """Test the vectorized and pure-Python scans find the same offsets."""
+        if relative_search.np is None:
+            pytest.skip("NumPy not installed")
+        expected = RelativeSearch().search(rom_data, "ZEL")
+        monkeypatch.setattr(relative_search, "np", None)
+        assert RelativeSearch().search(rom_data, "ZEL") == expected
+
+    def test_katakana_gojuon(self, engine):
+        """Test katakana words match a gojuon-ordered font."""
+        word = "テスト"
+        hiragana = "".join(chr(ord(char) - 0x60) for char in word)
+        data = b"\xff" * 4 + encode(hiragana, GOJUON, 0x10) + b"\xff" * 4
+        hits = RelativeSearch("gojuon").search(data, word)
+        assert [(hit.offset, hit.base) for hit in hits] == [(4, 0x10)]
+        assert hits[0].mappings[0x10] == "ア"
+
+    def test_iroha_ordering(self, engine):
+        """Test the iroha ordering."""
+        sequence = relative_search.ORDERINGS["iroha"]
+        data = b"\x00" + encode("はにほ", sequence, 0x20) + b"\x00"
+        hits = RelativeSearch("iroha").search(data, "はにほ")
+        assert hits[0].offset == 1
+        assert hits[0].mappings[0x20] == "い"
+
+    def test_invalid_input(self):
+        """Test bad orderings and words are rejected."""
+        with pytest.raises(ValueError):
+            RelativeSearch("klingon")
+        with pytest.raises(ValueError):
+            RelativeSearch().search(b"", "A")
+        with pytest.raises(ValueError):
+            RelativeSearch().search(b"", "HI THERE")
+
+    def test_search_rom_prg_only(self, tmp_path, engine):
+        """Test iNES files are searched in PRG ROM with file offsets."""
+        header = b"NES\x1a" + bytes([1, 1]) + bytes(10)
+        prg = bytearray(0x4000)
+        prg[0x100:0x105] = encode("ZELDA", ALPHABET, 0x30)
+        chr_rom = bytearray(0x2000)
+        chr_rom[0:5] = encode("ZELDA", ALPHABET, 0x30)
+        rom_path = tmp_path / "test.nes"
+        rom_path.write_bytes(header + prg + chr_rom)
+
+        hits = RelativeSearch().search_rom(str(rom_path), "ZELDA")
+        assert [hit.offset for hit in hits] == [0x110]
+
+    def test_group_and_create_table(self, rom_data, tmp_path, engine):
+        """Test the most frequent base is proposed as a TableBuilder table."""
+        hits = RelativeSearch().search(rom_data, "ZEL")
+        best = group_hits_by_base(hits)[0]
+        assert best[0].base == 0x0A
+        assert len(best) >= 2
+
+        builder = TableBuilder(output_dir=str(tmp_path))
+        result = builder.create_table("zelda", best[0].mappings)
+        assert result.success
+        assert "0A=A" in (tmp_path / "zelda.tbl").read_text()
@@ -0,0 +1,193 @@
+"""Tests for memory-mapped ROM images."""
+
+import pytest
+
+import src.rom_image as rom_image
+from src.chr_analyzer import CHRAnalyzer, CHRType
+from src.detector import TextDetector
+from src.encoding import EncodingTable
+from src.extractor import TextExtractor
+from src.rom_image import (
+    FDS_DISK_MAGIC,
+    FDS_MAGIC,
+    FDS_SIDE_SIZE,
+    INES_HEADER_SIZE,
+    TRAINER_SIZE,
+    RomImage,
+    TerminatorIndex,
+    parse_ines_header,
+)
+
+
+def ines_rom(prg_banks=2, chr_banks=1, flags6=0x10, flags7=0x00):
+    """iNES ROM whose PRG bytes are the bank number and CHR bytes are 0xCC."""
+    header = b"NES\x1a" + bytes([prg_banks, chr_banks, flags6, flags7]) + bytes(8)
+    trainer = bytes(TRAINER_SIZE) if flags6 & 0x04 else b""
+    prg = b"".join(bytes([bank]) * 0x4000 for bank in range(prg_banks))
+    return header + trainer + prg + b"\xCC" * (chr_banks * 0x2000)
+
+
+@pytest.fixture
+def rom_file(tmp_path):
+    path = tmp_path / "game.nes"
+    path.write_bytes(ines_rom())
+    return path
+
+
+class TestINESHeader:
+    def test_parse(self):
+        header = parse_ines_header(ines_rom(flags6=0x12, flags7=0x40))
+
+        assert header.prg_size == 0x8000
+        assert header.chr_size == 0x2000
+        assert header.mapper == 0x41
+        assert not header.has_trainer
+        assert header.prg_start == INES_HEADER_SIZE
+        assert header.chr_start == INES_HEADER_SIZE + 0x8000
+
+    def test_trainer_shifts_sections(self):
+        header = parse_ines_header(ines_rom(flags6=0x04))
+
+        assert header.has_trainer
+        assert header.prg_start == INES_HEADER_SIZE + TRAINER_SIZE
+
+    def test_not_ines(self):
+        assert parse_ines_header(b"\x00" * 32) is None
+        assert parse_ines_header(b"NES") is None
+
+
+class TestRomImage:
+    def test_open_maps_file(self, rom_file):
+        with RomImage.open(rom_file) as rom:
+            assert rom.path == rom_file
+            assert rom.format == "ines"
+            assert len(rom) == rom_file.stat().st_size
+            assert rom.data[:4] == b"NES\x1a"
+            assert rom.data[INES_HEADER_SIZE + 0x4000] == 1
+
+    def test_sections_are_views(self, rom_file):
+        rom = RomImage.open(rom_file)
+
+        assert isinstance(rom.prg, memoryview)
+        assert len(rom.prg) == 0x8000
+        assert bytes(rom.chr) == b"\xCC" * 0x2000
+        assert rom.bank_count() == 2
+        assert rom.bank(1)[0] == 1
+        assert rom.bank(3, bank_size=0x2000)[0] == 1
+        with pytest.raises(IndexError):
+            rom.bank(2)
+
+    def test_trainer_skipped(self):
+        rom = RomImage(ines_rom(flags6=0x04))
+
+        assert rom.prg[0] == 0
+        assert bytes(rom.chr[:1]) == b"\xCC"
+
+    def test_headerless(self):
+        rom = RomImage(bytes(range(256)))
+
+        assert rom.format == "raw"
+        assert rom.header is None
+        assert bytes(rom.prg) == bytes(range(256))
+        assert len(rom.chr) == 0
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.nes"
+        path.write_bytes(b"")
+
+        rom = RomImage.open(path)
+
+        assert len(rom) == 0
+        assert rom.format == "raw"
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            RomImage.open(tmp_path / "missing.nes")
+
+    @pytest.mark.parametrize("header", [FDS_MAGIC + bytes(12), b""])
+    def test_fds_sides(self, header):
+        side = FDS_DISK_MAGIC + bytes(FDS_SIDE_SIZE - len(FDS_DISK_MAGIC))
+        rom = RomImage(header + side + side)
+
+        assert rom.format == "fds"
+        assert rom.disk_sides() == 2
+        assert bytes(rom.disk_side(1)[: len(FDS_DISK_MAGIC)]) == FDS_DISK_MAGIC
+        with pytest.raises(IndexError):
+            rom.disk_side(2)
+
+    def test_load(self, rom_file):
+        rom = RomImage.open(rom_file)
+
+        assert RomImage.load(rom) is rom
+        assert RomImage.load(b"abc").data == b"abc"
+        assert RomImage.load(str(rom_file)).path == rom_file
+
+
+class TestTerminatorIndex:
+    @pytest.fixture(params=["numpy", "python"])
+    def engine(self, request, monkeypatch):
+        if request.param == "numpy" and rom_image.np is None:
+            pytest.skip("NumPy not installed")
+        if request.param == "python":
+            monkeypatch.setattr(rom_image, "np", None)
+
+    def test_find(self, engine):
+        data = b"AB\xffC]\x00D"
+        index = TerminatorIndex(data, {0x00, 0xFF, ord("]")})
+
+        assert list(index.positions) == [2, 4, 5]
+        assert index.find(0) == 2
+        assert index.find(3) == 4
+        assert index.find(6) == len(data)
+        assert index.find(3, end=4) == 4
+
+    def test_matches_byte_scan(self, engine, rom_file):
+        rom = RomImage.open(rom_file)
+        index = TerminatorIndex(rom.data, {0x01, 0xCC})
+
+        expected = [i for i, b in enumerate(rom.view) if b in (0x01, 0xCC)]
+        assert list(index.positions) == expected
+
+    def test_no_terminators(self, engine):
+        index = TerminatorIndex(b"ABC", ())
+
+        assert len(index) == 0
+        assert index.find(1) == 3
+
+
+class TestReadersAcceptRomImage:
+    def test_chr_analyzer(self, rom_file):
+        analysis = CHRAnalyzer().analyze_rom(RomImage.open(rom_file))
+
+        assert analysis.chr_type == CHRType.CHR_ROM
+        assert analysis.total_tiles == 0x2000 // 16
+
+    def test_detector_matches_bytes(self, tmp_path):
+        data = bytearray(ines_rom())
+        for address in range(0x100, 0x6000, 0x400):
+            data[address : address + 8] = b"ABC BCA\xFF"
+        path = tmp_path / "text.nes"
+        path.write_bytes(data)
+        detector = TextDetector(EncodingTable("tests/test_table.tbl"))
+        rom = RomImage.open(path)
+
+        candidates = detector.detect_text_regions(rom)
+
+        assert candidates
+        assert candidates == detector.detect_text_regions(bytes(data))
+        assert detector.analyze_rom(rom)["rom_size"] == len(data)
+
+    def test_extractor(self, rom_file, tmp_path):
+        config_path = tmp_path / "game.yaml"
+        config_path.write_text(
+            "text_detection:\n"
+            "  method: fixed_locations\n"
+            "  encoding_table: tests/test_table.tbl\n"
+            "  strings:\n"
+            "    - address: 0x4010\n"
+            "      length: 4\n"
+        )
+        extractor = TextExtractor(str(config_path))
+
+        mapped = extractor.extract_from_rom(RomImage.open(rom_file))
+        assert mapped == extractor.extract_from_rom(str(rom_file))
@@ -0,0 +1,119 @@
+"""Tests for binary string banks."""
+
+import pytest
+
+from src.string_bank import HEADER, BankString, StringBank, write_string_bank
+
+
+def sample_strings():
+    return [
+        BankString("ptr_002", 0x84, b"\x43", "C", pointer_addresses=[0x42]),
+        BankString(
+            "ptr_001",
+            0x80,
+            b"\x41\x42",
+            "AB",
+            translated_text="Héllo",
+            translated_bytes=b"\x01\x02",
+            description="Shared",
+            pointer_address=0x40,
+            pointer_addresses=[0x40, 0x44],
+        ),
+        BankString("string_003", 0x1A2B3, b"", ""),
+    ]
+
+
+@pytest.fixture
+def bank_path(tmp_path):
+    path = tmp_path / "game.bank"
+    write_string_bank(path, sample_strings(), metadata={"extraction_method": "x"})
+    return path
+
+
+class TestStringBank:
+    def test_round_trip(self, bank_path):
+        with StringBank.open(bank_path) as bank:
+            assert len(bank) == 3
+            assert list(bank) == sample_strings()
+            assert bank[-1].pointer_address is None
+            assert bank.metadata == {"extraction_method": "x"}
+
+    def test_lookup_by_id(self, bank_path):
+        with StringBank.open(bank_path) as bank:
+            assert bank.find("ptr_001") == 1
+            assert bank.get("string_003").address == 0x1A2B3
+            assert bank.get("ptr_999") is None
+            assert "ptr_002" in bank
+            assert "" not in bank
+
+    def test_index_out_of_range(self, bank_path):
+        with StringBank.open(bank_path) as bank:
+            with pytest.raises(IndexError):
+                bank[3]
+
+    def test_empty_bank(self, tmp_path):
+        path = tmp_path / "empty.bank"
+
+        assert write_string_bank(path, []) == 0
+        with StringBank.open(path) as bank:
+            assert len(bank) == 0
+            assert list(bank) == []
+            assert bank.get("ptr_001") is None
+
+    def test_duplicate_id(self, tmp_path):
+        strings = sample_strings() + [BankString("ptr_001", 0, b"", "")]
+
+        with pytest.raises(ValueError, match="Duplicate string_id"):
+            write_string_bank(tmp_path / "dup.bank", strings)
+
+    @pytest.mark.parametrize(
+        "data, message",
+        [
+            (b"FLSB", "too short"),
+            (b"JSON" + bytes(HEADER.size), "bad magic"),
+        ],
+    )
+    def test_not_a_bank(self, data, message):
+        with pytest.raises(ValueError, match=message):
+            StringBank(data)
+
+    def test_truncated(self, bank_path):
+        with pytest.raises(ValueError, match="Truncated"):
+            StringBank(bank_path.read_bytes()[:-1])
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            StringBank.open(tmp_path / "missing.bank")
+
+    def test_record_round_trip(self):
+        for string in sample_strings():
+            record = string.to_record()
+            restored = BankString.from_record(record)
+
+            assert record["length"] == len(string.original_bytes)
+            assert restored.original_bytes == string.original_bytes
+            assert restored.pointer_addresses == string.pointer_addresses
+            assert restored.translated_text == string.translated_text
+
+    def test_rewrite_keeps_open_banks_whole(self, bank_path):
+        with StringBank.open(bank_path) as bank:
+            write_string_bank(bank_path, sample_strings()[:1])
+
+            assert len(bank) == 3
+            assert bank.get("string_003").address == 0x1A2B3
+
+        with StringBank.open(bank_path) as bank:
+            assert len(bank) == 1
+        assert list(bank_path.parent.glob("*.tmp")) == []
+
+    def test_failed_write_leaves_no_temp_file(self, bank_path, monkeypatch):
+        def fail(*args):
+            raise OSError("No space left on device")
+
+        monkeypatch.setattr("src.string_bank.os.replace", fail)
+        with pytest.raises(OSError, match="No space"):
+            write_string_bank(bank_path, sample_strings()[:1])
+
+        assert [p.name for p in bank_path.parent.iterdir()] == ["game.bank"]
+        with StringBank.open(bank_path) as bank:
+            assert len(bank) == 3
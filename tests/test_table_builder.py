@@ -203,6 +203,30 @@ ZZ=invalid hex
         assert "21=!" in content
         assert "3F=?" in content
 
+    def test_spaces_and_dictionary_entries_round_trip(self, builder, temp_tables_dir):
+        """Test spaces and multi-character (DTE/MTE) entries survive a reload."""
+        mappings = {0x20: " ", 0x41: "A", 0x80: "e ", 0x81: " the"}
+        result = builder.create_table("dte", mappings=mappings)
+
+        assert result.success is True
+        assert "# Dictionary (DTE/MTE)" in Path(result.table_path).read_text()
+
+        loaded = builder.load_table(result.table_path)
+        assert loaded.mappings == mappings
+
+    def test_multi_byte_patterns_round_trip(self, builder, temp_tables_dir):
+        """Test parameterized codes are written, loaded and kept on update."""
+        patterns = {"F0XX": "<DELAY:XX>"}
+        result = builder.create_table(
+            "patterns", {0x41: "A"}, {0xFF: "<END>"}, multi_byte_patterns=patterns
+        )
+        assert "F0XX=<DELAY:XX>" in Path(result.table_path).read_text()
+
+        builder.update_table(result.table_path, {0x42: "B"})
+        loaded = builder.load_table(result.table_path)
+        assert loaded.multi_byte_patterns == patterns
+        assert loaded.mappings == {0x41: "A", 0x42: "B"}
+
     def test_unicode_in_mapping(self, builder, temp_tables_dir):
         """Test mappings with unicode characters (for Japanese games)."""
         mappings = {0x00: "あ", 0x01: "い", 0x02: "う"}
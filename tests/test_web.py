@@ -11,6 +11,7 @@ from unittest.mock import patch, MagicMock
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.string_bank import StringBank
 from web.app import create_app
 
 
@@ -187,6 +188,71 @@ class TestProjectRoutes:
         assert b"not found" in response.data
 
 
+class TestJSONLinesProject:
+    """Tests for projects extracted to JSON Lines."""
+
+    @pytest.fixture
+    def project(self, app):
+        """Write a two-string game_extracted.jsonl to the output folder."""
+        path = Path(app.config["OUTPUT_FOLDER"]) / "game_extracted.jsonl"
+        records = [
+            {"string_id": "ptr_001", "address": 0x80, "length": 2,
+             "decoded_text": "AB", "description": "", "pointer_address": 0x40,
+             "pointer_addresses": [0x40, 0x44]},
+            {"string_id": "ptr_002", "address": 0x84, "length": 1,
+             "decoded_text": "C", "description": "", "pointer_address": 0x42,
+             "pointer_addresses": [0x42]},
+        ]
+        path.write_text("".join(json.dumps(r) + "\n" for r in records))
+        return path
+
+    def test_translate_page(self, client, project):
+        """Test the editor lists each string by offset."""
+        response = client.get("/translate/game")
+        assert response.status_code == 200
+        assert b"0x0080" in response.data
+        assert b"0x0084" in response.data
+
+    def test_api_translate_writes_csv(self, client, project):
+        """Test translations are written next to the JSON Lines file."""
+        response = client.post(
+            "/api/translate",
+            data=json.dumps({"project_name": "game", "use_mock": True}),
+            content_type="application/json"
+        )
+        assert response.status_code == 200
+
+        csv_path = project.with_name("game_translated.csv")
+        assert json.loads(response.data)["csv_path"] == str(csv_path)
+        rows = csv_path.read_text(encoding="utf-8").splitlines()
+        assert len(rows) == 3
+        assert "0x0040 0x0044" in rows[1]
+
+    def test_translation_bank_follows_edits(self, client, project):
+        """Test the translated bank is written and kept in step with edits."""
+        client.post(
+            "/api/translate",
+            data=json.dumps({"project_name": "game", "use_mock": True}),
+            content_type="application/json"
+        )
+        response = client.post(
+            "/api/save_translation",
+            data=json.dumps({
+                "project_name": "game",
+                "address": "0x0080",
+                "translated_text": "BA",
+            }),
+            content_type="application/json"
+        )
+        assert response.status_code == 200
+
+        with StringBank.open(project.with_name("game_translated.bank")) as bank:
+            assert len(bank) == 2
+            assert bank.get("ptr_001").translated_text == "BA"
+            assert bank.get("ptr_001").pointer_addresses == [0x40, 0x44]
+            assert bank.get("ptr_002").translated_text
+
+
 class TestFileHelpers:
     """Tests for file helper functions."""
     
@@ -242,6 +308,77 @@ class TestSaveTranslation:
             content_type="application/json"
         )
         assert response.status_code == 404
+    
+    def test_save_translation_reports_encoding(self, app, client):
+        """Test saving reports the encoded size and the first bad character."""
+        csv_path = Path(app.config["OUTPUT_FOLDER"]) / "game_translated.csv"
+        csv_path.write_text(
+            "address,original_text,translated_text\n0x1000,ABC,\n",
+            encoding="utf-8",
+        )
+        
+        def save(text):
+            response = client.post(
+                "/api/save_translation",
+                data=json.dumps({
+                    "project_name": "game",
+                    "address": "0x1000",
+                    "translated_text": text,
+                    "table_file": "tests/test_table.tbl",
+                }),
+                content_type="application/json"
+            )
+            assert response.status_code == 200
+            return json.loads(response.data)
+        
+        data = save("CAB")
+        assert data["byte_length"] == 3
+        assert "encoding_error" not in data
+        
+        data = save("CA~B")
+        assert data["success"] is True
+        assert data["error_offset"] == 2
+        assert "~" in data["encoding_error"]
+        assert "CA~B" in csv_path.read_text(encoding="utf-8")
+    
+    @pytest.mark.parametrize("table_file", ["tables/missing.tbl", "README.md"])
+    def test_save_translation_bad_table_saves_nothing(self, app, client, table_file):
+        """Test a missing or unreadable table is rejected before the CSV is written."""
+        csv_path = Path(app.config["OUTPUT_FOLDER"]) / "game_translated.csv"
+        contents = "address,original_text,translated_text\n0x1000,ABC,\n"
+        csv_path.write_text(contents, encoding="utf-8")
+        
+        response = client.post(
+            "/api/save_translation",
+            data=json.dumps({
+                "project_name": "game",
+                "address": "0x1000",
+                "translated_text": "CAB",
+                "table_file": table_file,
+            }),
+            content_type="application/json"
+        )
+        
+        assert response.status_code == 400
+        assert csv_path.read_text(encoding="utf-8") == contents
+
+
+class TestClientTablePaths:
+    """Tests that client-supplied table paths never create files."""
+
+    def test_check_font_does_not_compile_table(self, client, tmp_path):
+        """Test a table named in a request is read without writing .tblc."""
+        table_path = tmp_path / "client.tbl"
+        table_path.write_text("41=A\n42=B\n", encoding="utf-8")
+
+        response = client.post(
+            "/api/check_font",
+            data=json.dumps({"text": "AB", "table_file": str(table_path)}),
+            content_type="application/json"
+        )
+
+        assert response.status_code == 200
+        assert list(tmp_path.iterdir()) == [table_path]
 
 
 class TestCHRTilesAPI:
@@ -253,3 +390,80 @@ class TestCHRTilesAPI:
         assert response.status_code == 404
         data = json.loads(response.data)
         assert "not found" in data["error"]
+
+
+class TestTextRegionsAPI:
+    """Tests for the text region detection API."""
+
+    def test_text_regions_missing_rom(self, client):
+        """Test text regions API with missing ROM."""
+        response = client.get("/api/text_regions/missing.nes")
+        assert response.status_code == 404
+
+    def test_text_regions_stream(self, app, client):
+        """Test candidates are streamed as JSON Lines."""
+        rom_path = Path(app.config["UPLOAD_FOLDER"]) / "text.nes"
+        rom_path.write_bytes(b"\x80" * 64 + b"HELLO WORLD\xff" + b"\x80" * 64)
+
+        response = client.get("/api/text_regions/text.nes")
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        assert any("HELLO" in line["sample_text"] for line in lines)
+
+    def test_text_regions_top_k(self, app, client):
+        """Test top_k returns a bounded JSON list."""
+        rom_path = Path(app.config["UPLOAD_FOLDER"]) / "text.nes"
+        rom_path.write_bytes(b"\x80" * 64 + b"HELLO WORLD\xff" + b"\x80" * 64)
+
+        response = client.get("/api/text_regions/text.nes?top_k=1")
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert len(data["candidates"]) == 1
+
+
+class TestRankTablesAPI:
+    """Tests for the table ranking API."""
+
+    def test_rank_tables_missing_rom(self, client):
+        """Test ranking tables for a missing ROM."""
+        response = client.get("/api/tables/rank/missing.nes")
+        assert response.status_code == 404
+
+    def test_rank_tables(self, app, client):
+        """Test every available table is scored."""
+        rom_path = Path(app.config["UPLOAD_FOLDER"]) / "text.nes"
+        rom_path.write_bytes(b"HELLO WORLD, THIS IS A TEST OF THE TABLES. " * 8)
+
+        response = client.get("/api/tables/rank/text.nes")
+        assert response.status_code == 200
+        ranking = json.loads(response.data)["tables"]
+        assert "tables/common.tbl" in [score["name"] for score in ranking]
+
+
+class TestRelativeSearchAPI:
+    """Tests for the relative search API."""
+
+    def test_relative_search_missing_word(self, client):
+        """Test relative search without a word."""
+        response = client.post(
+            "/api/table/relative_search",
+            data=json.dumps({"rom_filename": "test.nes"}),
+            content_type="application/json",
+        )
+        assert response.status_code == 400
+
+    def test_relative_search(self, app, client):
+        """Test hits are grouped into proposed tables."""
+        rom_path = Path(app.config["UPLOAD_FOLDER"]) / "zelda.nes"
+        rom_path.write_bytes(b"\x00" * 16 + bytes([0x19, 0x04, 0x0B, 0x03, 0x00]))
+
+        response = client.post(
+            "/api/table/relative_search",
+            data=json.dumps({"rom_filename": "zelda.nes", "word": "ZELDA"}),
+            content_type="application/json",
+        )
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["candidates"][0]["offsets"] == [16]
+        assert data["candidates"][0]["mappings"]["00"] == "A"
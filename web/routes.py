@@ -5,12 +5,14 @@ import json
 import logging
 import os
 import tempfile
+from dataclasses import asdict
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import yaml
 from flask import (
     Blueprint,
+    Response,
     current_app,
     flash,
     jsonify,
@@ -18,6 +20,7 @@ from flask import (
     render_template,
     request,
     send_file,
+    stream_with_context,
     url_for,
 )
 from werkzeug.utils import secure_filename
@@ -33,11 +36,16 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.chr_analyzer import CHRAnalyzer
-from src.encoding import EncodingTable
-from src.extractor import TextExtractor
+from src.detector import TextDetector
+from src.encoding import EncodingTable, load_cached_table
+from src.extractor import CSV_FIELDS, TextExtractor, iter_string_records
 from src.font_checker import FontChecker
 from src.language_detector import Language, LanguageDetector
+from src.pointer_utils import format_pointer_addresses
 from src.reinjector import TextReinjector
+from src.relative_search import RelativeSearch, group_hits_by_base
+from src.rom_image import RomImage
+from src.string_bank import BankString, StringBank, write_string_bank
 from src.table_builder import TableBuilder
 from src.translator import GameTranslator, Glossary, TranslationConfig, TranslationMemory
 from src.validator import ROMValidator
@@ -51,6 +59,9 @@ api_bp = Blueprint("api", __name__)
 # Projects blueprint
 projects_bp = Blueprint("projects", __name__)
 
+# Extracted strings files, in order of preference
+EXTRACTED_SUFFIXES = (".bank", ".jsonl", ".json")
+
 
 def allowed_file(filename: str) -> bool:
     """Check if file extension is allowed."""
@@ -136,10 +147,14 @@ def get_project_list() -> list[dict]:
         logger.warning(f"Output folder does not exist: {output_folder}")
         return projects
 
-    # Look for project directories (have extracted.json files)
+    # Look for project directories (have extracted .bank/.json/.jsonl files)
     for item in output_folder.iterdir():
         if item.is_dir():
-            extracted_files = list(item.glob("*_extracted.json"))
+            extracted_files = [
+                path
+                for path in item.glob("*_extracted.*")
+                if path.suffix in EXTRACTED_SUFFIXES
+            ]
             if extracted_files:
                 projects.append(
                     {
@@ -154,9 +169,11 @@ def get_project_list() -> list[dict]:
                 )
 
     # Also check for files directly in output folder
-    for json_file in output_folder.glob("*_extracted.json"):
-        if json_file.parent == output_folder:
-            base_name = json_file.stem.replace("_extracted", "")
+    seen = set()
+    for json_file in sorted(output_folder.glob("*_extracted.*")):
+        base_name = json_file.stem.replace("_extracted", "")
+        if json_file.suffix in EXTRACTED_SUFFIXES and base_name not in seen:
+            seen.add(base_name)
             projects.append(
                 {
                     "name": base_name,
@@ -181,6 +198,43 @@ def get_project_list() -> list[dict]:
     return projects
 
 
+def find_extracted_file(project_name: str) -> Optional[Path]:
+    """Find a project's extracted strings, preferring string banks.
+
+    Args:
+        project_name: Project directory or base name in the output folder
+
+    Returns:
+        Path to the *_extracted.bank, .jsonl or .json file, or None
+    """
+    output_folder = get_output_folder()
+    project_path = output_folder / project_name
+
+    for suffix in EXTRACTED_SUFFIXES:
+        if project_path.is_dir():
+            extracted_files = sorted(project_path.glob(f"*_extracted{suffix}"))
+            if extracted_files:
+                return extracted_files[0]
+        else:
+            extracted_file = output_folder / f"{project_name}_extracted{suffix}"
+            if extracted_file.exists():
+                return extracted_file
+    return None
+
+
+def translated_csv_path(extracted_file: Path) -> Path:
+    """Translated CSV written next to an extracted strings file."""
+    base_name = extracted_file.stem[: -len("_extracted")]
+    return extracted_file.with_name(f"{base_name}_translated.csv")
+
+
+def bank_is_current(bank_file: Path, csv_file: Path) -> bool:
+    """Whether a translated bank exists and the CSV wasn't edited after it."""
+    return bank_file.exists() and (
+        not csv_file.exists() or csv_file.stat().st_mtime <= bank_file.stat().st_mtime
+    )
+
+
 def get_available_tables() -> List[Dict[str, str]]:
     """Get list of available encoding tables.
     
@@ -206,6 +260,7 @@ def create_temp_config(
     rom_path: str,
     table_file: str = "tables/common.tbl",
     method: str = "auto_detect",
+    auto_detect: Optional[Dict[str, Any]] = None,
 ) -> str:
     """Create a temporary configuration file for extraction/reinjection.
 
@@ -216,6 +271,7 @@ def create_temp_config(
         rom_path: Path to the ROM file
         table_file: Path to the encoding table file
         method: Extraction method (fixed_locations, pointer_table, auto_detect)
+        auto_detect: Optional auto-detection parameters (e.g. top_k)
 
     Returns:
         Path to the temporary config file
@@ -241,6 +297,8 @@ def create_temp_config(
             "check_crc": False,
         },
     }
+    if auto_detect:
+        config["text_detection"]["auto_detect"] = auto_detect
 
     # Create temp file
     fd, temp_path = tempfile.mkstemp(suffix=".yaml", prefix="familator_config_")
@@ -318,9 +376,15 @@ def analyze(filename: str):
         return redirect(url_for("main.index"))
 
     try:
-        # Perform CHR analysis
-        chr_analyzer = CHRAnalyzer()
-        chr_analysis_raw = chr_analyzer.analyze_rom(rom_path)
+        # Map the ROM once for both analyses
+        with RomImage.open(rom_path) as rom:
+            # Perform CHR analysis
+            chr_analyzer = CHRAnalyzer()
+            chr_analysis_raw = chr_analyzer.analyze_rom(rom)
+
+            # Detect language from ROM byte patterns
+            lang_detector = LanguageDetector()
+            byte_analysis = lang_detector.analyze_byte_patterns(rom)
         
         # Convert CHRAnalysis dataclass to JSON-serializable dict
         chr_analysis = {
@@ -348,12 +412,6 @@ def analyze(filename: str):
             "has_extended_charset": chr_analysis_raw.has_extended_charset(),
         }
 
-        # Detect language from ROM byte patterns
-        lang_detector = LanguageDetector()
-        with open(rom_path, "rb") as f:
-            rom_data = f.read()
-        byte_analysis = lang_detector.analyze_byte_patterns(rom_data)
-        
         # Build a JSON-serializable dict with attributes the template expects
         likely_encoding = byte_analysis.get("likely_encoding", "unknown")
         if likely_encoding == "japanese":
@@ -407,33 +465,21 @@ def analyze(filename: str):
 @main_bp.route("/translate/<project_name>")
 def translate(project_name: str):
     """Translation editor page."""
-    output_folder = get_output_folder()
-
     # Find project folder or file
-    project_path = output_folder / project_name
-    if project_path.is_dir():
-        extracted_files = list(project_path.glob("*_extracted.json"))
-        if extracted_files:
-            extracted_file = extracted_files[0]
-        else:
-            flash(f"No extracted data found for project '{project_name}'", "error")
-            return redirect(url_for("main.index"))
-    else:
-        extracted_file = output_folder / f"{project_name}_extracted.json"
-
-    if not extracted_file.exists():
+    extracted_file = find_extracted_file(project_name)
+    if extracted_file is None:
         logger.error(f"Project not found: {project_name}")
-        flash(f"Project '{project_name}' not found", "error")
+        flash(f"No extracted data found for project '{project_name}'", "error")
         return redirect(url_for("main.index"))
 
-    # Load extracted strings
-    with open(extracted_file) as f:
-        extracted_data = json.load(f)
+    # Load extracted strings, keeping only what the editor shows
+    extracted_data = [
+        {"offset": f"0x{item['address']:04X}", "text": item.get("decoded_text", "")}
+        for item in iter_string_records(extracted_file)
+    ]
 
     # Load translations if they exist
-    translated_csv = extracted_file.with_name(
-        extracted_file.name.replace("_extracted.json", "_translated.csv")
-    )
+    translated_csv = translated_csv_path(extracted_file)
     translations = {}
     if translated_csv.exists():
         with open(translated_csv) as f:
@@ -562,6 +608,35 @@ def api_list_tables():
     return jsonify({"tables": tables})
 
 
+@api_bp.route("/tables/rank/<filename>", methods=["GET"])
+def api_rank_tables(filename: str):
+    """Rank the available encoding tables by text coverage of a ROM."""
+    rom_path = find_rom_file(filename)
+
+    if not rom_path:
+        logger.error(f"ROM not found for table ranking: {filename}")
+        return jsonify({"error": "ROM not found"}), 404
+
+    try:
+        tables = {}
+        for table in get_available_tables():
+            try:
+                tables[table["path"]] = load_cached_table(
+                    str(project_root / table["path"])
+                )
+            except ValueError as e:
+                logger.warning(f"Skipping table {table['path']}: {e}")
+
+        detector = TextDetector(EncodingTable())
+        with RomImage.open(rom_path) as rom:
+            ranking = detector.rank_tables(rom, tables)
+        return jsonify({"tables": [asdict(score) for score in ranking]})
+
+    except Exception as e:
+        logger.exception(f"Error ranking tables for {filename}")
+        return jsonify({"error": str(e)}), 500
+
+
 @api_bp.route("/generate-table", methods=["POST"])
 def api_generate_table():
     """Create an empty table template for a ROM - user fills in mappings manually."""
@@ -682,6 +757,41 @@ def api_load_table(table_name: str):
         return jsonify({"error": str(e)}), 500
 
 
+@api_bp.route("/table/relative_search", methods=["POST"])
+def api_relative_search():
+    """Find a known word by letter deltas and propose table mappings."""
+    data = request.get_json()
+    rom_filename = data.get("rom_filename")
+    word = data.get("word", "")
+    ordering = data.get("ordering", "alphabet")
+
+    if not rom_filename or not word:
+        return jsonify({"error": "ROM filename and word required"}), 400
+
+    rom_path = find_rom_file(rom_filename)
+    if not rom_path:
+        logger.error(f"ROM file not found: {rom_filename}")
+        return jsonify({"error": f"ROM file '{rom_filename}' not found"}), 404
+
+    try:
+        hits = RelativeSearch(ordering).search_rom(str(rom_path), word)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Each base is one candidate table; report the most frequent first
+    candidates = [
+        {
+            "base": group[0].base,
+            "offsets": [hit.offset for hit in group],
+            "mappings": {f"{k:02X}": v for k, v in group[0].mappings.items()},
+        }
+        for group in group_hits_by_base(hits, limit=20)
+    ]
+
+    logger.info(f"Relative search for {word!r} in {rom_filename}: {len(hits)} hits")
+    return jsonify({"success": True, "hits": len(hits), "candidates": candidates})
+
+
 @api_bp.route("/table/presets")
 def api_table_presets():
     """Get available mapping presets."""
@@ -703,6 +813,7 @@ def api_extract():
     rom_filename = data.get("rom_filename")
     table_file = data.get("table_file", "tables/common.tbl")
     output_name = data.get("output_name")
+    top_k = data.get("top_k")  # Keep only the K most confident candidates
 
     if not rom_filename:
         logger.warning("Extract API called without ROM filename")
@@ -716,7 +827,12 @@ def api_extract():
     config_path = None
     try:
         # Create temporary config for extraction
-        config_path = create_temp_config(str(rom_path), table_file, method="auto_detect")
+        config_path = create_temp_config(
+            str(rom_path),
+            table_file,
+            method="auto_detect",
+            auto_detect={"top_k": int(top_k)} if top_k else None,
+        )
 
         # Initialize extractor with config
         extractor = TextExtractor(config_path)
@@ -733,10 +849,10 @@ def api_extract():
             base_name = rom_path.stem
 
         # Save extracted data using the extractor's export methods
-        json_path = output_dir / f"{base_name}_extracted.json"
+        bank_path = output_dir / f"{base_name}_extracted.bank"
         csv_path = output_dir / f"{base_name}_extracted.csv"
 
-        extractor.export_to_json(str(json_path))
+        extractor.export_to_bank(str(bank_path))
         extractor.export_to_csv(str(csv_path))
 
         logger.info(f"Extracted {len(strings)} strings from {rom_filename}")
@@ -744,7 +860,7 @@ def api_extract():
             {
                 "success": True,
                 "strings_found": len(strings),
-                "json_path": str(json_path),
+                "bank_path": str(bank_path),
                 "csv_path": str(csv_path),
                 "project_name": base_name if not output_name else output_name,
             }
@@ -771,28 +887,19 @@ def api_translate():
         logger.warning("Translate API called without project name")
         return jsonify({"error": "No project name provided"}), 400
 
-    output_folder = get_output_folder()
-
     # Find extracted file
-    project_path = output_folder / project_name
-    if project_path.is_dir():
-        extracted_files = list(project_path.glob("*_extracted.json"))
-        extracted_file = extracted_files[0] if extracted_files else None
-    else:
-        extracted_file = output_folder / f"{project_name}_extracted.json"
-
-    if not extracted_file or not extracted_file.exists():
+    extracted_file = find_extracted_file(project_name)
+    if extracted_file is None:
         logger.error(f"No extracted data found for '{project_name}'")
         return jsonify({"error": f"No extracted data found for '{project_name}'"}), 404
 
     try:
-        # Load extracted strings
-        with open(extracted_file) as f:
-            extracted_data = json.load(f)
-
-        # Get strings from the extracted data
-        strings_data = extracted_data.get("strings", [])
-        if not strings_data:
+        # Extract texts for translation (the records are read again below,
+        # so a JSON Lines project is never held in memory)
+        texts = [
+            item.get("decoded_text", "") for item in iter_string_records(extracted_file)
+        ]
+        if not texts:
             return jsonify({"error": "No strings found in extracted data"}), 400
 
         # Configure translator with correct parameter name (mock_mode, not use_mock)
@@ -803,37 +910,24 @@ def api_translate():
         )
         translator = GameTranslator(config)
 
-        # Extract texts for translation
-        texts = [item.get("decoded_text", "") for item in strings_data]
-
         # Translate batch
         result = translator.translate_batch(texts)
-
-        # Update extracted data with translations
-        for i, item in enumerate(strings_data):
-            if i < len(result.results):
-                item["translated_text"] = result.results[i].translated
+        translated = [r.translated for r in result.results]
 
         # Save as CSV
-        csv_path = extracted_file.with_name(
-            extracted_file.name.replace("_extracted.json", "_translated.csv")
-        )
+        csv_path = translated_csv_path(extracted_file)
 
-        # Write CSV with proper field names
+        # Write CSV with proper field names, collecting the bank entries
+        strings = []
         with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            fieldnames = [
-                "string_id",
-                "address",
-                "length",
-                "original_text",
-                "translated_text",
-                "description",
-                "pointer_address",
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
             writer.writeheader()
 
-            for item in strings_data:
+            for i, item in enumerate(iter_string_records(extracted_file)):
+                string = BankString.from_record(item)
+                string.translated_text = translated[i] if i < len(translated) else ""
+                strings.append(string)
+
                 writer.writerow(
                     {
                         "string_id": item.get("string_id", ""),
@@ -844,16 +938,22 @@ def api_translate():
                         ),
                         "length": item.get("length", ""),
                         "original_text": item.get("decoded_text", ""),
-                        "translated_text": item.get("translated_text", ""),
+                        "translated_text": string.translated_text,
                         "description": item.get("description", ""),
                         "pointer_address": (
                             f"0x{item['pointer_address']:04X}"
                             if item.get("pointer_address")
                             else ""
                         ),
+                        "pointer_addresses": format_pointer_addresses(
+                            item.get("pointer_addresses", [])
+                        ),
                     }
                 )
 
+        # Reinjection reads the bank unless the CSV is edited afterwards
+        write_string_bank(csv_path.with_suffix(".bank"), strings)
+
         logger.info(f"Translated {len(result.results)} strings for {project_name}")
         return jsonify(
             {
@@ -894,6 +994,18 @@ def api_save_translation():
         logger.error(f"Translation file not found for {project_name}")
         return jsonify({"error": "Translation file not found"}), 404
 
+    # Load the table before anything is written, so a bad one saves nothing
+    table_file = data.get("table_file") or "tables/common.tbl"
+    table_path = Path(table_file)
+    if not table_path.is_absolute():
+        table_path = project_root / table_path
+    if not table_path.exists():
+        return jsonify({"error": f"Table file not found: {table_file}"}), 400
+    try:
+        encoding_table = load_cached_table(str(table_path), compile=False)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid table file {table_file}: {e}"}), 400
+
     try:
         # Read existing data
         rows = []
@@ -924,8 +1036,29 @@ def api_save_translation():
             writer.writeheader()
             writer.writerows(rows)
 
+        # Keep the translated bank in step with the CSV
+        bank_file = csv_file.with_suffix(".bank")
+        if bank_file.exists():
+            with StringBank.open(bank_file) as bank:
+                strings = list(bank)
+                metadata = bank.metadata
+            for string in strings:
+                if f"0x{string.address:04X}".lower() == str(address).lower():
+                    string.translated_text = translated_text
+                    string.translated_bytes = b""  # Re-encoded on reinjection
+            write_string_bank(bank_file, strings, metadata)
+
         logger.debug(f"Saved translation for address {address} in {project_name}")
-        return jsonify({"success": True})
+        response = {"success": True}
+
+        # Report how the edit encodes so the editor can flag it right away
+        encoded = encoding_table.encode_batch([translated_text])[0]
+        response["byte_length"] = encoded.length
+        if not encoded.ok:
+            response["encoding_error"] = encoded.error
+            response["error_offset"] = encoded.error_offset
+
+        return jsonify(response)
 
     except Exception as e:
         logger.exception(f"Error saving translation for {project_name}")
@@ -949,7 +1082,8 @@ def api_check_font():
             if not Path(table_file).is_absolute():
                 table_path = project_root / table_file
             if Path(table_path).exists():
-                encoding_table = EncodingTable(str(table_path))
+                # Client-supplied path: never write a compiled table next to it
+                encoding_table = load_cached_table(str(table_path), compile=False)
 
         checker = FontChecker(encoding_table=encoding_table)
         result = checker.check_text(text)
@@ -1027,8 +1161,12 @@ def api_build_patch():
         # Initialize reinjector with config path
         reinjector = TextReinjector(config_path)
 
-        # Load translations from CSV
-        reinjector.load_translations_from_csv(str(csv_file))
+        # Load translations, from the bank unless the CSV was edited since
+        bank_file = csv_file.with_suffix(".bank")
+        if bank_is_current(bank_file, csv_file):
+            reinjector.load_translations_from_bank(str(bank_file))
+        else:
+            reinjector.load_translations_from_csv(str(csv_file))
 
         output_rom = output_dir / f"{base_name}_translated.nes"
         ips_file = output_dir / f"{base_name}_translation.ips"
@@ -1090,12 +1228,9 @@ def api_validate():
         }
         validator = ROMValidator(validator_config)
 
-        # Read ROM data
-        with open(translated_rom, "rb") as f:
-            rom_data = f.read()
-
         # Validate ROM
-        results = validator.validate_original_rom(rom_data)
+        with RomImage.open(translated_rom) as rom:
+            results = validator.validate_original_rom(rom.data)
 
         # Convert results to JSON-serializable format
         issues = []
@@ -1175,6 +1310,51 @@ def api_chr_tiles(filename: str):
         return jsonify({"error": str(e)}), 500
 
 
+@api_bp.route("/text_regions/<filename>")
+def api_text_regions(filename: str):
+    """Detect text regions in a ROM.
+
+    Candidates are streamed as JSON Lines in address order while the ROM is
+    scanned. With a ``top_k`` query parameter, the K most confident
+    candidates are returned as a single JSON document instead.
+    """
+    rom_path = find_rom_file(filename)
+
+    if not rom_path:
+        logger.error(f"ROM not found for text detection: {filename}")
+        return jsonify({"error": "ROM not found"}), 404
+
+    table_file = request.args.get("table_file", "tables/common.tbl")
+    table_path = Path(table_file)
+    if not table_path.is_absolute():
+        table_path = project_root / table_file
+    top_k = request.args.get("top_k", type=int)
+
+    try:
+        detector = TextDetector(load_cached_table(str(table_path), compile=False))
+        rom_data = RomImage.open(rom_path)
+
+        if top_k is not None:
+            with rom_data:
+                candidates = detector.detect_text_regions(rom_data, top_k=top_k)
+            return jsonify({"candidates": [asdict(c) for c in candidates]})
+
+    except Exception as e:
+        logger.exception(f"Error detecting text in {filename}")
+        return jsonify({"error": str(e)}), 500
+
+    def generate():
+        for candidate in detector.iter_text_regions(rom_data):
+            yield json.dumps(asdict(candidate)) + "\n"
+
+    response = Response(
+        stream_with_context(generate()), mimetype="application/x-ndjson"
+    )
+    # Unmap once the stream ends or the client goes away
+    response.call_on_close(rom_data.close)
+    return response
+
+
 # ============================================================================
 # Project Management Routes
 # ============================================================================